@@ -0,0 +1,72 @@
+/*
+ * Copyright (C) 2016, Maximilian Koehl <mail@koehlma.de>
+ *
+ * This program is free software: you can redistribute it and/or modify it under
+ * the terms of the GNU Lesser General Public License version 3 as published by
+ * the Free Software Foundation.
+ *
+ * This program is distributed in the hope that it will be useful, but WITHOUT ANY
+ * WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+ * PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License along
+ * with this program. If not, see <http://www.gnu.org/licenses/>.
+ */
+
+/*
+ * API-mode trampolines for all libuv callbacks. Each declaration corresponds to
+ * a Python function decorated with `uv.library.c_callback` which is attached by
+ * name (prefix `python_` + function name). They are only compiled in API-mode,
+ * in ABI-mode the callbacks fall back to `ffi.callback`.
+ */
+
+extern "Python" {
+    /* Base */
+    void python_base_async_cb(uv_async_t*);
+    void python_base_prepare_cb(uv_prepare_t*);
+    void python_base_check_cb(uv_check_t*);
+    void python_base_idle_cb(uv_idle_t*);
+    void python_base_timer_cb(uv_timer_t*);
+    void python_base_walk_close_cb(uv_handle_t*, void*);
+    void python_uv_close_cb(uv_handle_t*);
+
+    /* Handle */
+    void python_uv_alloc_cb(uv_handle_t*, size_t, uv_buf_t*);
+
+    /* Handles */
+    void python_uv_async_cb(uv_async_t*);
+    void python_uv_check_cb(uv_check_t*);
+    void python_uv_idle_cb(uv_idle_t*);
+    void python_uv_prepare_cb(uv_prepare_t*);
+    void python_uv_timer_cb(uv_timer_t*);
+    void python_uv_signal_cb(uv_signal_t*, int);
+    void python_uv_exit_cb(uv_process_t*, int64_t, int);
+    void python_poll_callback(uv_poll_t*, int, int);
+    void python_uv_fs_event_cb(uv_fs_event_t*, const char*, int, int);
+    void python_uv_fs_poll_cb(uv_fs_poll_t*, int, const uv_stat_t*, const uv_stat_t*);
+
+    /* Stream */
+    void python_uv_shutdown_cb(uv_shutdown_t*, int);
+    void python_uv_write_cb(uv_write_t*, int);
+    void python_uv_connect_cb(uv_connect_t*, int);
+    void python_uv_connection_cb(uv_stream_t*, int);
+    void python_uv_read_cb(uv_stream_t*, ssize_t, const uv_buf_t*);
+
+    /* UDP */
+    void python_uv_udp_send_cb(uv_udp_send_t*, int);
+    void python_uv_udp_recv_cb(uv_udp_t*, ssize_t, const uv_buf_t*,
+                               const struct sockaddr*, unsigned);
+
+    /* Compact */
+    void python_compact_alloc_cb(uv_handle_t*, size_t, uv_buf_t*);
+    void python_compact_read_cb(uv_stream_t*, ssize_t, const uv_buf_t*);
+    void python_compact_write_cb(uv_write_t*, int);
+    void python_compact_close_cb(uv_handle_t*);
+
+    /* Requests */
+    void python_fs_callback(uv_fs_t*);
+    void python_uv_work_cb(uv_work_t*);
+    void python_uv_after_work_cb(uv_work_t*, int);
+    void python_uv_getaddrinfo_cb(uv_getaddrinfo_t*, int, struct addrinfo*);
+    void python_uv_getnameinfo_cb(uv_getnameinfo_t*, int, const char*, const char*);
+}
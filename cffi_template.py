@@ -24,6 +24,10 @@ declarations = '''
 {declarations}
 '''
 
+callbacks = '''
+{callbacks}
+'''
+
 source = '''
 {source}
 '''
@@ -33,9 +37,11 @@ try:
 except ImportError:
     ffi = cffi.FFI()
     ffi.cdef(declarations)
-    try:
+    if hasattr(ffi, 'def_extern'):
+        # API-mode with extern "Python" callbacks (cffi >= 1.4)
+        ffi.cdef(callbacks)
         ffi.set_source('_uvcffi', source, libraries=['uv'])
         ffi.compile()
         from _uvcffi import ffi, lib
-    except AttributeError or ImportError:
+    else:
         lib = ffi.verify(source, modulename='_uvcffi', libraries=['uv'])
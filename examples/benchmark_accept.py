@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Measures the accept rate of a TCP server during bursts of 10k incoming
+connections with and without preallocated handles. Each burst opens all
+client connections at once (limited by `--window` to stay below the file
+descriptor limit), the server accepts and closes them immediately.
+
+Usage: benchmark_accept.py [--connections N] [--bursts N] [--window N]
+"""
+
+from __future__ import print_function, division
+
+import argparse
+import time
+
+import uv
+
+ADDRESS = ('127.0.0.1', 4447)
+
+
+def run_burst(loop, server, connections, window):
+    state = {'started': 0, 'accepted': 0}
+
+    def on_connect(request, status):
+        request.stream.close()
+        connect()
+
+    def connect():
+        if state['started'] < connections:
+            state['started'] += 1
+            uv.TCP(loop=loop).connect(ADDRESS, on_connect=on_connect)
+
+    def on_connection(listener, status):
+        if status != uv.StatusCodes.SUCCESS:
+            return
+        listener.accept().close()
+        state['accepted'] += 1
+        if state['accepted'] == connections:
+            loop.stop()
+
+    server.on_connection = on_connection
+    for _ in range(window):
+        connect()
+    start = time.time()
+    loop.run()
+    return state['accepted'] / (time.time() - start)
+
+
+def run(preallocate, arguments):
+    loop = uv.Loop()
+    server = uv.TCP(loop=loop)
+    server.bind(ADDRESS)
+    server.listen(backlog=arguments.backlog)
+    if preallocate:
+        server.preallocate(preallocate)
+    rates = []
+    for _ in range(arguments.bursts):
+        rates.append(run_burst(loop, server, arguments.connections,
+                               arguments.window))
+    pool = server.handle_pool
+    hit_rate = pool.hits / (pool.hits + pool.misses) if pool else 0.0
+    server.close()
+    loop.run()
+    loop.close()
+    return max(rates), sum(rates) / len(rates), hit_rate
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--connections', type=int, default=10000)
+    parser.add_argument('--bursts', type=int, default=5)
+    parser.add_argument('--window', type=int, default=1000)
+    parser.add_argument('--backlog', type=int, default=1024)
+    arguments = parser.parse_args()
+
+    try:
+        import resource
+        _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        limit = min(hard, 4 * arguments.window + 64)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+    except (ImportError, ValueError):
+        pass
+
+    print('{:>12} {:>14} {:>14} {:>10}'.format('preallocate', 'best (acc/s)',
+                                               'mean (acc/s)', 'hit rate'))
+    for preallocate in (0, 64, 1024):
+        best, mean, hit_rate = run(preallocate, arguments)
+        print('{:>12} {:>14.1f} {:>14.1f} {:>10.3f}'.format(preallocate, best, mean,
+                                                          hit_rate))
+
+
+if __name__ == '__main__':
+    main()
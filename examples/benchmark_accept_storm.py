@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Simulates a reconnect storm: a child process opens bursts of TCP
+connections as fast as possible while the server accepts them either one
+per `on_connection` callback or in batches with
+:func:`uv.UVStream.listen_batch`. Reports accepted connections per second
+and the number of Python callbacks needed.
+"""
+
+from __future__ import print_function, division
+
+import os
+import socket
+import time
+
+import uv
+
+CONNECTIONS = 20000
+BURST = 1000
+BACKLOG = 4096
+
+
+def storm(port):
+    # child process: connect in bursts and close each burst afterwards
+    for _ in range(CONNECTIONS // BURST):
+        sockets = []
+        for _ in range(BURST):
+            client = socket.socket()
+            client.setblocking(False)
+            try:
+                client.connect(('127.0.0.1', port))
+            except socket.error:
+                pass
+            sockets.append(client)
+        time.sleep(0.01)
+        for client in sockets:
+            client.close()
+    os._exit(0)
+
+
+def run(mode, max_batch=None):
+    loop = uv.Loop()
+    server = uv.TCP(loop)
+    server.bind(('127.0.0.1', 0))
+    state = {'accepted': 0, 'callbacks': 0, 'start': None}
+
+    def account(connections):
+        if state['start'] is None:
+            state['start'] = time.time()
+        state['callbacks'] += 1
+        state['accepted'] += len(connections)
+        for connection in connections:
+            connection.close()
+        state['end'] = time.time()
+
+    def on_timeout(timer):
+        # connections dropped by a full backlog are never retried
+        if state['start'] is not None and time.time() - state['end'] > 1:
+            timer.close()
+            server.close()
+
+    def on_connection(_, status):
+        if status == uv.StatusCodes.SUCCESS:
+            account([server.accept(loop=loop)])
+
+    def on_connections(_, status, connections):
+        account(connections)
+
+    if mode == 'accept':
+        server.listen(on_connection=on_connection, backlog=BACKLOG)
+    else:
+        server.listen_batch(on_connections, backlog=BACKLOG, max_batch=max_batch,
+                            loop=loop)
+    port = server.sockname[1]
+    uv.Timer(loop).start(on_timeout, 250, 250)
+
+    pid = os.fork()
+    if pid == 0:
+        storm(port)
+    loop.run()
+    os.waitpid(pid, 0)
+    loop.close()
+    duration = state['end'] - state['start']
+    return state['accepted'] / duration, state['callbacks']
+
+
+def main():
+    print('{:>16} {:>14} {:>10}'.format('mode', 'accepts/s', 'callbacks'))
+    for mode, max_batch in (('accept', None), ('batch', None), ('batch', 64)):
+        rate, callbacks = run(mode, max_batch)
+        label = mode if max_batch is None else '{} ({})'.format(mode, max_batch)
+        print('{:>16} {:>14.1f} {:>10}'.format(label, rate, callbacks))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Reads mixed traffic, many streams receiving small messages and a few
+bulk transfers, with the default allocator and the adaptive allocator
+(copying and zero copy). Reports the total throughput, the number of
+read callbacks and the memory of the read buffers.
+"""
+
+from __future__ import print_function, division
+
+import os
+import socket
+import time
+
+import uv
+
+CHATTY = 200
+BULK = 4
+ROUNDS = 256
+MESSAGE = b'm' * 64
+CHUNK = b'b' * 2**18
+
+
+def produce(sockets):
+    # child process: interleave small messages and bulk chunks
+    chatty, bulk = sockets[:CHATTY], sockets[CHATTY:]
+    for _ in range(ROUNDS):
+        for connection in chatty:
+            connection.sendall(MESSAGE)
+        for connection in bulk:
+            connection.sendall(CHUNK)
+    for connection in sockets:
+        connection.close()
+    os._exit(0)
+
+
+def run(allocator):
+    loop = uv.Loop(allocator=allocator)
+    pairs = [socket.socketpair() for _ in range(CHATTY + BULK)]
+    state = {'bytes': 0, 'callbacks': 0}
+
+    def on_read(stream, status, data):
+        state['callbacks'] += 1
+        if status != uv.StatusCodes.SUCCESS:
+            stream.close()
+            return
+        state['bytes'] += len(data)
+        if isinstance(data, uv.loop.PooledBuffer):
+            data.release()
+
+    for reader_socket, _ in pairs:
+        reader = uv.Pipe(loop)
+        reader.open(os.dup(reader_socket.fileno()))
+        reader.start_read(on_read=on_read)
+        reader_socket.close()
+
+    start = time.time()
+    pid = os.fork()
+    if pid == 0:
+        produce([writer_socket for _, writer_socket in pairs])
+    for _, writer_socket in pairs:
+        writer_socket.close()
+    loop.run()
+    duration = time.time() - start
+    os.waitpid(pid, 0)
+    loop.close()
+
+    expected = ROUNDS * (CHATTY * len(MESSAGE) + BULK * len(CHUNK))
+    assert state['bytes'] == expected, 'missing data'
+    if isinstance(allocator, uv.loop.AdaptiveAllocator):
+        memory = allocator.stats()['memory'] + allocator.max_size
+    else:
+        memory = allocator.buffer_size
+    return state['bytes'] / duration / 2**20, state['callbacks'], memory
+
+
+def main():
+    allocators = (('default', lambda: uv.loop.DefaultAllocator()),
+                  ('adaptive', lambda: uv.loop.AdaptiveAllocator()),
+                  ('zero copy', lambda: uv.loop.AdaptiveAllocator(zero_copy=True)))
+    print('{:>10} {:>10} {:>10} {:>12}'.format('allocator', 'MB/s', 'callbacks',
+                                               'memory KiB'))
+    for name, factory in allocators:
+        throughput, callbacks, memory = run(factory())
+        print('{:>10} {:>10.1f} {:>10} {:>12}'.format(name, throughput, callbacks,
+                                                      memory // 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Compares the libuv based asyncio event loop (`uv.aio`) with asyncio's
+default selector event loop. Each loop runs an echo server and a keep-alive
+HTTP server in a child process which is then loaded by blocking client
+threads. Requests (round trips) per second are reported.
+
+Usage: benchmark_aio.py [echo|http ...] [--loops selector,uv]
+"""
+
+from __future__ import print_function, division
+
+import asyncio
+import multiprocessing
+import socket
+import sys
+import threading
+import time
+
+ADDRESS = ('127.0.0.1', 4445)
+DURATION = 5
+CLIENTS = 8
+
+MESSAGE = b'x' * 1024
+
+REQUEST = b'GET / HTTP/1.1\r\nHost: localhost\r\n\r\n'
+RESPONSE = (b'HTTP/1.1 200 OK\r\n'
+            b'Content-Type: text/plain\r\n'
+            b'Content-Length: 13\r\n'
+            b'\r\n'
+            b'Hello World!\n')
+
+
+class EchoProtocol(asyncio.Protocol):
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.transport.write(data)
+
+
+class HTTPProtocol(asyncio.Protocol):
+    def connection_made(self, transport):
+        self.transport = transport
+        self.buffer = b''
+
+    def data_received(self, data):
+        self.buffer += data
+        while b'\r\n\r\n' in self.buffer:
+            _, self.buffer = self.buffer.split(b'\r\n\r\n', 1)
+            self.transport.write(RESPONSE)
+
+
+def serve(loop_name, workload, ready):
+    if loop_name == 'uv':
+        import uv.aio
+        loop = uv.aio.new_event_loop()
+    else:
+        loop = asyncio.SelectorEventLoop()
+    asyncio.set_event_loop(loop)
+    protocol = EchoProtocol if workload == 'echo' else HTTPProtocol
+    server = loop.run_until_complete(loop.create_server(protocol, *ADDRESS,
+                                                        backlog=1000))
+    ready.set()
+    try:
+        loop.run_forever()
+    finally:
+        server.close()
+        loop.close()
+
+
+def echo_client(deadline, results):
+    connection = socket.create_connection(ADDRESS)
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    requests = 0
+    while time.time() < deadline:
+        connection.sendall(MESSAGE)
+        received = 0
+        while received < len(MESSAGE):
+            received += len(connection.recv(65536))
+        requests += 1
+    connection.close()
+    results.append(requests)
+
+
+def http_client(deadline, results):
+    connection = socket.create_connection(ADDRESS)
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    requests = 0
+    while time.time() < deadline:
+        connection.sendall(REQUEST)
+        received = 0
+        while received < len(RESPONSE):
+            received += len(connection.recv(65536))
+        requests += 1
+    connection.close()
+    results.append(requests)
+
+
+def run(loop_name, workload):
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(loop_name, workload, ready))
+    server.start()
+    ready.wait()
+
+    client = echo_client if workload == 'echo' else http_client
+    results = []
+    deadline = time.time() + DURATION
+    threads = [threading.Thread(target=client, args=(deadline, results))
+               for _ in range(CLIENTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    server.terminate()
+    server.join()
+    return sum(results) / DURATION
+
+
+def main():
+    arguments = sys.argv[1:]
+    loops = ['selector', 'uv']
+    if '--loops' in arguments:
+        index = arguments.index('--loops')
+        loops = arguments[index + 1].split(',')
+        del arguments[index:index + 2]
+    workloads = arguments or ['echo', 'http']
+    for workload in workloads:
+        for loop_name in loops:
+            rate = run(loop_name, workload)
+            print('{:>5} {:>9}: {:10.1f} requests/s'.format(workload, loop_name, rate))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Measures UDP ping-pong round-trip latencies between two processes which
+run their loops in blocking (`RunModes.DEFAULT`) and in busy-poll mode
+(`RunModes.BUSY_POLL`). Pings are paced by a timer so both loops go idle
+between two pings like a relay waiting for the next market data update.
+
+Usage: benchmark_busy_poll.py [--pings N] [--interval MS] [--spin US]
+"""
+
+from __future__ import print_function, division
+
+import argparse
+import struct
+import subprocess
+import sys
+
+import uv
+
+ECHO_ADDRESS = ('127.0.0.1', 4449)
+CLIENT_ADDRESS = ('127.0.0.1', 4450)
+PING = struct.Struct('=Q')
+MODES = {'blocking': uv.RunModes.DEFAULT, 'busy-poll': uv.RunModes.BUSY_POLL}
+
+
+def echo(mode, spin):
+    loop = uv.Loop()
+    loop.busy_poll_time = spin
+
+    def on_receive(udp, status, address, data, flags):
+        if data == b'quit':
+            udp.close()
+        elif data:
+            udp.send(data, address)
+
+    udp = uv.UDP(loop=loop)
+    udp.bind(ECHO_ADDRESS)
+    udp.receive_start(on_receive=on_receive)
+    sys.stdout.write('ready\n')
+    sys.stdout.flush()
+    loop.run(MODES[mode])
+
+
+def ping(mode, arguments):
+    loop = uv.Loop()
+    loop.busy_poll_time = arguments.spin
+    round_trips = []
+
+    def on_receive(udp, status, address, data, flags):
+        if len(data) == PING.size:
+            round_trips.append(uv.library.lib.uv_hrtime() - PING.unpack(data)[0])
+
+    def on_timeout(timer):
+        if len(round_trips) >= arguments.pings:
+            timer.close()
+            udp.send(b'quit', ECHO_ADDRESS)
+            udp.close()
+        else:
+            udp.send(PING.pack(uv.library.lib.uv_hrtime()), ECHO_ADDRESS)
+
+    process = subprocess.Popen([sys.executable, __file__, '--echo', mode,
+                                str(arguments.spin)], stdout=subprocess.PIPE)
+    process.stdout.readline()
+
+    udp = uv.UDP(loop=loop)
+    udp.bind(CLIENT_ADDRESS)
+    udp.receive_start(on_receive=on_receive)
+    timer = uv.Timer(loop=loop)
+    timer.start(on_timeout, arguments.interval, arguments.interval)
+    loop.run(MODES[mode])
+    process.wait()
+
+    stats = loop.busy_poll_stats()
+    loop.close()
+    return sorted(round_trips), stats
+
+
+def percentile(values, percent):
+    return values[min(len(values) - 1, int(len(values) * percent / 100))] / 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pings', type=int, default=10000)
+    parser.add_argument('--interval', type=int, default=1)
+    parser.add_argument('--spin', type=int, default=200)
+    arguments = parser.parse_args()
+
+    print('{:>10} {:>9} {:>9} {:>9} {:>9} {:>9} {:>8} {:>8}'.format(
+        'mode', 'p50 (us)', 'p90', 'p99', 'p99.9', 'max', 'spins', 'parks'))
+    for mode in ('blocking', 'busy-poll'):
+        round_trips, stats = ping(mode, arguments)
+        print('{:>10} {:>9.1f} {:>9.1f} {:>9.1f} {:>9.1f} {:>9.1f} {:>8} {:>8}'.format(
+            mode, percentile(round_trips, 50), percentile(round_trips, 90),
+            percentile(round_trips, 99), percentile(round_trips, 99.9),
+            round_trips[-1] / 1e3, stats['spins'], stats['parks']))
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--echo']:
+        echo(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
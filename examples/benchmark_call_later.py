@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Measures how many callbacks per second worker threads are able to hand over
+to the event loop thread with `Loop.call_later` (one callback per call) and
+`Loop.call_later_many` (batches of callbacks) for different numbers of
+producer threads.
+"""
+
+from __future__ import print_function, division
+
+import sys
+import threading
+import time
+
+import uv
+
+CALLBACKS = 2**18
+BATCH_SIZE = 64
+PRODUCERS = [1, 2, 4, 8]
+
+
+def produce_single(loop, callback, count):
+    call_later = loop.call_later
+    for _ in range(count):
+        call_later(callback)
+
+
+def produce_many(loop, callback, count):
+    batch = [(callback, ())] * BATCH_SIZE
+    for _ in range(count // BATCH_SIZE):
+        loop.call_later_many(batch)
+
+
+def run(producers, producer):
+    loop = uv.Loop()
+    state = {'received': 0}
+    total = (CALLBACKS // producers // BATCH_SIZE) * BATCH_SIZE * producers
+
+    # keep the loop alive until all callbacks have been received
+    loop.base_loop.reference_internal_async()
+
+    def callback():
+        state['received'] += 1
+        if state['received'] == total:
+            loop.base_loop.dereference_internal_async()
+
+    threads = [threading.Thread(target=producer, args=(loop, callback, total // producers))
+               for _ in range(producers)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    loop.run()
+    duration = time.time() - start
+    for thread in threads:
+        thread.join()
+    loop.close()
+    return total / duration
+
+
+def main():
+    modes = sys.argv[1:] or ['single', 'many']
+    print('{:>10} {:>8} {:>16}'.format('mode', 'threads', 'callbacks/s'))
+    for mode in modes:
+        producer = produce_many if mode == 'many' else produce_single
+        for producers in PRODUCERS:
+            rate = run(producers, producer)
+            print('{:>10} {:>8} {:>16.1f}'.format(mode, producers, rate))
+
+
+if __name__ == '__main__':
+    main()
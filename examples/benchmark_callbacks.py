@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Measures how many callbacks per second are dispatched from libuv to Python
+for timer, idle and TCP read callbacks. Run it once with a base library
+built in API-mode (`extern "Python"` callbacks) and once in ABI-mode
+(`ffi.callback`) on CPython and PyPy to compare both mechanisms.
+
+Usage: benchmark_callbacks.py [timer|idle|tcp ...]
+"""
+
+from __future__ import print_function, division
+
+import platform
+import sys
+import time
+
+import uv
+
+ADDRESS = ('127.0.0.1', 4446)
+DURATION = 3
+
+
+def bench_timer(loop):
+    state = {'count': 0, 'deadline': time.time() + DURATION}
+
+    def on_timeout(timer):
+        state['count'] += 1
+        if state['count'] & 0xff == 0 and time.time() > state['deadline']:
+            timer.close()
+        else:
+            timer.start(on_timeout, 0, 0)
+
+    timer = uv.Timer(loop)
+    timer.start(on_timeout, 0, 0)
+    loop.run()
+    return state['count']
+
+
+def bench_idle(loop):
+    state = {'count': 0, 'deadline': time.time() + DURATION}
+
+    def on_idle(idle):
+        state['count'] += 1
+        if state['count'] & 0xff == 0 and time.time() > state['deadline']:
+            idle.close()
+
+    idle = uv.Idle(loop)
+    idle.start(on_idle)
+    loop.run()
+    return state['count']
+
+
+def bench_tcp(loop):
+    state = {'count': 0, 'deadline': time.time() + DURATION}
+
+    def on_echo(connection, status, data):
+        if status != uv.StatusCodes.SUCCESS:
+            connection.close()
+        elif data:
+            connection.write(data)
+
+    def on_connection(server, status):
+        server.accept().start_read(on_read=on_echo)
+
+    def on_read(client, status, data):
+        if status != uv.StatusCodes.SUCCESS:
+            client.close()
+            return
+        state['count'] += 1
+        if time.time() > state['deadline'] and state['count'] & 0xff == 0:
+            client.close()
+            server.close()
+            loop.close_all_handles()
+        else:
+            client.write(b'x')
+
+    def on_connect(request, status):
+        request.stream.start_read(on_read=on_read)
+        request.stream.write(b'x')
+
+    server = uv.TCP(loop=loop)
+    server.bind(ADDRESS)
+    server.listen(on_connection=on_connection, backlog=16)
+    client = uv.TCP(loop=loop)
+    client.set_nodelay(True)
+    client.connect(ADDRESS, on_connect=on_connect)
+    loop.run()
+    return state['count']
+
+
+BENCHMARKS = {'timer': bench_timer, 'idle': bench_idle, 'tcp': bench_tcp}
+
+
+def main():
+    mode = 'API' if hasattr(uv.library.lib, 'python_uv_timer_cb') else 'ABI'
+    print('{} {}, {}-mode callbacks'.format(platform.python_implementation(),
+                                            platform.python_version(), mode))
+    for name in sys.argv[1:] or ['timer', 'idle', 'tcp']:
+        loop = uv.Loop()
+        start = time.time()
+        count = BENCHMARKS[name](loop)
+        duration = time.time() - start
+        loop.close()
+        print('{:>6}: {:12.1f} callbacks/s'.format(name, count / duration))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Variant of `benchmark_http.py` which writes every response with many small
+writes. It runs the server once with plain writes and once with automatic
+corking and reports requests per second and the number of `uv_write` calls
+(each one results in at least one `write` system call). Run it under
+`strace -c -f` to see the system call counts directly.
+"""
+
+from __future__ import print_function, division
+
+import socket
+import sys
+import threading
+import time
+
+import uv
+
+from uv.handles import stream as uv_stream
+
+RESPONSE = [b'HTTP/1.1 200 OK\r\n',
+            b'Content-Type: text/plain\r\n',
+            b'Server: python-uv\r\n',
+            b'Cache-Control: no-cache\r\n',
+            b'Connection: close\r\n',
+            b'Content-Length: 13\r\n',
+            b'\r\n',
+            b'Hello World!\n']
+
+REQUEST = b'GET / HTTP/1.1\r\nHost: localhost\r\n\r\n'
+
+ADDRESS = ('127.0.0.1', 4444)
+DURATION = 5
+CLIENTS = 4
+
+
+class CountingWriteRequest(uv_stream.WriteRequest):
+    count = 0
+
+    def __init__(self, *arguments, **keywords):
+        CountingWriteRequest.count += 1
+        super(CountingWriteRequest, self).__init__(*arguments, **keywords)
+
+
+def on_shutdown(request, _):
+    request.stream.close()
+
+
+def on_read(stream, status, data):
+    if status != uv.StatusCodes.SUCCESS:
+        stream.close()
+        return
+    if not data.strip():
+        return
+    for line in RESPONSE:
+        stream.write(line)
+    stream.shutdown(on_shutdown)
+
+
+def client(deadline, results):
+    requests = 0
+    while time.time() < deadline:
+        connection = socket.create_connection(ADDRESS)
+        connection.sendall(REQUEST)
+        while connection.recv(4096):
+            pass
+        connection.close()
+        requests += 1
+    results.append(requests)
+
+
+def run(auto_cork):
+    loop = uv.Loop()
+
+    def on_connection(server, _):
+        connection = server.accept()
+        connection.auto_cork = auto_cork
+        connection.start_read(on_read=on_read)
+
+    server = uv.TCP(loop)
+    server.bind(ADDRESS)
+    server.listen(on_connection=on_connection, backlog=1000)
+
+    def on_timeout(timer):
+        loop.close_all_handles()
+
+    timer = uv.Timer(loop)
+    timer.start(on_timeout, int((DURATION + 1) * 1000), 0)
+
+    results = []
+    deadline = time.time() + DURATION
+    threads = [threading.Thread(target=client, args=(deadline, results))
+               for _ in range(CLIENTS)]
+    for thread in threads:
+        thread.start()
+
+    CountingWriteRequest.count = 0
+    loop.run()
+    for thread in threads:
+        thread.join()
+    loop.close()
+
+    requests = sum(results)
+    return requests / DURATION, CountingWriteRequest.count / max(requests, 1)
+
+
+def main():
+    uv_stream.WriteRequest = CountingWriteRequest
+    modes = sys.argv[1:] or ['plain', 'cork']
+    for mode in modes:
+        rate, writes = run(mode == 'cork')
+        print('{:>6}: {:10.1f} requests/s {:6.1f} uv_write calls/request'.format(mode, rate,
+                                                                                 writes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Measures the resident memory per idle TCP connection held by a server
+using regular :class:`uv.TCP` connections and using the compact
+connections of :class:`uv.compact.CompactServer`. The clients run in a
+child process and spread over several loopback addresses to not run out
+of ephemeral ports. The file descriptor limit has to be raised for large
+numbers of connections (e.g. `ulimit -n 250000`). Linux only.
+
+Usage: benchmark_idle_connections.py [--connections N ...] [--mode full|compact]
+"""
+
+from __future__ import print_function, division
+
+import argparse
+import gc
+import os
+import socket
+import subprocess
+import sys
+
+import uv
+
+from uv.compact import CompactServer
+
+PORT = 4448
+PER_ADDRESS = 20000
+
+
+def resident_bytes():
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def client(connections):
+    sockets = []
+    for index in range(connections):
+        sock = socket.socket()
+        sock.bind(('127.0.0.%d' % (2 + index // PER_ADDRESS), 0))
+        sock.connect(('127.0.0.1', PORT))
+        sockets.append(sock)
+    sys.stdout.write('connected\n')
+    sys.stdout.flush()
+    sys.stdin.read()
+
+
+def serve(mode, connections):
+    loop = uv.Loop()
+    state = {'accepted': 0, 'handles': []}
+
+    def count():
+        state['accepted'] += 1
+        if state['accepted'] == connections:
+            loop.stop()
+
+    def on_connection(server, status):
+        connection = server.accept()
+        connection.start_read(on_read=on_read)
+        state['handles'].append(connection)
+        count()
+
+    def on_read(connection, status, data):
+        if status != uv.StatusCodes.SUCCESS:
+            connection.close()
+
+    if mode == 'compact':
+        server = CompactServer(loop, on_connection=lambda _: count())
+    else:
+        server = uv.TCP(loop, on_connection=on_connection)
+    server.bind(('127.0.0.1', PORT))
+
+    gc.collect()
+    before = resident_bytes()
+
+    server.listen(backlog=4096)
+    process = subprocess.Popen([sys.executable, __file__, '--client', str(connections)],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    loop.run()
+    gc.collect()
+    after = resident_bytes()
+
+    process.stdout.readline()
+    process.stdin.close()
+    process.wait()
+
+    if mode == 'compact':
+        server.close()
+    else:
+        loop.close_all_handles()
+    loop.run()
+    loop.close()
+    return (after - before) / connections
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--connections', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--mode', choices=('full', 'compact'), nargs='+',
+                        default=['full', 'compact'])
+    parser.add_argument('--client', type=int, default=None, help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.client is not None:
+        client(arguments.client)
+        return
+
+    print('{:>12} {:>8} {:>16}'.format('connections', 'mode', 'bytes/conn'))
+    for connections in arguments.connections:
+        for mode in arguments.mode:
+            # every configuration runs in a fresh process so that memory
+            # freed by a previous run does not distort the measurement
+            output = subprocess.check_output([sys.executable, __file__, '--run',
+                                              mode, str(connections)])
+            print('{:>12} {:>8} {:>16.1f}'.format(connections, mode,
+                                                  float(output)))
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--run']:
+        print(serve(sys.argv[2], int(sys.argv[3])))
+    else:
+        main()
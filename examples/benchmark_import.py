@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Measures the time it takes to import the package in a fresh interpreter
+with `python -X importtime` (Python 3.7 or later). Each scenario runs in
+a new process several times and the median of the cumulative import time
+of `uv` and of all modules is reported together with the slowest modules.
+
+Pass `--max-ms <milliseconds>` to exit with status 1 if the median time of
+the `import uv` scenario exceeds the given budget, e.g. in CI to guard
+against import time regressions.
+
+Usage: benchmark_import.py [--runs N] [--max-ms MS] [--top N]
+"""
+
+from __future__ import print_function, division
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+SCENARIOS = [
+    ('import uv', 'import uv'),
+    ('uv.Timer + uv.Process', 'import uv; uv.Timer; uv.Process'),
+    ('uv.TCP', 'import uv; uv.TCP'),
+    ('uv.secure', 'import uv; uv.secure'),
+    ('everything', 'import uv; [getattr(uv, name) for name in dir(uv)]')
+]
+
+IMPORT_TIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def measure(code):
+    """
+    Run the code in a fresh interpreter and parse the import time report.
+
+    :return: total time, time of the uv package, self time per module (us)
+    """
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    process = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', code],
+                               stderr=subprocess.PIPE, env=environment)
+    _, output = process.communicate()
+    total, package, modules = 0, 0, {}
+    for line in output.decode().splitlines():
+        match = IMPORT_TIME.match(line)
+        if match is None:
+            continue
+        self_time, cumulative, indent, name = match.groups()
+        modules[name] = int(self_time)
+        if len(indent) == 1:
+            # top level import
+            total += int(cumulative)
+        if name == 'uv':
+            package = int(cumulative)
+    return total, package, modules
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    if sys.version_info < (3, 7):
+        print('python -X importtime requires Python 3.7 or later')
+        sys.exit(2)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=9)
+    parser.add_argument('--max-ms', type=float, default=None)
+    parser.add_argument('--top', type=int, default=5)
+    arguments = parser.parse_args()
+
+    print('{:<24} {:>12} {:>12} {:>8}'.format('scenario', 'uv (ms)', 'total (ms)',
+                                             'modules'))
+    results = {}
+    for name, code in SCENARIOS:
+        runs = [measure(code) for _ in range(arguments.runs)]
+        total = median(run[0] for run in runs) / 1000
+        package = median(run[1] for run in runs) / 1000
+        modules = runs[-1][2]
+        results[name] = package
+        print('{:<24} {:>12.2f} {:>12.2f} {:>8}'.format(name, package, total,
+                                                         len(modules)))
+        slowest = sorted(modules.items(), key=lambda item: -item[1])[:arguments.top]
+        for module, self_time in slowest:
+            print('    {:<40} {:>8.2f}'.format(module, self_time / 1000))
+
+    if arguments.max_ms is not None and results['import uv'] > arguments.max_ms:
+        print('import uv took {:.2f}ms, budget is {:.2f}ms'.format(results['import uv'],
+                                                                   arguments.max_ms))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
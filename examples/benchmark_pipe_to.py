@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Forwards data between two TCP connections with :func:`uv.UVStream.pipe_to`
+using `splice` (on Linux) and the portable copying fallback and reports
+the throughput as well as the CPU time spent per GB of forwarded data.
+The data is produced and consumed by a child process, so the CPU time
+of the forwarding process only covers the forwarding itself.
+"""
+
+from __future__ import print_function, division
+
+import os
+import socket
+import time
+
+import uv
+
+SIZE = 2**30
+CHUNK = b'x' * 2**16
+
+
+def peer(address, port):
+    # child process: send SIZE bytes to the proxy and drain the echo side
+    sender = socket.create_connection((address, port))
+    receiver = socket.create_connection((address, port))
+    pid = os.fork()
+    if pid == 0:
+        receiver.close()
+        for _ in range(SIZE // len(CHUNK)):
+            sender.sendall(CHUNK)
+        sender.close()
+        os._exit(0)
+    sender.close()
+    received = 0
+    while True:
+        data = receiver.recv(2**18)
+        if not data:
+            break
+        received += len(data)
+    receiver.close()
+    os.waitpid(pid, 0)
+    os._exit(0 if received == SIZE else 1)
+
+
+def run(splice):
+    loop = uv.Loop()
+    server = uv.TCP(loop)
+    server.bind(('127.0.0.1', 0))
+    connections = []
+    state = {}
+
+    def on_done(forwarder, status):
+        state['status'] = status
+        for connection in connections:
+            connection.close()
+
+    def on_connection(_, status):
+        connections.append(server.accept())
+        if len(connections) == 2:
+            server.close()
+            state['start'], state['times'] = time.time(), os.times()
+            state['forwarder'] = connections[0].pipe_to(connections[1], on_done=on_done,
+                                                        splice=splice)
+
+    server.listen(on_connection=on_connection, backlog=2)
+    address, port = server.sockname[:2]
+
+    pid = os.fork()
+    if pid == 0:
+        peer(address, port)
+    loop.run()
+    duration = time.time() - state['start']
+    times = os.times()
+    cpu = (times[0] - state['times'][0]) + (times[1] - state['times'][1])
+    _, code = os.waitpid(pid, 0)
+    loop.close()
+
+    forwarder = state['forwarder']
+    assert forwarder.bytes == SIZE and code == 0, 'forwarding failed'
+    gigabytes = forwarder.bytes / 2**30
+    return forwarder.method, forwarder.bytes / duration / 2**20, cpu / gigabytes
+
+
+def main():
+    print('{:>8} {:>12} {:>12}'.format('method', 'MB/s', 'CPU s/GB'))
+    for splice in (True, False):
+        method, throughput, cpu = run(splice)
+        print('{:>8} {:>12.1f} {:>12.3f}'.format(method, throughput, cpu))
+
+
+if __name__ == '__main__':
+    main()
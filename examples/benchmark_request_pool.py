@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Measures small writes per second through a local stream with and without
+the per-loop request free lists and reports the pool hit rate as well as
+the number of garbage collections triggered during the run.
+"""
+
+from __future__ import print_function, division
+
+import gc
+import socket
+import time
+
+import uv
+
+WRITES = 2**18
+PIPELINE = 64
+PAYLOAD = b'x' * 64
+
+
+def run(pool_size):
+    loop = uv.Loop()
+    loop.request_pool_size = pool_size
+    writer_socket, reader_socket = socket.socketpair()
+
+    writer = uv.Pipe(loop)
+    writer.open(writer_socket.fileno())
+    # measure the queued path, immediate writes do not use requests at all
+    writer.write_fast_path = False
+    reader = uv.Pipe(loop)
+    reader.open(reader_socket.fileno())
+
+    state = {'received': 0, 'written': PIPELINE}
+    expected = WRITES * len(PAYLOAD)
+
+    def on_read(stream, status, data):
+        state['received'] += len(data)
+        if state['received'] >= expected or status != uv.StatusCodes.SUCCESS:
+            stream.close()
+            writer.close()
+
+    def on_write(request, status):
+        if status == uv.StatusCodes.SUCCESS and state['written'] < WRITES:
+            state['written'] += 1
+            request.stream.write(PAYLOAD, on_write=on_write)
+
+    reader.start_read(on_read=on_read)
+    for _ in range(PIPELINE):
+        writer.write(PAYLOAD, on_write=on_write)
+
+    collections = sum(stats['collections'] for stats in gc.get_stats())
+    start = time.time()
+    loop.run()
+    duration = time.time() - start
+    collections = sum(stats['collections'] for stats in gc.get_stats()) - collections
+
+    stats = loop.request_pool_stats().get('uv_write_t', {'hit_rate': 0.0})
+    loop.close()
+    writer_socket.close()
+    reader_socket.close()
+    return state['written'] / duration, stats['hit_rate'], collections
+
+
+def main():
+    print('{:>10} {:>14} {:>10} {:>8}'.format('pool size', 'writes/s', 'hit rate',
+                                              'gc runs'))
+    for pool_size in (0, 16, 128, 1024):
+        rate, hit_rate, collections = run(pool_size)
+        print('{:>10} {:>14.1f} {:>10.3f} {:>8}'.format(pool_size, rate, hit_rate,
+                                                       collections))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Compares the write throughput and the memory allocated per write of the
+copying buffer conversion (before) with the zero-copy conversion (after)
+for payloads between 1 KiB and 64 MiB written through a local stream.
+"""
+
+from __future__ import print_function, division
+
+import socket
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+import uv
+
+from uv import library
+from uv.library import ffi, lib
+
+SIZES = [2**10, 2**14, 2**16, 2**20, 2**24, 2**26]
+TOTAL = 2**28
+
+
+def make_uv_buffers_copy(buffers):
+    if not isinstance(buffers, (list, tuple)):
+        buffers = (buffers, )
+    c_buffers = [ffi.new('char[]', bytes(item)) for item in buffers]
+    uv_buffers = ffi.new('uv_buf_t[]', len(buffers))
+    library.c_require(uv_buffers, c_buffers)
+    for index, c_base in enumerate(c_buffers):
+        lib.py_uv_buf_set(uv_buffers + index, c_base, len(c_base) - 1)
+    return uv_buffers
+
+
+def measure_allocations(make_uv_buffers, payload):
+    if tracemalloc is None:
+        return float('nan')
+    tracemalloc.start()
+    uv_buffers = make_uv_buffers(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del uv_buffers
+    return peak
+
+
+def measure_throughput(make_uv_buffers, payload):
+    library.make_uv_buffers = make_uv_buffers
+
+    loop = uv.Loop()
+    writer_socket, reader_socket = socket.socketpair()
+
+    writer = uv.Pipe(loop)
+    writer.open(writer_socket.fileno())
+    reader = uv.Pipe(loop)
+    reader.open(reader_socket.fileno())
+
+    state = {'received': 0, 'written': 0}
+    expected = max(TOTAL // len(payload), 4) * len(payload)
+
+    def on_read(stream, status, data):
+        state['received'] += len(data)
+        if state['received'] >= expected or status != uv.StatusCodes.SUCCESS:
+            stream.close()
+            writer.close()
+
+    def on_write(request, status):
+        if status == uv.StatusCodes.SUCCESS and state['written'] < expected:
+            state['written'] += len(payload)
+            request.stream.write(payload, on_write=on_write)
+
+    reader.start_read(on_read=on_read)
+    for _ in range(4):
+        state['written'] += len(payload)
+        writer.write(payload, on_write=on_write)
+
+    start = time.time()
+    loop.run()
+    duration = time.time() - start
+
+    loop.close()
+    writer_socket.close()
+    reader_socket.close()
+    return state['received'] / duration
+
+
+def main():
+    zero_copy = library.make_uv_buffers
+    print('{:>10} {:>14} {:>14} {:>12} {:>12}'.format('size', 'copy MB/s', 'zero MB/s',
+                                                      'copy B/wr', 'zero B/wr'))
+    for size in SIZES:
+        payload = memoryview(bytearray(size))
+        copy_rate = measure_throughput(make_uv_buffers_copy, payload)
+        zero_rate = measure_throughput(zero_copy, payload)
+        copy_allocated = measure_allocations(make_uv_buffers_copy, payload)
+        zero_allocated = measure_allocations(zero_copy, payload)
+        print('{:>10} {:>14.1f} {:>14.1f} {:>12} {:>12}'.format(size, copy_rate / 2**20,
+                                                                zero_rate / 2**20,
+                                                                copy_allocated,
+                                                                zero_allocated))
+    library.make_uv_buffers = zero_copy
+
+
+if __name__ == '__main__':
+    main()
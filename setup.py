@@ -76,6 +76,9 @@ with open(os.path.join(__dir__, 'cffi_source.c'), 'rb') as cffi_source:
 with open(os.path.join(__dir__, 'cffi_declarations.c'), 'rb') as cffi_declarations:
     declarations = cffi_declarations.read().decode('utf-8')
 
+with open(os.path.join(__dir__, 'cffi_callbacks.c'), 'rb') as cffi_callbacks:
+    callbacks = cffi_callbacks.read().decode('utf-8')
+
 with open(os.path.join(__dir__, 'cffi_template.py'), 'rb') as cffi_template:
     uvcffi_code = cffi_template.read().decode('utf-8').format(**locals())
 
@@ -86,6 +89,10 @@ with open(os.path.join(__dir__, 'uvcffi', '__init__.py'), 'wb') as uvcffi_module
 ffi = cffi.FFI()
 ffi.cdef(declarations)
 
+if hasattr(ffi, 'def_extern'):
+    # API-mode with extern "Python" callbacks (cffi >= 1.4)
+    ffi.cdef(callbacks)
+
 try:
     ffi.set_source('_uvcffi', source)
     extension = ffi.distutils_extension()
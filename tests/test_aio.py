@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import socket
+import sys
+import threading
+import unittest
+
+import common
+
+try:
+    import asyncio
+    from uv import aio
+except (ImportError, SyntaxError):
+    aio = None
+
+
+PROGRAM_HELLO = common.resolve_path('program_hello.py')
+
+
+class EchoProtocol(object if aio is None else asyncio.Protocol):
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.transport.write(data)
+
+
+class ClientProtocol(object if aio is None else asyncio.Protocol):
+    def __init__(self, future):
+        self.future = future
+        self.data = b''
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.write(b'hello')
+
+    def data_received(self, data):
+        self.data += data
+        if self.data == b'hello':
+            self.transport.close()
+
+    def connection_lost(self, exc):
+        self.future.set_result(self.data)
+
+
+@unittest.skipIf(aio is None, 'asyncio is not available')
+class TestAIO(common.TestCase):
+    def set_up(self):
+        self.aio_loop = aio.EventLoop(self.loop)
+
+    def tear_down(self):
+        self.aio_loop.close()
+
+    def test_call_soon_later(self):
+        order = []
+        self.aio_loop.call_later(0.02, order.append, 'later')
+        self.aio_loop.call_later(0.01, order.append, 'cancelled').cancel()
+        self.aio_loop.call_soon(order.append, 'soon')
+        handle = self.aio_loop.call_soon(order.append, 'cancelled')
+        handle.cancel()
+        self.aio_loop.call_later(0.05, self.aio_loop.stop)
+        self.aio_loop.run_forever()
+        self.assert_equal(order, ['soon', 'later'])
+
+    def test_call_soon_threadsafe(self):
+        future = self.aio_loop.create_future()
+
+        def worker():
+            self.aio_loop.call_soon_threadsafe(future.set_result, 42)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        self.assert_equal(self.aio_loop.run_until_complete(future), 42)
+        thread.join()
+
+    def test_tcp_echo(self):
+        server = self.aio_loop.run_until_complete(
+            self.aio_loop.create_server(EchoProtocol, common.TEST_IPV4, common.TEST_PORT1))
+        future = self.aio_loop.create_future()
+        self.aio_loop.run_until_complete(
+            self.aio_loop.create_connection(lambda: ClientProtocol(future),
+                                            common.TEST_IPV4, common.TEST_PORT1))
+        self.assert_equal(self.aio_loop.run_until_complete(future), b'hello')
+        server.close()
+        self.aio_loop.run_until_complete(server.wait_closed())
+
+    @common.skip_platform('win32')
+    def test_add_reader(self):
+        reader, writer = socket.socketpair()
+        future = self.aio_loop.create_future()
+
+        def on_readable():
+            self.aio_loop.remove_reader(reader)
+            future.set_result(reader.recv(16))
+
+        self.aio_loop.add_reader(reader, on_readable)
+        writer.send(b'ping')
+        self.assert_equal(self.aio_loop.run_until_complete(future), b'ping')
+        reader.close()
+        writer.close()
+
+    def test_subprocess_exec(self):
+        future = self.aio_loop.create_future()
+        output = []
+
+        class ProcessProtocol(asyncio.SubprocessProtocol):
+            def pipe_data_received(self, fd, data):
+                output.append(data)
+
+            def connection_made(self, transport):
+                self.transport = transport
+
+            def connection_lost(self, exc):
+                future.set_result(self.transport.get_returncode())
+
+        self.aio_loop.run_until_complete(
+            self.aio_loop.subprocess_exec(ProcessProtocol, sys.executable, PROGRAM_HELLO))
+        self.assert_equal(self.aio_loop.run_until_complete(future), 1)
+        self.assert_equal(b''.join(output).strip(), b'hello')
+
+    def test_getaddrinfo(self):
+        infos = self.aio_loop.run_until_complete(
+            self.aio_loop.getaddrinfo(common.TEST_IPV4, common.TEST_PORT1,
+                                      type=socket.SOCK_STREAM))
+        self.assert_in((common.TEST_IPV4, common.TEST_PORT1), [info[4] for info in infos])
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import array
+
+import common
+
+import uv
+
+from uv.compact import CompactServer
+
+
+class TestCompact(common.TestCase):
+    def test_echo(self):
+        self.accepted = []
+        self.closed = []
+        self.received = b''
+
+        def on_connection(connection):
+            self.accepted.append(connection)
+            connection.data = 'session'
+
+        def on_server_read(connection, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                connection.close()
+            else:
+                connection.write(data.upper())
+
+        def on_closed(connection):
+            self.closed.append(connection)
+            self.server.close()
+
+        def on_read(stream, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                stream.close()
+                return
+            self.received += data
+            if self.received == b'HELLO':
+                stream.close()
+
+        def on_connect(request, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            request.stream.start_read(on_read=on_read)
+            request.stream.write(b'hello')
+
+        self.server = CompactServer(on_read=on_server_read, on_connection=on_connection,
+                                    on_closed=on_closed)
+        self.server.bind((common.TEST_IPV4, common.TEST_PORT1))
+        self.server.listen()
+
+        self.client = uv.TCP()
+        self.client.connect((common.TEST_IPV4, common.TEST_PORT1), on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(self.received, b'HELLO')
+        self.assert_equal(self.accepted, self.closed)
+        self.assert_equal(self.accepted[0].data, 'session')
+        self.assert_equal(self.server.connections, 0)
+        self.assert_not_in(self.accepted[0], self.loop.handles)
+
+    def test_write_items(self):
+        self.received = b''
+        items = array.array('i', range(64))
+
+        def on_connection(connection):
+            connection.write(memoryview(items))
+            connection.close()
+
+        def on_read(stream, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                stream.close()
+                self.server.close()
+            else:
+                self.received += data
+
+        def on_connect(request, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            request.stream.start_read(on_read=on_read)
+
+        self.server = CompactServer(on_connection=on_connection)
+        self.server.bind((common.TEST_IPV4, common.TEST_PORT1))
+        self.server.listen()
+
+        self.client = uv.TCP()
+        self.client.connect((common.TEST_IPV4, common.TEST_PORT1), on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(self.received, items.tobytes())
+
+    def test_adaptive_allocator(self):
+        self.accepted = []
+        self.replies = 0
+        self.loop.allocator = uv.loop.AdaptiveAllocator(min_size=1024, initial_size=4096,
+                                                        shrink_after=2)
+
+        def on_connection(connection):
+            self.accepted.append(connection)
+
+        def on_server_read(connection, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                connection.close()
+                self.server.close()
+            else:
+                connection.write(data)
+
+        def on_read(stream, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                stream.close()
+                return
+            self.replies += 1
+            if self.replies < 3:
+                stream.write(b'ping')
+            else:
+                stream.close()
+
+        def on_connect(request, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            request.stream.start_read(on_read=on_read)
+            request.stream.write(b'ping')
+
+        self.server = CompactServer(on_read=on_server_read, on_connection=on_connection)
+        self.server.bind((common.TEST_IPV4, common.TEST_PORT1))
+        self.server.listen()
+
+        self.client = uv.TCP()
+        self.client.connect((common.TEST_IPV4, common.TEST_PORT1), on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(self.replies, 3)
+        allocator = self.loop.allocator
+        # small reads of the compact connection shrink its read size
+        self.assert_equal(allocator.size_of(self.accepted[0]), 2048)
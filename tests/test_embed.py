@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import os
+import socket
+import threading
+import time
+import unittest
+
+import common
+
+import uv
+
+from uv.embed import SelectorAdapter, AsyncioAdapter
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+
+def cpu_time():
+    times = os.times()
+    return times[0] + times[1]
+
+
+@unittest.skipIf(uv.common.is_win32, 'backend file descriptor is not supported')
+class TestEmbed(common.TestCase):
+    def test_selector(self):
+        self.latencies = {}
+        self.started = uv.library.lib.uv_hrtime()
+        self.written = None
+
+        def on_timeout(timer):
+            elapsed = uv.library.lib.uv_hrtime() - self.started
+            self.latencies['timer'] = elapsed / 1e6 - 100
+            timer.close()
+
+        def on_read(stream, status, data):
+            self.latencies['read'] = (uv.library.lib.uv_hrtime() - self.written) / 1e6
+            stream.close()
+
+        def write():
+            self.written = uv.library.lib.uv_hrtime()
+            left.send(b'x')
+
+        left, right = socket.socketpair()
+        self.pipe = uv.Pipe()
+        self.pipe.open(os.dup(right.fileno()))
+        right.close()
+        self.pipe.start_read(on_read=on_read)
+        self.timer = uv.Timer()
+        self.timer.start(on_timeout, 100, 0)
+        thread = threading.Timer(0.15, write)
+        thread.start()
+
+        adapter = SelectorAdapter(self.loop)
+        wall, cpu = time.time(), cpu_time()
+        adapter.run()
+        wall, cpu = time.time() - wall, cpu_time() - cpu
+        adapter.close()
+        thread.join()
+        left.close()
+
+        # only order of magnitude bounds, the latencies depend on the machine
+        self.assert_greater(self.latencies['timer'], -5)
+        self.assert_less(self.latencies['timer'], 1000)
+        self.assert_less(self.latencies['read'], 1000)
+        self.assert_greater(wall, 0.1)
+        # the loop must not spin while it is waiting
+        self.assert_less(cpu, wall / 2)
+
+    @unittest.skipIf(asyncio is None, 'asyncio is not available')
+    def test_asyncio(self):
+        self.fired = []
+        aio_loop = asyncio.new_event_loop()
+
+        def on_timeout(timer):
+            self.fired.append(aio_loop.time())
+            timer.close()
+            aio_loop.call_soon(aio_loop.stop)
+
+        self.timer = uv.Timer()
+        self.timer.start(on_timeout, 100, 0)
+
+        adapter = AsyncioAdapter(self.loop, aio_loop)
+        started, cpu = aio_loop.time(), cpu_time()
+        aio_loop.run_forever()
+        wall, cpu = aio_loop.time() - started, cpu_time() - cpu
+        adapter.close()
+        aio_loop.close()
+
+        self.assert_equal(len(self.fired), 1)
+        self.assert_greater_equal(self.fired[0] - started, 0.09)
+        self.assert_less(self.fired[0] - started, 1)
+        # the loop must not spin while it is waiting
+        self.assert_less(cpu, wall / 2)
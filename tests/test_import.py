@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import os
+import subprocess
+import sys
+import unittest
+
+import common
+
+import uv
+
+PROGRAM = '''
+import sys
+import uv
+before = set(sys.modules)
+uv.Timer
+uv.Process
+after = set(sys.modules)
+print(' '.join(sorted(before)))
+print(' '.join(sorted(after)))
+'''
+
+HANDLE_TYPES_PROGRAM = '''
+import socket
+import uv
+from uv.handle import HandleTypes
+server = socket.socket()
+print(uv.misc.guess_handle(server.fileno()).__name__)
+print(HandleTypes.TTY.cls.__name__)
+print(HandleTypes.FILE.cls.__name__)
+'''
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'lazy loading requires Python 3.7')
+class TestImport(common.TestCase):
+    def test_lazy_import(self):
+        environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        output = subprocess.check_output([sys.executable, '-c', PROGRAM],
+                                         env=environment).decode()
+        before, after = (set(line.split()) for line in output.splitlines())
+
+        for module in ('ssl', 'uv.secure', 'uv.dns', 'uv.fs', 'uv.misc',
+                       'uv.handles.tcp', 'uv.handles.timer'):
+            self.assert_not_in(module, before)
+        self.assert_in('uv.handles.timer', after)
+        self.assert_in('uv.handles.process', after)
+        self.assert_not_in('uv.handles.tcp', after)
+        self.assert_not_in('ssl', after)
+
+    def test_lazy_handle_types(self):
+        environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        output = subprocess.check_output([sys.executable, '-c', HANDLE_TYPES_PROGRAM],
+                                         env=environment).decode()
+        self.assert_equal(output.split(), ['TCP', 'TTY', 'UVHandle'])
+
+    def test_lazy_attributes(self):
+        self.assert_is(uv.TCP, uv.tcp.TCP)
+        self.assert_is(uv.getaddrinfo, uv.dns.getaddrinfo)
+        self.assert_in('Timer', dir(uv))
+        with self.should_raise(AttributeError):
+            uv.DoesNotExist
@@ -13,6 +13,9 @@
 # You should have received a copy of the GNU Lesser General Public License along
 # with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import gc
+import os
+import socket
 import threading
 import time
 
@@ -85,6 +88,66 @@ class TestLoop(common.TestCase):
 
         self.assert_equal(len(self.loop.handles), 0)
 
+    def test_handle_index(self):
+        prepare = uv.Prepare()
+        timers = [uv.Timer(), uv.Timer()]
+        timers[0].start(uv.common.dummy_callback, 10, 0)
+        timers[1].dereference()
+
+        self.assert_equal(self.loop.handle_counts(), {uv.Prepare: 1, uv.Timer: 2})
+        counts = self.loop.handle_counts(states=True)
+        self.assert_equal(counts[uv.Timer], {'total': 2, 'active': 1, 'referenced': 1})
+        self.assert_equal(counts[uv.Prepare], {'total': 1, 'active': 0,
+                                               'referenced': 1})
+        self.assert_equal(set(self.loop.iter_handles(uv.Timer)), set(timers))
+        self.assert_equal(set(self.loop.iter_handles(uv.UVHandle)),
+                          {prepare, timers[0], timers[1]})
+
+        self.loop.close_all_handles()
+        self.loop.run()
+
+        self.assert_equal(self.loop.handle_counts(), {})
+        self.assert_equal(list(self.loop.iter_handles(uv.Timer)), [])
+
+    def test_busy_poll(self):
+        self.timeouts = 0
+
+        def on_timeout(timer):
+            self.timeouts += 1
+            if self.timeouts == 3:
+                timer.close()
+
+        timer = uv.Timer()
+        timer.start(on_timeout, 5, 5)
+        self.loop.busy_poll_time = 1000
+
+        self.assert_false(self.loop.run(uv.RunModes.BUSY_POLL))
+
+        self.assert_equal(self.timeouts, 3)
+        stats = self.loop.busy_poll_stats(reset=True)
+        self.assert_true(stats['spins'] > 3)
+        self.assert_true(stats['parks'] >= 1)
+        self.assert_true(stats['spin_time'] > 0)
+        self.assert_equal(self.loop.busy_poll_stats()['spins'], 0)
+
+        timer = uv.Timer()
+        timer.start(lambda timer: self.loop.stop(), 1, 1)
+        self.assert_true(self.loop.run(uv.RunModes.BUSY_POLL))
+        timer.close()
+        self.loop.run()
+
+    def test_busy_poll_stop_before_run(self):
+        timer = uv.Timer()
+        timer.start(uv.common.dummy_callback, 1, 1)
+        self.loop.busy_poll_time = 1000
+
+        self.loop.stop()
+        self.assert_true(self.loop.run(uv.RunModes.BUSY_POLL))
+        self.assert_equal(self.loop.busy_poll_stats()['spins'], 1)
+
+        timer.close()
+        self.loop.run()
+
     def test_stop(self):
         self.timer_called = 0
         self.prepare_called = 0
@@ -172,6 +235,80 @@ class TestLoop(common.TestCase):
 
         self.assert_true(self.callback_called)
 
+    def test_call_later_many(self):
+        self.calls = []
+
+        # keep the loop alive
+        self.prepare = uv.Prepare()
+        self.prepare.start()
+
+        def append(number):
+            self.calls.append(number)
+
+        def finish():
+            self.prepare.close()
+
+        self.loop.call_later(append, 0)
+        self.loop.call_later_many([(append, (1, )),
+                                   (append, (), {'number': 2}),
+                                   (finish, ())])
+        self.loop.run()
+
+        self.assert_equal(self.calls, [0, 1, 2])
+        self.assert_false(self.loop.wakeup_pending)
+
+    def test_call_later_threads(self):
+        self.calls = []
+
+        # keep the loop alive
+        self.prepare = uv.Prepare()
+        self.prepare.start()
+
+        def on_call(number):
+            self.calls.append(number)
+            if len(self.calls) == 4 * 1000:
+                self.prepare.close()
+
+        def producer(offset):
+            for number in range(offset, offset + 1000):
+                self.loop.call_later(on_call, number)
+
+        threads = [threading.Thread(target=producer, args=(offset * 1000, ))
+                   for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        self.loop.run()
+        for thread in threads:
+            thread.join()
+
+        self.assert_equal(sorted(self.calls), list(range(4 * 1000)))
+
+    def test_call_after(self):
+        self.calls = []
+
+        self.loop.call_after(20, self.calls.append, 'second')
+        self.loop.call_after(5, self.calls.append, 'first')
+        self.loop.call_after(10, self.calls.append, 'cancelled').cancel()
+        scheduled_call = self.loop.call_at(self.loop.now + 20, self.calls.append, 'third')
+
+        self.assert_true(scheduled_call.pending)
+        self.assert_equal(len(self.loop.scheduler), 3)
+
+        self.loop.run()
+
+        self.assert_equal(self.calls, ['first', 'second', 'third'])
+        self.assert_false(scheduled_call.pending)
+        self.assert_equal(len(self.loop.scheduler), 0)
+        self.assert_false(self.loop.alive)
+
+    def test_call_after_cancel_all(self):
+        scheduled_calls = [self.loop.call_after(1000, self.assert_true, False)
+                           for _ in range(1000)]
+        for scheduled_call in scheduled_calls:
+            scheduled_call.cancel()
+        self.assert_false(self.loop.alive)
+        self.loop.run()
+
     def test_current_loop(self):
         self.assertEqual(uv.Loop.get_default(), uv.Loop.get_current())
 
@@ -292,3 +429,125 @@ class TestLoop(common.TestCase):
 
     def test_poll_timeout(self):
         self.assert_equal(self.loop.get_timeout(), 0)
+
+    def test_pool_allocator(self):
+        self.buffers = []
+        allocator = uv.loop.PoolAllocator(chunk_size=1024, chunk_count=2)
+
+        def on_read(connection, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                connection.close()
+                self.server.close()
+            else:
+                self.buffers.append(data)
+
+        def on_connection(server, status):
+            connection = server.accept()
+            connection.allocator = allocator
+            connection.start_read(on_read=on_read)
+
+        def on_connect(request, status):
+            request.stream.write(b'hello', on_write=lambda *_: request.stream.close())
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        self.client = uv.Pipe()
+        self.client.connect(common.TEST_PIPE1, on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(len(self.buffers), 1)
+        pooled_buffer = self.buffers.pop()
+        self.assert_is_instance(pooled_buffer, uv.loop.PooledBuffer)
+        self.assert_equal(allocator.available, 1)
+        with pooled_buffer as data:
+            self.assert_equal(data.tobytes(), b'hello')
+        self.assert_true(pooled_buffer.released)
+        self.assert_equal(allocator.available, 2)
+
+    def test_pool_allocator_views(self):
+        allocator = uv.loop.PoolAllocator(chunk_size=1024, chunk_count=2)
+        uv_buffer = uv.library.ffi.new('uv_buf_t*')
+        allocator.allocate(None, 1024, uv_buffer)
+        uv.library.ffi.memmove(uv.library.uv_buffer_get(uv_buffer).base, b'hello', 5)
+        pooled_buffer = allocator.finalize(None, 5, uv_buffer)
+        self.assert_equal(allocator.available, 1)
+
+        data = pooled_buffer.data[1:]
+        del pooled_buffer
+        gc.collect()
+        self.assert_equal(allocator.available, 1)
+        self.assert_equal(data.tobytes(), b'ello')
+
+        del data
+        gc.collect()
+        self.assert_equal(allocator.available, 2)
+
+    def test_adaptive_allocator(self):
+        self.received = 0
+        allocator = uv.loop.AdaptiveAllocator(min_size=1024, max_size=2**16,
+                                              initial_size=4096, shrink_after=2)
+        payload = b'x' * 2**20
+
+        def on_read(stream, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                stream.close()
+            else:
+                self.received += len(data)
+
+        left, right = socket.socketpair()
+        left.sendall(b'x' * 100)
+
+        self.reader = uv.Pipe()
+        self.reader.open(os.dup(right.fileno()))
+        right.close()
+        self.reader.allocator = allocator
+        self.reader.start_read(on_read=on_read)
+
+        self.loop.run(uv.RunModes.NOWAIT)
+        self.loop.run(uv.RunModes.NOWAIT)
+        left.sendall(b'x' * 100)
+        self.loop.run(uv.RunModes.NOWAIT)
+        self.loop.run(uv.RunModes.NOWAIT)
+        self.assert_equal(allocator.size_of(self.reader), 2048)
+
+        writer = uv.Pipe()
+        writer.open(os.dup(left.fileno()))
+        left.close()
+        writer.write(payload, on_write=lambda request, _: request.stream.close())
+        self.loop.run()
+
+        self.assert_equal(self.received, 200 + len(payload))
+        stats = allocator.stats()
+        self.assert_greater(stats['grows'], 0)
+        self.assert_greater_equal(stats['shrinks'], 1)
+        self.assert_equal(stats['bytes'], self.received)
+        self.assert_less_equal(stats['memory'], allocator.memory_limit)
+
+    def test_metrics(self):
+        self.assert_is(self.loop.metrics(), None)
+        self.loop.enable_metrics(window=16)
+
+        def on_timeout(timer):
+            self.timer_count += 1
+            if self.timer_count == 5:
+                timer.close()
+
+        self.timer_count = 0
+        self.timer = uv.Timer()
+        self.timer.start(on_timeout, 1, 1)
+        self.loop.call_after(2, lambda: None)
+        self.loop.run()
+
+        metrics = self.loop.metrics()
+        self.assert_greater(metrics['iterations'], 0)
+        self.assert_less_equal(metrics['window'], 16)
+        self.assert_equal(metrics['callbacks']['Timer'], 5)
+        self.assert_greater_equal(metrics['lag'].minimum, 0)
+        self.assert_greater_equal(metrics['poll_time'].p99, metrics['poll_time'].p50)
+        self.assert_less_equal(metrics['utilization'], 1)
+
+        self.loop.disable_metrics()
+        self.assert_is(self.loop.metrics(), None)
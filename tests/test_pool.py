@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import common
+
+import uv
+
+from uv.pool import ConnectionPool
+
+ADDRESS = (common.TEST_IPV4, common.TEST_PORT1)
+
+
+class TestPool(common.TestCase):
+    def test_connection_pool(self):
+        self.accepted = []
+        self.streams = []
+
+        def on_connection(server, status):
+            self.accepted.append(server.accept())
+
+        def on_second(checkout, status, stream):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.streams.append(stream)
+            self.pool.release(stream)
+            self.assert_equal(self.pool.stats()['idle'], 1)
+            # the peer closes the idle connection
+            self.server.close()
+            for connection in self.accepted:
+                connection.close()
+
+        def on_first(checkout, status, stream):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.assert_is_instance(stream, uv.TCP)
+            self.streams.append(stream)
+            self.assert_equal(self.pool.stats()['waiting'], 1)
+            self.pool.release(stream)
+
+        self.server = uv.TCP()
+        self.server.bind(ADDRESS)
+        self.server.listen(on_connection=on_connection)
+
+        self.pool = ConnectionPool(max_per_key=1)
+        self.pool.acquire(ADDRESS, on_first)
+        self.pool.acquire(ADDRESS, on_second)
+
+        self.loop.run()
+
+        self.assert_equal(len(self.accepted), 1)
+        self.assert_is(self.streams[0], self.streams[1])
+        stats = self.pool.stats()
+        self.assert_equal(stats['misses'], 1)
+        self.assert_equal(stats['waits'], 1)
+        self.assert_equal(stats['dead'], 1)
+        self.assert_equal(stats['connections'], 0)
+        self.assert_equal(stats['idle'], 0)
+        self.assert_true(self.streams[0].closing)
+        self.pool.close()
+        self.assert_raises(uv.ClosedHandleError, self.pool.acquire, ADDRESS, None)
+        # checkouts do not leave handles behind which keep the loop busy
+        self.loop.run()
+        self.loop.close()
+        self.assert_true(self.loop.closed)
+
+    def test_connection_pool_reuse(self):
+        self.checkouts = 0
+        self.accepted = []
+
+        def on_connection(server, status):
+            self.accepted.append(server.accept())
+
+        def on_acquire(checkout, status, stream):
+            self.checkouts += 1
+            self.pool.release(stream)
+            if self.checkouts < 10:
+                self.pool.acquire(ADDRESS, on_acquire)
+            else:
+                self.pool.close()
+                self.server.close()
+                self.loop.close_all_handles()
+
+        self.server = uv.TCP()
+        self.server.bind(ADDRESS)
+        self.server.listen(on_connection=on_connection)
+
+        self.pool = ConnectionPool(idle_timeout=10)
+        self.pool.acquire(ADDRESS, on_acquire)
+
+        self.loop.run()
+
+        stats = self.pool.stats()
+        self.assert_equal(stats['misses'], 1)
+        self.assert_equal(stats['hits'], 9)
+        self.assert_equal(stats['hit_rate'], 0.9)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import io
+
+import common
+
+import uv
+
+from uv import profiler
+
+
+class TestProfiler(common.TestCase):
+    def tear_down(self):
+        profiler.disable()
+
+    def test_histogram(self):
+        histogram = profiler.LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value * 1000)
+        self.assert_equal(histogram.count, 10000)
+        self.assert_equal(histogram.minimum, 1000)
+        self.assert_equal(histogram.maximum, 10000000)
+        for percentile in (50, 90, 99):
+            exact = percentile * 100 * 1000
+            self.assert_greater_equal(histogram.percentile(percentile), exact)
+            self.assert_less_equal(histogram.percentile(percentile), exact * 1.02)
+
+    def test_profiler(self):
+        self.assert_is(profiler.get_profiler(), None)
+        active = profiler.enable()
+
+        def on_timeout(timer):
+            self.timer_count += 1
+            if self.timer_count == 3:
+                timer.close()
+
+        self.timer_count = 0
+        self.timer = uv.Timer()
+        self.timer.start(on_timeout, 1, 1)
+        self.loop.run()
+
+        snapshot = active.snapshot()
+        self.assert_equal(snapshot['Timer.on_timeout']['count'], 3)
+        self.assert_greater_equal(snapshot['Timer.on_timeout']['max'],
+                                  snapshot['Timer.on_timeout']['p50'])
+
+        output = io.StringIO()
+        profiler.dump(output)
+        self.assert_in('Timer.on_timeout', output.getvalue())
+
+        self.assert_is(profiler.disable(), active)
+        self.assert_is(profiler.get_profiler(), None)
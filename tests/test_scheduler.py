@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import time
+
+import common
+
+import uv
+
+from uv.scheduler import Scheduler
+
+
+class TestScheduler(common.TestCase):
+    def test_time_slices(self):
+        self.order = []
+        self.timeouts = 0
+
+        def busy(name, steps):
+            for step in range(steps):
+                self.order.append(name)
+                deadline = time.time() + 0.001
+                while time.time() < deadline:
+                    pass
+                yield
+
+        def on_timeout(timer):
+            self.timeouts += 1
+            if self.timeouts == 5:
+                timer.close()
+
+        scheduler = Scheduler(budget=2)
+        first = scheduler.spawn(busy('a', 20))
+        second = scheduler.spawn(busy('b', 20), name='second')
+        timer = uv.Timer()
+        timer.start(on_timeout, 1, 1)
+
+        self.loop.run()
+
+        self.assert_true(first.done)
+        self.assert_true(second.done)
+        self.assert_equal(self.timeouts, 5)
+        self.assert_equal(self.order[:4], ['a', 'b', 'a', 'b'])
+        self.assert_true(first.slices > 1)
+        report = scheduler.report()
+        self.assert_equal(report[second]['name'], 'second')
+        self.assert_equal(report[second]['steps'], 21)
+        self.assert_true(0 < report[second]['share'] <= 1)
+        self.assert_equal(scheduler.report(), {})
+
+    def test_exception_and_cancel(self):
+        self.done = []
+
+        def failing():
+            yield
+            raise ValueError()
+
+        def endless():
+            while True:
+                yield
+
+        def on_done(task):
+            self.done.append(task)
+            if task.name == 'failing':
+                endless_task.cancel()
+
+        scheduler = Scheduler()
+        failing_task = scheduler.spawn(failing(), on_done=on_done)
+        endless_task = scheduler.spawn(endless(), name='endless', on_done=on_done)
+
+        self.loop.run()
+
+        self.assert_is_instance(failing_task.exception, ValueError)
+        self.assert_true(endless_task.cancelled)
+        self.assert_equal(self.done, [failing_task, endless_task])
+
+    def test_cancel_itself(self):
+        self.done = []
+        self.steps = 0
+
+        def cancelling():
+            self.steps += 1
+            yield
+            self.steps += 1
+            tasks[0].cancel()
+            yield
+            self.steps += 1
+
+        def returning():
+            yield
+            tasks[1].cancel()
+
+        scheduler = Scheduler()
+        tasks = [scheduler.spawn(cancelling()),
+                 scheduler.spawn(returning(), on_done=self.done.append)]
+
+        self.loop.run()
+
+        self.assert_equal(self.steps, 2)
+        for task in tasks:
+            self.assert_true(task.done)
+            self.assert_true(task.cancelled)
+            self.assert_is(task.exception, None)
+        self.assert_equal(self.done, [tasks[1]])
+        self.assert_equal(scheduler.finished_tasks, tasks)
+
+    def test_close_loop(self):
+        def steps():
+            yield
+            yield
+
+        scheduler = Scheduler()
+        task = scheduler.spawn(steps())
+
+        self.loop.run()
+
+        self.assert_true(task.done)
+        self.loop.close()
+        self.assert_true(self.loop.closed)
+
+    def test_report_same_name(self):
+        def steps(count):
+            for _ in range(count):
+                yield
+
+        scheduler = Scheduler()
+        first = scheduler.spawn(steps(2), name='worker')
+        second = scheduler.spawn(steps(4), name='worker')
+
+        self.loop.run()
+
+        report = scheduler.report()
+        self.assert_equal(len(report), 2)
+        self.assert_equal(report[first]['name'], 'worker')
+        self.assert_equal(report[first]['steps'], 3)
+        self.assert_equal(report[second]['name'], 'worker')
+        self.assert_equal(report[second]['steps'], 5)
@@ -15,10 +15,16 @@
 
 from __future__ import print_function, unicode_literals, division, absolute_import
 
+import os
+import socket
+import threading
+
 import common
 
 import uv
 
+from uv.handles import forward, poll
+
 
 class TestStream(common.TestCase):
     def test_closed(self):
@@ -69,7 +75,429 @@ class TestStream(common.TestCase):
 
         self.assert_equal(self.buffer, b'hello'[:self.bytes_written])
 
+    def test_write_fast_path(self):
+        self.received = b''
+        self.statuses = []
+        payload = os.urandom(2**22)
+
+        def on_read(reader, status, data):
+            self.received += data
+            if len(self.received) >= len(payload) + 5:
+                reader.close()
+                self.writer.close()
+
+        def on_write(request, status):
+            self.statuses.append((type(request), status))
+
+        left, right = socket.socketpair()
+        self.writer = uv.Pipe()
+        self.writer.open(os.dup(left.fileno()))
+        self.reader = uv.Pipe()
+        self.reader.open(os.dup(right.fileno()))
+        left.close()
+        right.close()
+
+        completed = self.writer.write(b'hello', on_write=on_write)
+        self.assert_is_instance(completed, uv.CompletedWrite)
+        self.assert_true(completed.finished)
+        self.assert_is(completed.stream, self.writer)
+        self.assert_equal(self.statuses, [])
+        self.assert_is_instance(self.writer.write(payload, on_write=on_write),
+                                uv.WriteRequest)
+        self.assert_equal(self.writer.try_write_status(b'x'),
+                          (uv.StatusCodes.EAGAIN, 0))
+        self.reader.start_read(on_read=on_read)
+
+        self.loop.run()
+
+        self.assert_equal(self.received, b'hello' + payload)
+        self.assert_equal(self.statuses, [(uv.CompletedWrite, uv.StatusCodes.SUCCESS),
+                                          (uv.WriteRequest, uv.StatusCodes.SUCCESS)])
+        self.assert_equal(self.writer.try_write_status(b'x'), (uv.StatusCodes.EBADF, 0))
+
+        # completions do not leave handles behind which keep the loop busy
+        self.loop.close()
+        self.assert_true(self.loop.closed)
+
     def test_writable_readable(self):
         self.pipe = uv.Pipe()
         self.assert_false(self.pipe.readable)
         self.assert_false(self.pipe.writable)
+
+    def test_write_buffer_protocol(self):
+        self.buffer = b''
+
+        def on_read(connection, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                connection.close()
+                self.server.close()
+            else:
+                self.buffer += data
+
+        def on_connection(server, status):
+            connection = server.accept()
+            connection.start_read(on_read=on_read)
+
+        def on_write(request, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            request.stream.close()
+
+        def on_connect(request, status):
+            buffers = [bytearray(b'hello'), memoryview(b'xx world xx')[2:8], b'!']
+            request.stream.write(buffers, on_write=on_write)
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        self.client = uv.Pipe()
+        self.client.connect(common.TEST_PIPE1, on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(self.buffer, b'hello world!')
+
+    def test_write_strided_buffer(self):
+        self.buffer = b''
+
+        def on_read(connection, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                connection.close()
+                self.server.close()
+            else:
+                self.buffer += data
+
+        def on_connection(server, status):
+            connection = server.accept()
+            connection.start_read(on_read=on_read)
+
+        def on_write(request, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            request.stream.close()
+
+        def on_connect(request, status):
+            # non contiguous buffers are copied instead of being passed directly
+            request.stream.write(memoryview(b'h.e.l.l.o')[::2], on_write=on_write)
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        self.client = uv.Pipe()
+        self.client.connect(common.TEST_PIPE1, on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(self.buffer, b'hello')
+
+    def test_cork(self):
+        self.buffer = b''
+        self.writes = []
+        self.order = []
+
+        def on_read(connection, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                connection.close()
+                self.server.close()
+            else:
+                self.buffer += data
+
+        def on_connection(server, status):
+            connection = server.accept()
+            connection.start_read(on_read=on_read)
+
+        def on_write(corked_write, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.order.append(corked_write)
+            if len(self.order) == len(self.writes):
+                corked_write.stream.close()
+
+        def on_connect(request, status):
+            request.stream.auto_cork = True
+            for data in (b'a', b'bc', b'def'):
+                self.writes.append(request.stream.write(data, on_write=on_write))
+            self.assert_is(self.writes[0].write_request, None)
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        self.client = uv.Pipe()
+        self.client.connect(common.TEST_PIPE1, on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(self.buffer, b'abcdef')
+        self.assert_equal(self.order, self.writes)
+        write_requests = set(write.write_request for write in self.writes)
+        self.assert_equal(len(write_requests), 1)
+        self.loop.close()
+        self.assert_true(self.loop.closed)
+
+    def test_cork_closed(self):
+        self.statuses = []
+
+        def on_write(corked_write, status):
+            self.statuses.append(status)
+
+        self.pipe = uv.Pipe()
+        self.pipe.cork()
+        self.pipe.write(b'hello', on_write=on_write)
+        self.pipe.close()
+        self.assert_equal(self.statuses, [uv.StatusCodes.ECANCELED])
+        self.assert_raises(uv.ClosedHandleError, self.pipe.write, b'hello')
+
+    @common.skip_platform('win32')
+    def test_write_buffer_limits(self):
+        self.events = []
+        self.received = 0
+        payload = b'x' * 2**22
+
+        def on_read(reader, status, data):
+            self.received += len(data)
+            if self.received >= len(payload):
+                reader.close()
+
+        def on_pause_writing(writer):
+            self.events.append('pause')
+            self.assert_true(writer.writing_paused)
+            self.assert_greater(writer.write_queue_size, 1024)
+            self.reader.start_read(on_read=on_read)
+
+        def on_resume_writing(writer):
+            self.events.append('resume')
+            self.assert_less_equal(writer.write_queue_size, 256)
+
+        left, right = socket.socketpair()
+        self.writer = uv.Pipe()
+        self.writer.open(os.dup(left.fileno()))
+        self.reader = uv.Pipe()
+        self.reader.open(os.dup(right.fileno()))
+        left.close()
+        right.close()
+
+        self.assert_equal(self.writer.write_queue_size, 0)
+        self.writer.set_write_buffer_limits(1024, 256, on_pause_writing=on_pause_writing,
+                                            on_resume_writing=on_resume_writing)
+        self.writer.write(payload, on_write=lambda request, _: request.stream.close())
+
+        self.loop.run()
+
+        self.assert_equal(self.events, ['pause', 'resume'])
+        self.assert_equal(self.received, len(payload))
+
+    @common.skip_platform('win32')
+    def test_request_pool(self):
+        self.requests = []
+        self.statuses = []
+
+        def on_write(request, status):
+            self.statuses.append(status)
+            if len(self.statuses) < 10:
+                self.requests.append(self.writer.write(b'x', on_write=on_write))
+            else:
+                self.writer.close()
+
+        left, right = socket.socketpair()
+        self.writer = uv.Pipe()
+        self.writer.open(os.dup(left.fileno()))
+        self.writer.write_fast_path = False
+        left.close()
+
+        self.requests.append(self.writer.write(b'x', on_write=on_write))
+        self.loop.run()
+        right.close()
+
+        self.assert_equal(self.statuses, [uv.StatusCodes.SUCCESS] * 10)
+        stats = self.loop.request_pool_stats()['uv_write_t']
+        self.assert_equal(stats['misses'], 1)
+        self.assert_equal(stats['hits'], 9)
+        self.assert_equal(stats['recycled'], 10)
+        self.assert_equal(stats['available'], 1)
+        self.assert_is(self.requests[0].type, uv.WriteRequest)
+        # cancelling a finished request must not affect the reused structure
+        self.assert_is(self.requests[0].cancel(), None)
+
+        self.loop.request_pool_size = 0
+        self.assert_equal(self.loop.request_pool_stats()['uv_write_t']['available'], 0)
+
+    def test_preallocate(self):
+        self.connections = []
+        self.closed = 0
+
+        def on_closed(_):
+            self.closed += 1
+            if self.closed == 3:
+                self.server.close()
+
+        def on_read(connection, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                connection.close(on_closed=on_closed)
+
+        def on_connection(server, status):
+            self.connections.append(server.accept(on_read=on_read))
+            self.connections[-1].start_read()
+
+        def on_connect(request, status):
+            request.stream.close()
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+        pool = self.server.preallocate(2)
+        preallocated = list(pool.handles)
+        self.assert_equal(len(preallocated), 2)
+
+        for _ in range(3):
+            uv.Pipe().connect(common.TEST_PIPE1, on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(len(self.connections), 3)
+        self.assert_in(self.connections[0], preallocated)
+        self.assert_equal(pool.hits + pool.misses, 3)
+        self.assert_true(pool.hits >= 2)
+        self.assert_is(self.server.handle_pool, None)
+        self.assert_equal(pool.handles, [])
+
+    def test_accept_many(self):
+        self.batches = []
+        self.connections = []
+
+        def on_connections(server, status, connections):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.batches.append(len(connections))
+            self.connections.extend(connections)
+            if len(self.connections) == 5:
+                server.close()
+                for connection in self.connections:
+                    connection.close()
+
+        def on_connect(request, status):
+            request.stream.close()
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        acceptor = self.server.listen_batch(on_connections, max_batch=2)
+
+        for _ in range(5):
+            uv.Pipe().connect(common.TEST_PIPE1, on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(sum(self.batches), 5)
+        self.assert_less_equal(max(self.batches), 2)
+        self.assert_equal(acceptor.connections, 5)
+        self.assert_equal(acceptor.batches, len(self.batches))
+        for connection in self.connections:
+            self.assert_is_instance(connection, uv.Pipe)
+        self.assert_is(self.server.batch_acceptor, None)
+        self.assert_raises(uv.ClosedHandleError, self.server.accept_many, 1)
+
+    def test_read_budget(self):
+        self.data = b''
+
+        def on_read(stream, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                stream.close()
+            else:
+                self.data += data
+
+        left, right = socket.socketpair()
+        left.sendall(b'x' * 100)
+        left.close()
+
+        self.reader = uv.Pipe()
+        self.reader.open(os.dup(right.fileno()))
+        right.close()
+        self.reader.set_read_budget(max_bytes=1)
+        self.reader.start_read(on_read=on_read)
+
+        self.loop.run()
+
+        self.assert_equal(self.data, b'x' * 100)
+        self.assert_equal(self.loop.read_throttle_report(), {self.reader: 1})
+        self.assert_equal(self.loop.read_throttle_report(), {})
+        self.loop.close()
+        self.assert_true(self.loop.closed)
+
+    def test_pipe_to(self):
+        self.received = []
+        self.results = []
+
+        def on_read(stream, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                stream.close()
+            else:
+                self.received.append(data)
+
+        def on_done(forwarder, status):
+            self.results.append((forwarder.method, forwarder.bytes, status))
+            forwarder.source.close()
+
+        payload = os.urandom(2**18)
+        for splice in (False, True):
+            self.received = []
+            source_left, source_right = socket.socketpair()
+            sink_left, sink_right = socket.socketpair()
+
+            source_left.settimeout(10)
+
+            def writer(sock=source_left):
+                # the payload exceeds the socket buffer, send it while the loop runs
+                sock.sendall(payload)
+                sock.close()
+
+            thread = threading.Thread(target=writer)
+            thread.start()
+
+            source = uv.Pipe()
+            source.open(os.dup(source_right.fileno()))
+            source_right.close()
+            destination = uv.Pipe()
+            destination.open(os.dup(sink_left.fileno()))
+            sink_left.close()
+            sink = uv.Pipe()
+            sink.open(os.dup(sink_right.fileno()))
+            sink_right.close()
+
+            sink.start_read(on_read=on_read)
+            forwarder = source.pipe_to(destination, on_done=on_done, splice=splice)
+            self.loop.run()
+            thread.join()
+            destination.close()
+            self.loop.run()
+
+            self.assert_equal(b''.join(self.received), payload)
+            self.assert_equal(forwarder.bytes, len(payload))
+
+        self.assert_equal(self.results[0], ('copy', len(payload),
+                                            uv.StatusCodes.SUCCESS))
+        self.assert_equal(self.results[1][1:], (len(payload), uv.StatusCodes.SUCCESS))
+
+    @common.skip_platform('win32')
+    def test_pipe_to_poller_error(self):
+        def failing_poll(*arguments, **keywords):
+            raise uv.UVError(uv.StatusCodes.EBADF)
+
+        source_left, source_right = socket.socketpair()
+        sink_left, sink_right = socket.socketpair()
+        source = uv.Pipe()
+        source.open(os.dup(source_right.fileno()))
+        destination = uv.Pipe()
+        destination.open(os.dup(sink_left.fileno()))
+        for sock in (source_left, source_right, sink_left, sink_right):
+            sock.close()
+
+        original_poll = poll.Poll
+        poll.Poll = failing_poll
+        try:
+            with self.should_raise(uv.UVError):
+                forward.SpliceForwarder(source, destination, None, True)
+            forwarder = source.pipe_to(destination, splice=True)
+        finally:
+            poll.Poll = original_poll
+
+        self.assert_equal(forwarder.method, 'copy')
+        self.assert_equal(self.loop.splice_pollers, {})
+        forwarder.stop()
@@ -60,6 +60,25 @@ class TestUDP(common.TestCase):
 
         self.assert_equal(self.datagram, b'hello')
 
+    def test_udp_send_memoryview(self):
+        self.datagram = None
+
+        def on_receive(udp_handle, status, address, data, flags):
+            self.datagram = data
+            udp_handle.receive_stop()
+
+        self.server = uv.UDP(on_receive=on_receive)
+        self.server.bind((common.TEST_IPV4, common.TEST_PORT1))
+        self.server.receive_start()
+
+        self.client = uv.UDP()
+        payload = bytearray(b'xxhelloxx')
+        self.client.send(memoryview(payload)[2:7], (common.TEST_IPV4, common.TEST_PORT1))
+
+        self.loop.run()
+
+        self.assert_equal(self.datagram, b'hello')
+
     def test_udp_multicast(self):
         self.clients = []
         self.results = []
@@ -151,6 +170,45 @@ class TestUDP(common.TestCase):
 
         self.assert_equal(self.datagram, b'hello')
 
+    def test_udp_send_fast_path(self):
+        self.datagrams = []
+        self.statuses = []
+
+        def on_receive(udp_handle, status, address, data, flags):
+            self.datagrams.append(data)
+            if len(self.datagrams) == 2:
+                udp_handle.close()
+                self.client.close()
+
+        def on_send(send_request, status):
+            self.statuses.append((type(send_request), status))
+
+        self.server = uv.UDP(on_receive=on_receive)
+        self.server.bind((common.TEST_IPV4, common.TEST_PORT1))
+        self.server.receive_start()
+
+        self.client = uv.UDP()
+        address = (common.TEST_IPV4, common.TEST_PORT1)
+        completed = self.client.send(b'hello', address, on_send=on_send)
+        self.assert_is_instance(completed, uv.CompletedSend)
+        self.assert_equal(self.statuses, [])
+        self.client.send_fast_path = False
+        self.assert_is_instance(self.client.send(b'world', address, on_send=on_send),
+                                uv.UDPSendRequest)
+
+        self.loop.run()
+
+        self.assert_equal(self.datagrams, [b'hello', b'world'])
+        self.assert_equal(len(self.statuses), 2)
+        self.assert_in((uv.CompletedSend, uv.StatusCodes.SUCCESS), self.statuses)
+        self.assert_in((uv.UDPSendRequest, uv.StatusCodes.SUCCESS), self.statuses)
+        self.assert_equal(self.client.try_send_status(b'x', address),
+                          (uv.StatusCodes.EBADF, 0))
+
+        # completions do not leave handles behind which keep the loop busy
+        self.loop.close()
+        self.assert_true(self.loop.closed)
+
     def test_udp_closed(self):
         self.udp = uv.UDP()
         self.udp.close()
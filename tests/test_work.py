@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import threading
+
+import common
+
+import uv
+
+
+class TestWork(common.TestCase):
+    def test_work(self):
+        self.main_thread = threading.current_thread()
+        self.results = []
+
+        def function(a, b, c=0):
+            self.worker_thread = threading.current_thread()
+            return a + b + c
+
+        def on_done(work_request, status, result, exception):
+            self.assert_is(threading.current_thread(), self.main_thread)
+            self.results.append((status, result, exception))
+
+        self.loop.run_in_threadpool(function, 1, 2, c=3, on_done=on_done)
+        self.loop.run()
+
+        self.assert_is_not(self.worker_thread, self.main_thread)
+        self.assert_equal(self.results, [(uv.StatusCodes.SUCCESS, 6, None)])
+
+    def test_work_exception(self):
+        self.exceptions = []
+
+        def function():
+            raise ValueError('test')
+
+        def on_done(work_request, status, result, exception):
+            self.exceptions.append(exception)
+
+        uv.Work(function, on_done=on_done)
+        self.loop.run()
+
+        self.assert_equal(len(self.exceptions), 1)
+        self.assert_is_instance(self.exceptions[0], ValueError)
+
+    def test_work_cancel(self):
+        self.statuses = []
+        event = threading.Event()
+
+        def blocking():
+            event.wait(5)
+
+        def on_done(work_request, status, result, exception):
+            self.statuses.append(status)
+
+        # occupy all threads of the pool so the last request stays queued
+        for _ in range(128):
+            uv.Work(blocking)
+        work_request = uv.Work(lambda: None, on_done=on_done)
+        work_request.cancel()
+        event.set()
+        self.loop.run()
+
+        self.assert_equal(self.statuses, [uv.StatusCodes.ECANCELED])
@@ -18,13 +18,18 @@ This package aims to provide an object oriented CFFI based wrapper around
 the libuv asynchronous IO library. It supports all handles as well as
 filesystem operations, dns utility functions and miscellaneous utilities.
 
-There are no plans to support the thread pool work scheduling and the
-threading and synchronization utilities because Python already provides
-nice solutions for those things in the standard library.
+Python callables could be run in libuv's thread pool with work requests.
+There are no plans to support the threading and synchronization utilities
+because Python already provides nice solutions for those things in the
+standard library.
 
 Based on Python's standard library's SSL module this package also provides
 support for asynchronous SSL sockets.
 
+Handles, requests and utility modules are loaded lazily on first access
+(on Python 3.7 and later) so importing the package stays cheap. Only the
+event loop and the error handling are loaded eagerly.
+
 As you may have noticed this package is not totally PEP-8 conform when it
 comes to the maximum line length of 79 characters – instead we are using
 a maximum line length of 90 characters. This allows us to use longer and
@@ -34,6 +39,9 @@ overall makes the code more readable.
 
 from __future__ import print_function, unicode_literals, division, absolute_import
 
+import importlib
+import sys
+
 from .metadata import __version__, __author__, __email__, __project__
 
 from .library import version as uv_version
@@ -48,44 +56,118 @@ from . import common, error, loop, handle, request
 
 from .abstract import Handle, Request, Stream
 
-from .handles.async import Async
-from .handles.check import Check
-from .handles.idle import Idle
-from .handles.pipe import PipeConnectRequest, Pipe
-from .handles.poll import PollEvent, Poll, UV_READABLE, UV_WRITABLE
-from .handles.prepare import Prepare
-from .handles.process import CreatePipe, PIPE, ProcessFlags, Process, StdIO
-from .handles.signal import Signals, Signal
-from .handles.stream import ShutdownRequest, WriteRequest, ConnectRequest, UVStream
-from .handles.tcp import TCPFlags, TCPConnectRequest, TCP
-from .handles.timer import Timer
-from .handles.tty import ConsoleSize, TTYMode, TTY
-from .handles.udp import UDPFlags, UDPMembership, UDPSendRequest, UDP
-
-from .handles.fs_event import FSEvents, FSEventFlags, FSEvent
-from .handles.fs_poll import FSPoll
-
-from .handles import async
-from .handles import check
-from .handles import idle
-from .handles import pipe
-from .handles import process
-from .handles import signal
-from .handles import stream
-from .handles import tcp
-from .handles import timer
-from .handles import tty
-from .handles import udp
-
-from .handles import fs_event
-from .handles import fs_poll
-
-from .dns import (AddressFamilies, SocketTypes, SocketProtocols, Address, Address4,
-                  Address6, AddrInfo, NameInfo, getnameinfo, getaddrinfo)
-
-from .fs import Stat
-
-from . import dns
-from . import fs
-from . import misc
-from . import secure
+
+_lazy_modules = {
+    'async': 'handles.async',
+    'check': 'handles.check',
+    'idle': 'handles.idle',
+    'pipe': 'handles.pipe',
+    'poll': 'handles.poll',
+    'prepare': 'handles.prepare',
+    'process': 'handles.process',
+    'signal': 'handles.signal',
+    'stream': 'handles.stream',
+    'tcp': 'handles.tcp',
+    'timer': 'handles.timer',
+    'tty': 'handles.tty',
+    'udp': 'handles.udp',
+    'fs_event': 'handles.fs_event',
+    'fs_poll': 'handles.fs_poll',
+    'compact': 'compact',
+    'dns': 'dns',
+    'embed': 'embed',
+    'fs': 'fs',
+    'misc': 'misc',
+    'pool': 'pool',
+    'profiler': 'profiler',
+    'scheduler': 'scheduler',
+    'secure': 'secure',
+    'work': 'work'
+}
+
+_lazy_attributes = {
+    'Async': 'handles.async',
+    'Check': 'handles.check',
+    'Idle': 'handles.idle',
+    'PipeConnectRequest': 'handles.pipe',
+    'Pipe': 'handles.pipe',
+    'PollEvent': 'handles.poll',
+    'Poll': 'handles.poll',
+    'UV_READABLE': 'handles.poll',
+    'UV_WRITABLE': 'handles.poll',
+    'Prepare': 'handles.prepare',
+    'CreatePipe': 'handles.process',
+    'PIPE': 'handles.process',
+    'ProcessFlags': 'handles.process',
+    'Process': 'handles.process',
+    'StdIO': 'handles.process',
+    'Signals': 'handles.signal',
+    'Signal': 'handles.signal',
+    'ShutdownRequest': 'handles.stream',
+    'WriteRequest': 'handles.stream',
+    'CorkedWrite': 'handles.stream',
+    'CompletedWrite': 'handles.stream',
+    'ConnectRequest': 'handles.stream',
+    'UVStream': 'handles.stream',
+    'TCPFlags': 'handles.tcp',
+    'TCPConnectRequest': 'handles.tcp',
+    'TCP': 'handles.tcp',
+    'Timer': 'handles.timer',
+    'ConsoleSize': 'handles.tty',
+    'TTYMode': 'handles.tty',
+    'TTY': 'handles.tty',
+    'UDPFlags': 'handles.udp',
+    'UDPMembership': 'handles.udp',
+    'UDPSendRequest': 'handles.udp',
+    'CompletedSend': 'handles.udp',
+    'UDP': 'handles.udp',
+    'FSEvents': 'handles.fs_event',
+    'FSEventFlags': 'handles.fs_event',
+    'FSEvent': 'handles.fs_event',
+    'FSPoll': 'handles.fs_poll',
+    'CompactServer': 'compact',
+    'CompactConnection': 'compact',
+    'AddressFamilies': 'dns',
+    'SocketTypes': 'dns',
+    'SocketProtocols': 'dns',
+    'Address': 'dns',
+    'Address4': 'dns',
+    'Address6': 'dns',
+    'AddrInfo': 'dns',
+    'NameInfo': 'dns',
+    'getnameinfo': 'dns',
+    'getaddrinfo': 'dns',
+    'Stat': 'fs',
+    'ConnectionPool': 'pool',
+    'Scheduler': 'scheduler',
+    'Work': 'work'
+}
+
+
+def __getattr__(name):
+    """
+    Import handles, requests and utility modules on first access.
+
+    :type name:
+        unicode
+    """
+    if name in _lazy_modules:
+        value = importlib.import_module('.' + _lazy_modules[name], __name__)
+    elif name in _lazy_attributes:
+        module = importlib.import_module('.' + _lazy_attributes[name], __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_modules) | set(_lazy_attributes))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # module level __getattr__ is not supported (PEP 562)
+    for _name in list(_lazy_modules) + list(_lazy_attributes):
+        __getattr__(_name)
+    del _name
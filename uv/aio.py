@@ -0,0 +1,1798 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Asyncio event loop based on :class:`uv.Loop`. This module is only
+available on Python 3.5 and newer.
+
+To run an existing asyncio application on top of libuv install the
+event loop policy before the first event loop is created:
+
+.. code-block:: python
+
+    import uv.aio
+    uv.aio.install()
+"""
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import asyncio
+import collections
+import concurrent.futures
+import logging
+import math
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import weakref
+
+from . import error
+from .dns import getaddrinfo, getnameinfo
+from .handles.idle import Idle
+from .handles.pipe import Pipe
+from .handles.poll import Poll, PollEvent
+from .handles.process import Process
+from .handles.signal import Signal
+from .handles.tcp import TCP
+from .handles.timer import Timer
+from .handles.udp import UDP
+from .loop import Loop, RunModes
+
+__all__ = ['EventLoop', 'EventLoopPolicy', 'StreamTransport', 'DatagramTransport',
+           'SubprocessTransport', 'Server', 'new_event_loop', 'install']
+
+logger = logging.getLogger(__name__)
+
+_set_running_loop = getattr(asyncio.events, '_set_running_loop', lambda loop: None)
+_get_running_loop = getattr(asyncio.events, '_get_running_loop', lambda: None)
+
+SIGKILL = getattr(signal, 'SIGKILL', 9)
+SIGTERM = getattr(signal, 'SIGTERM', 15)
+
+KEEPALIVE_INTERVAL = 24 * 60 * 60 * 1000
+
+
+def _make_handle(callback, arguments, loop, context):
+    if context is None:
+        return asyncio.Handle(callback, arguments, loop)
+    return asyncio.Handle(callback, arguments, loop, context)
+
+
+def _make_timer_handle(when, callback, arguments, loop, context):
+    if context is None:
+        return asyncio.TimerHandle(when, callback, arguments, loop)
+    return asyncio.TimerHandle(when, callback, arguments, loop, context)
+
+
+def _fileobj_to_fd(fileobj):
+    if isinstance(fileobj, int):
+        fd = fileobj
+    else:
+        try:
+            fd = int(fileobj.fileno())
+        except (AttributeError, TypeError, ValueError):
+            raise ValueError('invalid file object: {!r}'.format(fileobj))
+    if fd < 0:
+        raise ValueError('invalid file descriptor: {}'.format(fd))
+    return fd
+
+
+def _set_result_unless_cancelled(future, result):
+    if not future.cancelled():
+        future.set_result(result)
+
+
+def _make_gaierror(status):
+    return socket.gaierror(status, error.UVError(status).message)
+
+
+def _make_address(address):
+    return None if address is None else tuple(address)
+
+
+class _PollEntry(object):
+    __slots__ = ['poll', 'reader', 'writer']
+
+    def __init__(self, poll):
+        self.poll = poll
+        self.reader = None
+        self.writer = None
+
+    @property
+    def events(self):
+        events = 0
+        if self.reader is not None:
+            events |= PollEvent.READABLE
+        if self.writer is not None:
+            events |= PollEvent.WRITABLE
+        return events
+
+
+class StreamTransport(asyncio.Transport):
+    """
+    Asyncio transport based on a :class:`uv.UVStream`. Instances are
+    created by the event loop and should not be instantiated directly.
+
+    Flow control is implemented on top of the stream's write queue
+    watermarks, see :func:`uv.UVStream.set_write_buffer_limits`.
+
+    :param loop:
+        asyncio event loop the transport belongs to
+    :param stream:
+        connected stream the transport should use
+    :param protocol:
+        protocol the transport should be connected to
+    :param waiter:
+        future which is resolved after the protocol has been connected
+    :param extra:
+        extra information about the transport
+    :param server:
+        server which accepted the stream
+    :param reading:
+        start reading after the protocol has been connected
+
+    :type loop:
+        uv.aio.EventLoop
+    :type stream:
+        uv.UVStream
+    :type protocol:
+        asyncio.Protocol
+    :type waiter:
+        asyncio.Future | None
+    :type extra:
+        dict | None
+    :type server:
+        uv.aio.Server | None
+    :type reading:
+        bool
+    """
+
+    def __init__(self, loop, stream, protocol, waiter=None, extra=None, server=None,
+                 reading=True):
+        super(StreamTransport, self).__init__(extra)
+        self._loop = loop
+        self._stream = stream
+        self._protocol = protocol
+        self._protocol_connected = False
+        self._server = server
+        self._closing = False
+        self._reading = False
+        self._eof = False
+        self._conn_lost = 0
+        self._pending_writes = 0
+        self._high_watermark = 0
+        self._low_watermark = 0
+        self.set_write_buffer_limits()
+        if server is not None:
+            server._attach()
+        loop.call_soon(self._connection_made, waiter, reading)
+
+    def __repr__(self):
+        state = 'closing' if self._closing else 'open'
+        return '<{} stream={!r} {}>'.format(self.__class__.__name__, self._stream, state)
+
+    def _connection_made(self, waiter, reading):
+        if self._conn_lost:
+            if waiter is not None and not waiter.done():
+                waiter.set_exception(ConnectionError('transport has been closed'))
+            return
+        try:
+            self._protocol.connection_made(self)
+        except Exception as exception:
+            if waiter is not None and not waiter.done():
+                waiter.set_exception(exception)
+            self._force_close(exception)
+            return
+        self._protocol_connected = True
+        if reading:
+            self.resume_reading()
+        if waiter is not None:
+            _set_result_unless_cancelled(waiter, None)
+
+    def get_extra_info(self, name, default=None):
+        if name in self._extra:
+            return self._extra[name]
+        if name in ('peername', 'sockname') and not self._stream.closing:
+            try:
+                return _make_address(getattr(self._stream, name))
+            except (error.UVError, NotImplementedError):
+                return default
+        return default
+
+    def is_closing(self):
+        return self._closing
+
+    def is_reading(self):
+        return self._reading
+
+    def pause_reading(self):
+        if self._closing or not self._reading:
+            return
+        self._reading = False
+        self._stream.stop_read()
+
+    def resume_reading(self):
+        if self._closing or self._reading:
+            return
+        self._reading = True
+        self._stream.start_read(on_read=self._on_read)
+
+    def set_protocol(self, protocol):
+        self._protocol = protocol
+
+    def get_protocol(self):
+        return self._protocol
+
+    def set_write_buffer_limits(self, high=None, low=None):
+        if high is None:
+            high = 64 * 1024 if low is None else 4 * low
+        if low is None:
+            low = high // 4
+        if not high >= low >= 0:
+            raise ValueError('high ({!r}) must be >= low ({!r}) must be >= 0'
+                             .format(high, low))
+        self._high_watermark = high
+        self._low_watermark = low
+        self._stream.set_write_buffer_limits(high, low,
+                                             on_pause_writing=self._on_pause_writing,
+                                             on_resume_writing=self._on_resume_writing)
+
+    def get_write_buffer_limits(self):
+        return self._low_watermark, self._high_watermark
+
+    def get_write_buffer_size(self):
+        return self._stream.write_queue_size
+
+    def write(self, data):
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError('data argument must be a bytes-like object, '
+                            'not {!r}'.format(type(data).__name__))
+        if self._eof:
+            raise RuntimeError('cannot call write() after write_eof()')
+        if not data:
+            return
+        if self._conn_lost or self._closing:
+            self._conn_lost += 1
+            if self._conn_lost >= 5:
+                logger.warning('socket.send() raised exception.')
+            return
+        # mutable buffers may change after write has returned
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        self._pending_writes += 1
+        self._stream.write(data, on_write=self._on_write)
+
+    def writelines(self, list_of_data):
+        self.write(b''.join(list_of_data))
+
+    def write_eof(self):
+        if self._closing or self._eof:
+            return
+        self._eof = True
+        self._pending_writes += 1
+        self._stream.shutdown(on_shutdown=self._on_write)
+
+    def can_write_eof(self):
+        return True
+
+    def close(self):
+        if self._closing:
+            return
+        self._closing = True
+        if self._reading:
+            self._reading = False
+            self._stream.stop_read()
+        if not self._pending_writes:
+            self._schedule_connection_lost(None)
+
+    def abort(self):
+        self._force_close(None)
+
+    def _on_read(self, stream, status, data):
+        if status == error.StatusCodes.SUCCESS:
+            if data:
+                if not isinstance(data, bytes):
+                    data = data.tobytes()
+                try:
+                    self._protocol.data_received(data)
+                except Exception as exception:
+                    self._fatal_error(exception, 'Fatal error: protocol.data_received() '
+                                                 'call failed.')
+        elif status == error.StatusCodes.EOF:
+            self._reading = False
+            self._stream.stop_read()
+            try:
+                keep_open = self._protocol.eof_received()
+            except Exception as exception:
+                self._fatal_error(exception, 'Fatal error: protocol.eof_received() '
+                                             'call failed.')
+                return
+            if not keep_open:
+                self.close()
+        else:
+            self._fatal_error(error.UVError(status), 'Fatal read error on transport')
+
+    def _on_write(self, request, status):
+        self._pending_writes -= 1
+        if status not in (error.StatusCodes.SUCCESS, error.StatusCodes.ECANCELED):
+            self._fatal_error(error.UVError(status), 'Fatal write error on transport')
+        elif self._closing and not self._pending_writes:
+            self._schedule_connection_lost(None)
+
+    def _on_pause_writing(self, stream):
+        try:
+            self._protocol.pause_writing()
+        except Exception as exception:
+            self._loop.call_exception_handler({
+                'message': 'protocol.pause_writing() failed',
+                'exception': exception,
+                'transport': self,
+                'protocol': self._protocol})
+
+    def _on_resume_writing(self, stream):
+        try:
+            self._protocol.resume_writing()
+        except Exception as exception:
+            self._loop.call_exception_handler({
+                'message': 'protocol.resume_writing() failed',
+                'exception': exception,
+                'transport': self,
+                'protocol': self._protocol})
+
+    def _fatal_error(self, exception, message='Fatal error on transport'):
+        if not isinstance(exception, OSError) or self._loop.get_debug():
+            self._loop.call_exception_handler({
+                'message': message,
+                'exception': exception,
+                'transport': self,
+                'protocol': self._protocol})
+        self._force_close(exception)
+
+    def _force_close(self, exception):
+        if self._conn_lost:
+            return
+        self._closing = True
+        self._reading = False
+        self._stream.close()
+        self._schedule_connection_lost(exception)
+
+    def _schedule_connection_lost(self, exception):
+        if self._conn_lost:
+            return
+        self._conn_lost += 1
+        self._loop.call_soon(self._call_connection_lost, exception)
+
+    def _call_connection_lost(self, exception):
+        try:
+            if self._protocol_connected:
+                self._protocol.connection_lost(exception)
+        finally:
+            self._stream.close()
+            self._protocol = None
+            if self._server is not None:
+                self._server._detach()
+                self._server = None
+
+
+class DatagramTransport(asyncio.DatagramTransport):
+    """
+    Asyncio datagram transport based on a :class:`uv.UDP` handle.
+    Instances are created by the event loop and should not be
+    instantiated directly.
+
+    :param loop:
+        asyncio event loop the transport belongs to
+    :param udp:
+        UDP handle the transport should use
+    :param protocol:
+        protocol the transport should be connected to
+    :param address:
+        default remote address
+    :param waiter:
+        future which is resolved after the protocol has been connected
+    :param extra:
+        extra information about the transport
+
+    :type loop:
+        uv.aio.EventLoop
+    :type udp:
+        uv.UDP
+    :type protocol:
+        asyncio.DatagramProtocol
+    :type address:
+        tuple | None
+    :type waiter:
+        asyncio.Future | None
+    :type extra:
+        dict | None
+    """
+
+    def __init__(self, loop, udp, protocol, address=None, waiter=None, extra=None):
+        super(DatagramTransport, self).__init__(extra)
+        self._loop = loop
+        self._udp = udp
+        self._protocol = protocol
+        self._address = address
+        self._closing = False
+        self._conn_lost = 0
+        self._pending_sends = 0
+        loop.call_soon(self._connection_made, waiter)
+
+    def _connection_made(self, waiter):
+        if self._conn_lost:
+            return
+        self._protocol.connection_made(self)
+        self._udp.receive_start(on_receive=self._on_receive)
+        if waiter is not None:
+            _set_result_unless_cancelled(waiter, None)
+
+    def get_extra_info(self, name, default=None):
+        if name in self._extra:
+            return self._extra[name]
+        if name == 'sockname' and not self._udp.closing:
+            try:
+                return _make_address(self._udp.sockname)
+            except error.UVError:
+                return default
+        if name == 'peername':
+            return self._address
+        return default
+
+    def is_closing(self):
+        return self._closing
+
+    def get_write_buffer_size(self):
+        if self._udp.closing:
+            return 0
+        return self._udp.uv_udp.send_queue_size
+
+    def sendto(self, data, addr=None):
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError('data argument must be a bytes-like object, '
+                            'not {!r}'.format(type(data).__name__))
+        if self._address is not None:
+            if addr not in (None, self._address):
+                raise ValueError('invalid address: must be None or '
+                                 '{}'.format(self._address))
+            addr = self._address
+        if addr is None:
+            raise ValueError('no remote address specified')
+        if self._conn_lost or self._closing:
+            self._conn_lost += 1
+            if self._conn_lost >= 5:
+                logger.warning('socket.sendto() raised exception.')
+            return
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        self._pending_sends += 1
+        self._udp.send(data, addr, on_send=self._on_send)
+
+    def close(self):
+        if self._closing:
+            return
+        self._closing = True
+        self._udp.receive_stop()
+        if not self._pending_sends:
+            self._schedule_connection_lost(None)
+
+    def abort(self):
+        self._force_close(None)
+
+    def _on_receive(self, udp, status, address, data, flags):
+        if status != error.StatusCodes.SUCCESS:
+            self._protocol.error_received(error.UVError(status))
+        elif address is not None:
+            if not isinstance(data, bytes):
+                data = data.tobytes()
+            self._protocol.datagram_received(data, tuple(address))
+
+    def _on_send(self, request, status):
+        self._pending_sends -= 1
+        if status not in (error.StatusCodes.SUCCESS, error.StatusCodes.ECANCELED):
+            self._protocol.error_received(error.UVError(status))
+        if self._closing and not self._pending_sends:
+            self._schedule_connection_lost(None)
+
+    def _force_close(self, exception):
+        if self._conn_lost:
+            return
+        self._closing = True
+        self._udp.close()
+        self._schedule_connection_lost(exception)
+
+    def _schedule_connection_lost(self, exception):
+        if self._conn_lost:
+            return
+        self._conn_lost += 1
+        self._loop.call_soon(self._call_connection_lost, exception)
+
+    def _call_connection_lost(self, exception):
+        try:
+            self._protocol.connection_lost(exception)
+        finally:
+            self._udp.close()
+            self._protocol = None
+
+
+class _SubprocessPipeProtocol(asyncio.Protocol):
+    def __init__(self, transport, fd):
+        self.transport = transport
+        self.fd = fd
+
+    def data_received(self, data):
+        self.transport._pipe_data_received(self.fd, data)
+
+    def pause_writing(self):
+        self.transport._protocol.pause_writing()
+
+    def resume_writing(self):
+        self.transport._protocol.resume_writing()
+
+    def connection_lost(self, exception):
+        self.transport._pipe_connection_lost(self.fd, exception)
+
+
+class SubprocessTransport(asyncio.SubprocessTransport):
+    """
+    Asyncio subprocess transport based on a :class:`uv.Process` handle.
+    The standard streams are connected through :class:`uv.Pipe` based
+    :class:`uv.aio.StreamTransport` instances. Instances are created by
+    the event loop and should not be instantiated directly.
+
+    :param loop:
+        asyncio event loop the transport belongs to
+    :param protocol:
+        protocol the transport should be connected to
+    :param arguments:
+        program path and command line arguments
+    :param stdin:
+        standard input specification as understood by :mod:`subprocess`
+    :param stdout:
+        standard output specification as understood by :mod:`subprocess`
+    :param stderr:
+        standard error specification as understood by :mod:`subprocess`
+    :param waiter:
+        future which is resolved after the protocol has been connected
+    :param cwd:
+        child process working directory
+    :param env:
+        child process environment variables
+
+    :type loop:
+        uv.aio.EventLoop
+    :type protocol:
+        asyncio.SubprocessProtocol
+    :type arguments:
+        list[str]
+    :type waiter:
+        asyncio.Future | None
+    :type cwd:
+        str | None
+    :type env:
+        dict[str, str] | None
+    """
+
+    def __init__(self, loop, protocol, arguments, stdin, stdout, stderr, waiter=None,
+                 cwd=None, env=None, extra=None):
+        super(SubprocessTransport, self).__init__(extra)
+        self._loop = loop
+        self._protocol = protocol
+        self._returncode = None
+        self._exit_waiters = []
+        self._pipes = {}
+        self._connected_pipes = set()
+        self._closed = False
+        self._finished = False
+
+        child_stdio, parent_fds, child_fds = [], {}, []
+        try:
+            for fd, specification in enumerate((stdin, stdout, stderr)):
+                if specification == subprocess.PIPE:
+                    read_fd, write_fd = os.pipe()
+                    if fd == 0:
+                        child, parent = read_fd, write_fd
+                    else:
+                        child, parent = write_fd, read_fd
+                    child_fds.append(child)
+                    parent_fds[fd] = parent
+                    child_stdio.append(child)
+                elif specification == subprocess.DEVNULL:
+                    child = os.open(os.devnull, os.O_RDWR)
+                    child_fds.append(child)
+                    child_stdio.append(child)
+                elif specification == subprocess.STDOUT:
+                    if fd != 2:
+                        raise ValueError('STDOUT can only be used for stderr')
+                    child_stdio.append(child_stdio[1])
+                elif specification is None:
+                    child_stdio.append(fd)
+                else:
+                    child_stdio.append(specification)
+            self._process = Process(arguments, cwd=cwd, env=env, stdin=child_stdio[0],
+                                    stdout=child_stdio[1], stderr=child_stdio[2],
+                                    loop=loop.uv_loop, on_exit=self._on_exit)
+        except BaseException:
+            for parent in parent_fds.values():
+                os.close(parent)
+            raise
+        finally:
+            for child in child_fds:
+                os.close(child)
+
+        self._pid = self._process.pid
+        for fd, parent in parent_fds.items():
+            pipe = Pipe(loop=loop.uv_loop)
+            pipe.open(parent)
+            self._connected_pipes.add(fd)
+            pipe_protocol = _SubprocessPipeProtocol(self, fd)
+            self._pipes[fd] = StreamTransport(loop, pipe, pipe_protocol, reading=fd != 0)
+        loop.call_soon(self._protocol.connection_made, self)
+        if waiter is not None:
+            loop.call_soon(_set_result_unless_cancelled, waiter, None)
+
+    def __repr__(self):
+        return '<{} pid={} returncode={}>'.format(self.__class__.__name__, self._pid,
+                                                   self._returncode)
+
+    def get_pid(self):
+        return self._pid
+
+    def get_returncode(self):
+        return self._returncode
+
+    def get_pipe_transport(self, fd):
+        return self._pipes.get(fd)
+
+    def is_closing(self):
+        return self._closed
+
+    def send_signal(self, signum):
+        if self._returncode is not None or self._process.closing:
+            raise ProcessLookupError()
+        self._process.kill(signum)
+
+    def terminate(self):
+        self.send_signal(SIGTERM)
+
+    def kill(self):
+        self.send_signal(SIGKILL)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for pipe in self._pipes.values():
+            pipe.close()
+        if self._returncode is None:
+            try:
+                self._process.kill(SIGKILL)
+            except (error.UVError, ProcessLookupError):
+                pass
+
+    async def _wait(self):
+        if self._returncode is not None:
+            return self._returncode
+        waiter = self._loop.create_future()
+        self._exit_waiters.append(waiter)
+        return await waiter
+
+    def _on_exit(self, process, returncode, signum):
+        self._returncode = -signum if signum else returncode
+        process.close()
+        stdin = self._pipes.get(0)
+        if stdin is not None:
+            stdin.close()
+        self._loop.call_soon(self._protocol.process_exited)
+        for waiter in self._exit_waiters:
+            if not waiter.cancelled():
+                waiter.set_result(self._returncode)
+        self._exit_waiters = []
+        self._try_finish()
+
+    def _pipe_data_received(self, fd, data):
+        self._protocol.pipe_data_received(fd, data)
+
+    def _pipe_connection_lost(self, fd, exception):
+        self._connected_pipes.discard(fd)
+        self._protocol.pipe_connection_lost(fd, exception)
+        self._try_finish()
+
+    def _try_finish(self):
+        if self._finished or self._returncode is None or self._connected_pipes:
+            return
+        self._finished = True
+        self._loop.call_soon(self._call_connection_lost, None)
+
+    def _call_connection_lost(self, exception):
+        try:
+            self._protocol.connection_lost(exception)
+        finally:
+            self._protocol = None
+
+
+class Server(asyncio.AbstractServer):
+    """
+    Asyncio server based on listening :class:`uv.TCP` or :class:`uv.Pipe`
+    handles. Instances are created by the event loop and should not be
+    instantiated directly.
+
+    :param loop:
+        asyncio event loop the server belongs to
+    :param listeners:
+        bound but not yet listening stream handles
+    :param protocol_factory:
+        factory for protocols of accepted connections
+    :param backlog:
+        maximum number of queued connections
+
+    :type loop:
+        uv.aio.EventLoop
+    :type listeners:
+        list[uv.UVStream]
+    :type protocol_factory:
+        () -> asyncio.Protocol
+    :type backlog:
+        int
+    """
+
+    def __init__(self, loop, listeners, protocol_factory, backlog):
+        self._loop = loop
+        self._listeners = listeners
+        self._protocol_factory = protocol_factory
+        self._backlog = backlog
+        self._serving = False
+        self._serving_forever = None
+        self._active_count = 0
+        self._waiters = []
+        self._sockets = None
+
+    def __repr__(self):
+        return '<{} sockets={!r}>'.format(self.__class__.__name__, self.sockets)
+
+    def _attach(self):
+        self._active_count += 1
+
+    def _detach(self):
+        self._active_count -= 1
+        if not self._active_count and self._listeners is None:
+            self._wakeup()
+
+    def _wakeup(self):
+        waiters, self._waiters = self._waiters, None
+        for waiter in waiters or ():
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _start_serving(self):
+        if self._serving:
+            return
+        self._serving = True
+        for listener in self._listeners:
+            listener.listen(on_connection=self._on_connection, backlog=self._backlog)
+
+    def _on_connection(self, listener, status):
+        if status != error.StatusCodes.SUCCESS:
+            self._loop.call_exception_handler({
+                'message': 'Error on accepting connection',
+                'exception': error.UVError(status),
+                'server': self})
+            return
+        stream = listener.accept(loop=self._loop.uv_loop)
+        StreamTransport(self._loop, stream, self._protocol_factory(), server=self)
+
+    @property
+    def sockets(self):
+        if self._listeners is None:
+            return ()
+        if self._sockets is None:
+            self._sockets = tuple(socket.fromfd(listener.fileno(), listener.family,
+                                                socket.SOCK_STREAM)
+                                  for listener in self._listeners)
+        return self._sockets
+
+    def get_loop(self):
+        return self._loop
+
+    def is_serving(self):
+        return self._serving
+
+    def close(self):
+        listeners = self._listeners
+        if listeners is None:
+            return
+        self._listeners = None
+        self._serving = False
+        for listener in listeners:
+            listener.close()
+        for sock in self._sockets or ():
+            sock.close()
+        self._sockets = None
+        if self._serving_forever is not None and not self._serving_forever.done():
+            self._serving_forever.cancel()
+            self._serving_forever = None
+        if not self._active_count:
+            self._wakeup()
+
+    async def start_serving(self):
+        if self._listeners is None:
+            raise RuntimeError('server {!r} is closed'.format(self))
+        self._start_serving()
+
+    async def serve_forever(self):
+        if self._serving_forever is not None:
+            raise RuntimeError('server {!r} is already being awaited on '
+                               'serve_forever()'.format(self))
+        if self._listeners is None:
+            raise RuntimeError('server {!r} is closed'.format(self))
+        self._start_serving()
+        self._serving_forever = self._loop.create_future()
+        try:
+            await self._serving_forever
+        except asyncio.CancelledError:
+            try:
+                self.close()
+                await self.wait_closed()
+            finally:
+                raise
+        finally:
+            self._serving_forever = None
+
+    async def wait_closed(self):
+        if self._waiters is None:
+            return
+        waiter = self._loop.create_future()
+        self._waiters.append(waiter)
+        await waiter
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+        await self.wait_closed()
+
+
+class EventLoop(asyncio.AbstractEventLoop):
+    """
+    Asyncio event loop running on top of a :class:`uv.Loop`. Timers
+    are multiplexed onto one libuv timer by :func:`uv.Loop.call_at`,
+    file descriptor watching is implemented with :class:`uv.Poll`,
+    transports with :class:`uv.TCP`, :class:`uv.Pipe` and
+    :class:`uv.UDP`, subprocesses with :class:`uv.Process`, signal
+    handling with :class:`uv.Signal` and name resolution with
+    :func:`uv.getaddrinfo`.
+
+    Callbacks scheduled with :func:`call_soon` are executed by an
+    :class:`uv.Idle` handle, so the loop does not block for IO while
+    callbacks are ready.
+
+    :param uv_loop:
+        libuv event loop to run on (a new loop is created and owned by
+        the event loop if not specified)
+
+    :type uv_loop:
+        uv.Loop | None
+    """
+
+    def __init__(self, uv_loop=None):
+        self._owns_uv_loop = uv_loop is None
+        self.uv_loop = uv_loop or Loop()
+        """
+        Underlying libuv event loop.
+
+        :readonly:
+            True
+        :type:
+            uv.Loop
+        """
+        self.uv_loop.excepthook = self._excepthook
+        self._ready = collections.deque()
+        self._idle = Idle(self.uv_loop, on_idle=self._on_idle)
+        self._idle_active = False
+        # keeps the libuv loop alive while running forever without other handles
+        self._keepalive = Timer(self.uv_loop)
+        self._timers = {}
+        self._polls = {}
+        self._signals = {}
+        self._closed = False
+        self._stopping = False
+        self._thread_id = None
+        self._debug = False
+        self._exception_handler = None
+        self._task_factory = None
+        self._default_executor = None
+        self._asyncgens = weakref.WeakSet()
+        self._asyncgens_shutdown_called = False
+
+    def __repr__(self):
+        return '<{} running={} closed={} debug={}>'.format(self.__class__.__name__,
+                                                           self.is_running(),
+                                                           self.is_closed(),
+                                                           self.get_debug())
+
+    def _check_closed(self):
+        if self._closed:
+            raise RuntimeError('Event loop is closed')
+
+    def _excepthook(self, loop, exc_type, exc_value, exc_traceback):
+        self.call_exception_handler({'message': 'Unhandled exception in libuv callback',
+                                     'exception': exc_value})
+
+    # running and stopping the event loop
+
+    def run_forever(self):
+        self._check_closed()
+        if self.is_running():
+            raise RuntimeError('This event loop is already running')
+        if _get_running_loop() is not None:
+            raise RuntimeError('Cannot run the event loop while another loop is running')
+        self._thread_id = threading.get_ident()
+        old_agen_hooks = None
+        if hasattr(sys, 'get_asyncgen_hooks'):
+            old_agen_hooks = sys.get_asyncgen_hooks()
+            sys.set_asyncgen_hooks(firstiter=self._asyncgen_firstiter_hook,
+                                   finalizer=self._asyncgen_finalizer_hook)
+        _set_running_loop(self)
+        self._keepalive.start(None, KEEPALIVE_INTERVAL, KEEPALIVE_INTERVAL)
+        try:
+            while True:
+                self.uv_loop.run(RunModes.NOWAIT if self._stopping else RunModes.DEFAULT)
+                if self._stopping:
+                    break
+        finally:
+            self._keepalive.stop()
+            self._stopping = False
+            self._thread_id = None
+            _set_running_loop(None)
+            if old_agen_hooks is not None:
+                sys.set_asyncgen_hooks(*old_agen_hooks)
+
+    def run_until_complete(self, future):
+        self._check_closed()
+        new_task = not asyncio.isfuture(future)
+        future = asyncio.ensure_future(future, loop=self)
+        if new_task:
+            future._log_destroy_pending = False
+        future.add_done_callback(self._run_until_complete_cb)
+        try:
+            self.run_forever()
+        except BaseException:
+            if new_task and future.done() and not future.cancelled():
+                future.exception()
+            raise
+        finally:
+            future.remove_done_callback(self._run_until_complete_cb)
+        if not future.done():
+            raise RuntimeError('Event loop stopped before Future completed.')
+        return future.result()
+
+    def _run_until_complete_cb(self, future):
+        self.stop()
+
+    def stop(self):
+        self._stopping = True
+        if self.is_running():
+            self.uv_loop.stop()
+
+    def is_running(self):
+        return self._thread_id is not None
+
+    def is_closed(self):
+        return self._closed
+
+    def close(self):
+        if self.is_running():
+            raise RuntimeError('Cannot close a running event loop')
+        if self._closed:
+            return
+        self._closed = True
+        self._ready.clear()
+        executor, self._default_executor = self._default_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        if self._owns_uv_loop:
+            self.uv_loop.close_all_handles()
+        else:
+            handles = [self._idle, self._keepalive]
+            handles.extend(entry.poll for entry in self._polls.values())
+            handles.extend(self._signals.values())
+            for handle in handles:
+                handle.close()
+        for scheduled_call in self._timers.values():
+            scheduled_call.cancel()
+        self._timers.clear()
+        self._polls.clear()
+        self._signals.clear()
+        self.uv_loop.run(RunModes.DEFAULT if self._owns_uv_loop else RunModes.NOWAIT)
+        if self._owns_uv_loop:
+            try:
+                self.uv_loop.close()
+            except error.UVError:
+                logger.warning('libuv loop could not be closed: pending operations')
+
+    async def shutdown_asyncgens(self):
+        self._asyncgens_shutdown_called = True
+        if not len(self._asyncgens):
+            return
+        closing_agens = list(self._asyncgens)
+        self._asyncgens.clear()
+        results = await asyncio.gather(*[agen.aclose() for agen in closing_agens],
+                                       return_exceptions=True)
+        for result, agen in zip(results, closing_agens):
+            if isinstance(result, Exception):
+                self.call_exception_handler({
+                    'message': 'an error occurred during closing of asynchronous '
+                               'generator {!r}'.format(agen),
+                    'exception': result,
+                    'asyncgen': agen})
+
+    def _asyncgen_firstiter_hook(self, agen):
+        if self._asyncgens_shutdown_called:
+            logger.warning('asynchronous generator %r was scheduled after '
+                           'loop.shutdown_asyncgens() call', agen)
+        self._asyncgens.add(agen)
+
+    def _asyncgen_finalizer_hook(self, agen):
+        self._asyncgens.discard(agen)
+        if not self.is_closed():
+            self.call_soon_threadsafe(self.create_task, agen.aclose())
+
+    async def shutdown_default_executor(self, timeout=None):
+        executor, self._default_executor = self._default_executor, None
+        if executor is None:
+            return
+        future = self.create_future()
+
+        def shutdown():
+            try:
+                executor.shutdown(wait=True)
+            finally:
+                if not self.is_closed():
+                    self.call_soon_threadsafe(_set_result_unless_cancelled, future, None)
+
+        thread = threading.Thread(target=shutdown)
+        thread.start()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            logger.warning('the executor did not finish joining its threads within '
+                           '%s seconds', timeout)
+        else:
+            thread.join()
+
+    # scheduling callbacks
+
+    def _append_ready(self, handle):
+        self._ready.append(handle)
+        if not self._idle_active:
+            self._idle_active = True
+            self._idle.start()
+
+    def _on_idle(self, idle):
+        ready = self._ready
+        for _ in range(len(ready)):
+            handle = ready.popleft()
+            if not handle._cancelled:
+                handle._run()
+        if not ready and self._idle_active:
+            self._idle_active = False
+            idle.stop()
+
+    def call_soon(self, callback, *args, context=None):
+        self._check_closed()
+        handle = _make_handle(callback, args, self, context)
+        self._append_ready(handle)
+        return handle
+
+    def call_soon_threadsafe(self, callback, *args, context=None):
+        self._check_closed()
+        handle = _make_handle(callback, args, self, context)
+        self.uv_loop.call_later(self._append_ready, handle)
+        return handle
+
+    def time(self):
+        return time.monotonic()
+
+    def call_later(self, delay, callback, *args, context=None):
+        return self.call_at(self.time() + delay, callback, *args, context=context)
+
+    def call_at(self, when, callback, *args, context=None):
+        self._check_closed()
+        handle = _make_timer_handle(when, callback, args, self, context)
+        # the cached loop time might be outdated which would fire the call too early
+        self.uv_loop.update_time()
+        timeout = max(0, int(math.ceil((when - self.time()) * 1000)))
+        self._timers[handle] = self.uv_loop.call_after(timeout, self._on_timeout, handle)
+        return handle
+
+    def _on_timeout(self, handle):
+        self._timers.pop(handle, None)
+        if not handle._cancelled:
+            handle._run()
+
+    def _timer_handle_cancelled(self, handle):
+        scheduled_call = self._timers.pop(handle, None)
+        if scheduled_call is not None:
+            scheduled_call.cancel()
+
+    # futures and tasks
+
+    def create_future(self):
+        return asyncio.Future(loop=self)
+
+    def create_task(self, coro, *, name=None, context=None):
+        self._check_closed()
+        if self._task_factory is None:
+            keywords = {}
+            if name is not None:
+                keywords['name'] = name
+            if context is not None:
+                keywords['context'] = context
+            return asyncio.Task(coro, loop=self, **keywords)
+        if context is None:
+            task = self._task_factory(self, coro)
+        else:
+            task = self._task_factory(self, coro, context=context)
+        if name is not None and hasattr(task, 'set_name'):
+            task.set_name(name)
+        return task
+
+    def set_task_factory(self, factory):
+        if factory is not None and not callable(factory):
+            raise TypeError('task factory must be a callable or None')
+        self._task_factory = factory
+
+    def get_task_factory(self):
+        return self._task_factory
+
+    # executor
+
+    def run_in_executor(self, executor, func, *args):
+        self._check_closed()
+        if executor is None:
+            executor = self._default_executor
+            if executor is None:
+                executor = concurrent.futures.ThreadPoolExecutor()
+                self._default_executor = executor
+        return asyncio.wrap_future(executor.submit(func, *args), loop=self)
+
+    def set_default_executor(self, executor):
+        self._default_executor = executor
+
+    # name resolution
+
+    async def getaddrinfo(self, host, port, *, family=0, type=0, proto=0, flags=0):
+        if host is None:
+            # libuv requires a node name, so passive lookups use the thread pool
+            return await self.run_in_executor(None, socket.getaddrinfo, host, port,
+                                              family, type, proto, flags)
+        if isinstance(host, bytes):
+            host = host.decode('idna')
+        if isinstance(port, bytes):
+            port = port.decode('ascii')
+        future = self.create_future()
+
+        def callback(request, status, addrinfo):
+            if future.cancelled():
+                return
+            if status != error.StatusCodes.SUCCESS:
+                future.set_exception(_make_gaierror(status))
+            else:
+                future.set_result([(int(info.family), int(info.socktype),
+                                    int(info.protocol), info.canonname or '',
+                                    tuple(info.address)) for info in addrinfo])
+
+        getaddrinfo(host, port or 0, family, type, proto, flags, callback=callback,
+                    loop=self.uv_loop)
+        return await future
+
+    async def getnameinfo(self, sockaddr, flags=0):
+        future = self.create_future()
+
+        def callback(request, status, hostname, service):
+            if future.cancelled():
+                return
+            if status != error.StatusCodes.SUCCESS:
+                future.set_exception(_make_gaierror(status))
+            else:
+                future.set_result((hostname, service))
+
+        getnameinfo(sockaddr[0], sockaddr[1], flags, callback=callback, loop=self.uv_loop)
+        return await future
+
+    async def _resolve(self, host, port, family=0, type=0, proto=0, flags=0):
+        infos = await self.getaddrinfo(host, port, family=family, type=type, proto=proto,
+                                       flags=flags)
+        if not infos:
+            raise OSError('getaddrinfo() returned empty list')
+        return infos
+
+    # streams
+
+    async def _connect(self, stream, address):
+        future = self.create_future()
+
+        def on_connect(request, status):
+            if future.cancelled():
+                return
+            if status != error.StatusCodes.SUCCESS:
+                future.set_exception(error.UVError(status))
+            else:
+                future.set_result(None)
+
+        stream.connect(address, on_connect=on_connect)
+        await future
+
+    async def _make_stream_transport(self, stream, protocol_factory):
+        protocol = protocol_factory()
+        waiter = self.create_future()
+        transport = StreamTransport(self, stream, protocol, waiter)
+        try:
+            await waiter
+        except BaseException:
+            transport.close()
+            raise
+        return transport, protocol
+
+    async def create_connection(self, protocol_factory, host=None, port=None, *, ssl=None,
+                                family=0, proto=0, flags=0, sock=None, local_addr=None,
+                                server_hostname=None, **keywords):
+        if ssl:
+            raise NotImplementedError('SSL is not supported by the libuv event loop')
+        if server_hostname is not None:
+            raise ValueError('server_hostname is only meaningful with ssl')
+        if sock is not None:
+            if host is not None or port is not None:
+                raise ValueError('host/port and sock can not be specified at the '
+                                 'same time')
+            tcp = TCP(loop=self.uv_loop)
+            tcp.open(sock.detach())
+            return await self._make_stream_transport(tcp, protocol_factory)
+        if host is None and port is None:
+            raise ValueError('host and port was not specified and no sock specified')
+        infos = await self._resolve(host, port, family, socket.SOCK_STREAM, proto, flags)
+        local_infos = None
+        if local_addr is not None:
+            local_infos = await self._resolve(local_addr[0], local_addr[1], family,
+                                              socket.SOCK_STREAM, proto, flags)
+        exceptions = []
+        for family, _, _, _, address in infos:
+            tcp = TCP(loop=self.uv_loop)
+            try:
+                if local_infos is not None:
+                    local_address = [info[4] for info in local_infos
+                                     if info[0] == family]
+                    if not local_address:
+                        raise OSError('no matching local address with family={} '
+                                      'found'.format(family))
+                    tcp.bind(local_address[0])
+                await self._connect(tcp, address)
+            except OSError as exception:
+                tcp.close()
+                exceptions.append(exception)
+            except BaseException:
+                tcp.close()
+                raise
+            else:
+                return await self._make_stream_transport(tcp, protocol_factory)
+        if len(exceptions) == 1:
+            raise exceptions[0]
+        raise OSError('Multiple exceptions: {}'.format(', '.join(map(str, exceptions))))
+
+    async def create_server(self, protocol_factory, host=None, port=None, *,
+                            family=socket.AF_UNSPEC, flags=socket.AI_PASSIVE, sock=None,
+                            backlog=100, ssl=None, reuse_address=None, reuse_port=None,
+                            start_serving=True, **keywords):
+        if ssl:
+            raise NotImplementedError('SSL is not supported by the libuv event loop')
+        if reuse_port:
+            raise ValueError('reuse_port is not supported by the libuv event loop')
+        listeners = []
+        try:
+            if sock is not None:
+                if host is not None or port is not None:
+                    raise ValueError('host/port and sock can not be specified at the '
+                                     'same time')
+                tcp = TCP(loop=self.uv_loop)
+                listeners.append(tcp)
+                tcp.open(sock.detach())
+            else:
+                hosts = host if isinstance(host, (list, tuple)) else [host]
+                addresses = set()
+                for host in hosts:
+                    infos = await self._resolve(host, port, family, socket.SOCK_STREAM,
+                                                0, flags)
+                    addresses.update((info[0], info[4]) for info in infos)
+                for family, address in sorted(addresses, key=lambda item: item[0]):
+                    tcp = TCP(loop=self.uv_loop)
+                    listeners.append(tcp)
+                    tcp.bind(address)
+        except BaseException:
+            for listener in listeners:
+                listener.close()
+            raise
+        server = Server(self, listeners, protocol_factory, backlog)
+        if start_serving:
+            server._start_serving()
+        return server
+
+    async def connect_accepted_socket(self, protocol_factory, sock, *, ssl=None,
+                                      **keywords):
+        if ssl:
+            raise NotImplementedError('SSL is not supported by the libuv event loop')
+        tcp = TCP(loop=self.uv_loop)
+        tcp.open(sock.detach())
+        return await self._make_stream_transport(tcp, protocol_factory)
+
+    async def create_unix_connection(self, protocol_factory, path=None, *, ssl=None,
+                                     sock=None, server_hostname=None, **keywords):
+        if ssl:
+            raise NotImplementedError('SSL is not supported by the libuv event loop')
+        pipe = Pipe(loop=self.uv_loop)
+        try:
+            if sock is not None:
+                if path is not None:
+                    raise ValueError('path and sock can not be specified at the '
+                                     'same time')
+                pipe.open(sock.detach())
+            else:
+                await self._connect(pipe, os.fsdecode(path))
+        except BaseException:
+            pipe.close()
+            raise
+        return await self._make_stream_transport(pipe, protocol_factory)
+
+    async def create_unix_server(self, protocol_factory, path=None, *, sock=None,
+                                 backlog=100, ssl=None, start_serving=True, **keywords):
+        if ssl:
+            raise NotImplementedError('SSL is not supported by the libuv event loop')
+        pipe = Pipe(loop=self.uv_loop)
+        try:
+            if sock is not None:
+                if path is not None:
+                    raise ValueError('path and sock can not be specified at the '
+                                     'same time')
+                pipe.open(sock.detach())
+            else:
+                pipe.bind(os.fsdecode(path))
+        except BaseException:
+            pipe.close()
+            raise
+        server = Server(self, [pipe], protocol_factory, backlog)
+        if start_serving:
+            server._start_serving()
+        return server
+
+    async def create_datagram_endpoint(self, protocol_factory, local_addr=None,
+                                       remote_addr=None, *, family=0, proto=0, flags=0,
+                                       reuse_address=None, reuse_port=None,
+                                       allow_broadcast=None, sock=None):
+        if reuse_port:
+            raise ValueError('reuse_port is not supported by the libuv event loop')
+        udp = UDP(loop=self.uv_loop)
+        remote_address = None
+        try:
+            if sock is not None:
+                if local_addr is not None or remote_addr is not None:
+                    raise ValueError('socket modifier keyword arguments can not be used '
+                                     'when sock is specified')
+                udp.open(sock.detach())
+            else:
+                if remote_addr is not None:
+                    infos = await self._resolve(remote_addr[0], remote_addr[1], family,
+                                                socket.SOCK_DGRAM, proto, flags)
+                    family, remote_address = infos[0][0], infos[0][4]
+                if local_addr is not None:
+                    infos = await self._resolve(local_addr[0], local_addr[1], family,
+                                                socket.SOCK_DGRAM, proto, flags)
+                    udp.bind(infos[0][4])
+                elif remote_address is not None:
+                    udp.bind(('::' if family == socket.AF_INET6 else '0.0.0.0', 0))
+                if allow_broadcast:
+                    udp.set_broadcast(True)
+        except BaseException:
+            udp.close()
+            raise
+        protocol = protocol_factory()
+        waiter = self.create_future()
+        transport = DatagramTransport(self, udp, protocol, remote_address, waiter)
+        try:
+            await waiter
+        except BaseException:
+            transport.close()
+            raise
+        return transport, protocol
+
+    # file descriptors
+
+    def _get_poll_entry(self, fd):
+        entry = self._polls.get(fd)
+        if entry is None:
+            entry = _PollEntry(Poll(self.uv_loop, fd, on_event=self._on_poll_event))
+            entry.poll.data = entry
+            self._polls[fd] = entry
+        return entry
+
+    def _update_poll_entry(self, fd, entry):
+        events = entry.events
+        if events:
+            entry.poll.start(events)
+        else:
+            entry.poll.close()
+            del self._polls[fd]
+
+    def _on_poll_event(self, poll, status, events):
+        entry = poll.data
+        if status != error.StatusCodes.SUCCESS:
+            # let the callbacks discover the error themselves
+            events = PollEvent.READABLE | PollEvent.WRITABLE
+        if events & PollEvent.READABLE and entry.reader is not None:
+            if entry.reader._cancelled:
+                self.remove_reader(poll.fd)
+            else:
+                entry.reader._run()
+        if events & PollEvent.WRITABLE and entry.writer is not None:
+            if entry.writer._cancelled:
+                self.remove_writer(poll.fd)
+            else:
+                entry.writer._run()
+
+    def add_reader(self, fd, callback, *args):
+        self._check_closed()
+        fd = _fileobj_to_fd(fd)
+        entry = self._get_poll_entry(fd)
+        if entry.reader is not None:
+            entry.reader.cancel()
+        entry.reader = _make_handle(callback, args, self, None)
+        self._update_poll_entry(fd, entry)
+
+    def remove_reader(self, fd):
+        fd = _fileobj_to_fd(fd)
+        entry = self._polls.get(fd)
+        if entry is None or entry.reader is None:
+            return False
+        entry.reader.cancel()
+        entry.reader = None
+        if not self._closed:
+            self._update_poll_entry(fd, entry)
+        return True
+
+    def add_writer(self, fd, callback, *args):
+        self._check_closed()
+        fd = _fileobj_to_fd(fd)
+        entry = self._get_poll_entry(fd)
+        if entry.writer is not None:
+            entry.writer.cancel()
+        entry.writer = _make_handle(callback, args, self, None)
+        self._update_poll_entry(fd, entry)
+
+    def remove_writer(self, fd):
+        fd = _fileobj_to_fd(fd)
+        entry = self._polls.get(fd)
+        if entry is None or entry.writer is None:
+            return False
+        entry.writer.cancel()
+        entry.writer = None
+        if not self._closed:
+            self._update_poll_entry(fd, entry)
+        return True
+
+    # low level socket operations
+
+    async def sock_recv(self, sock, n):
+        try:
+            return sock.recv(n)
+        except (BlockingIOError, InterruptedError):
+            pass
+        future = self.create_future()
+        fd = sock.fileno()
+
+        def on_readable():
+            if future.done():
+                return
+            try:
+                data = sock.recv(n)
+            except (BlockingIOError, InterruptedError):
+                return
+            except BaseException as exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(data)
+            self.remove_reader(fd)
+
+        self.add_reader(fd, on_readable)
+        future.add_done_callback(lambda _: self.remove_reader(fd))
+        return await future
+
+    async def sock_recv_into(self, sock, buf):
+        try:
+            return sock.recv_into(buf)
+        except (BlockingIOError, InterruptedError):
+            pass
+        future = self.create_future()
+        fd = sock.fileno()
+
+        def on_readable():
+            if future.done():
+                return
+            try:
+                nbytes = sock.recv_into(buf)
+            except (BlockingIOError, InterruptedError):
+                return
+            except BaseException as exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(nbytes)
+            self.remove_reader(fd)
+
+        self.add_reader(fd, on_readable)
+        future.add_done_callback(lambda _: self.remove_reader(fd))
+        return await future
+
+    async def sock_sendall(self, sock, data):
+        view = memoryview(data)
+        try:
+            sent = sock.send(view)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        if sent == len(view):
+            return
+        future = self.create_future()
+        fd = sock.fileno()
+        position = [sent]
+
+        def on_writable():
+            if future.done():
+                return
+            try:
+                position[0] += sock.send(view[position[0]:])
+            except (BlockingIOError, InterruptedError):
+                return
+            except BaseException as exception:
+                future.set_exception(exception)
+                return
+            if position[0] == len(view):
+                future.set_result(None)
+
+        self.add_writer(fd, on_writable)
+        future.add_done_callback(lambda _: self.remove_writer(fd))
+        await future
+
+    async def sock_connect(self, sock, address):
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            infos = await self._resolve(address[0], address[1], sock.family, sock.type,
+                                        sock.proto)
+            address = infos[0][4]
+        try:
+            sock.connect(address)
+            return
+        except (BlockingIOError, InterruptedError):
+            pass
+        future = self.create_future()
+        fd = sock.fileno()
+
+        def on_writable():
+            if future.done():
+                return
+            code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if code:
+                future.set_exception(OSError(code, 'Connect call failed {}'
+                                                   .format(address)))
+            else:
+                future.set_result(None)
+
+        self.add_writer(fd, on_writable)
+        future.add_done_callback(lambda _: self.remove_writer(fd))
+        await future
+
+    async def sock_accept(self, sock):
+        future = self.create_future()
+        fd = sock.fileno()
+
+        def on_readable():
+            if future.done():
+                return
+            try:
+                connection, address = sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except BaseException as exception:
+                future.set_exception(exception)
+            else:
+                connection.setblocking(False)
+                future.set_result((connection, address))
+
+        self.add_reader(fd, on_readable)
+        future.add_done_callback(lambda _: self.remove_reader(fd))
+        return await future
+
+    # pipes and subprocesses
+
+    async def connect_read_pipe(self, protocol_factory, pipe):
+        return await self._connect_pipe(protocol_factory, pipe, True)
+
+    async def connect_write_pipe(self, protocol_factory, pipe):
+        return await self._connect_pipe(protocol_factory, pipe, False)
+
+    async def _connect_pipe(self, protocol_factory, pipe, reading):
+        stream = Pipe(loop=self.uv_loop)
+        try:
+            stream.open(os.dup(_fileobj_to_fd(pipe)))
+        except BaseException:
+            stream.close()
+            raise
+        protocol = protocol_factory()
+        waiter = self.create_future()
+        transport = StreamTransport(self, stream, protocol, waiter, {'pipe': pipe},
+                                    reading=reading)
+        await waiter
+        return transport, protocol
+
+    async def _make_subprocess_transport(self, protocol_factory, arguments, stdin, stdout,
+                                         stderr, keywords):
+        for name in ('universal_newlines', 'shell', 'text'):
+            if keywords.pop(name, False):
+                raise ValueError('{} must be False'.format(name))
+        for name in ('encoding', 'errors'):
+            if keywords.pop(name, None) is not None:
+                raise ValueError('{} must be None'.format(name))
+        if keywords.pop('bufsize', 0) != 0:
+            raise ValueError('bufsize must be 0')
+        cwd, env = keywords.pop('cwd', None), keywords.pop('env', None)
+        if keywords:
+            raise TypeError('unsupported keyword arguments: '
+                            '{}'.format(', '.join(sorted(keywords))))
+        arguments = [os.fsdecode(argument) for argument in arguments]
+        if cwd is not None:
+            cwd = os.fsdecode(cwd)
+        protocol = protocol_factory()
+        waiter = self.create_future()
+        transport = SubprocessTransport(self, protocol, arguments, stdin, stdout, stderr,
+                                        waiter, cwd, env)
+        try:
+            await waiter
+        except BaseException:
+            transport.close()
+            raise
+        return transport, protocol
+
+    async def subprocess_exec(self, protocol_factory, program, *args,
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE, **keywords):
+        arguments = (program, ) + args
+        return await self._make_subprocess_transport(protocol_factory, arguments, stdin,
+                                                     stdout, stderr, keywords)
+
+    async def subprocess_shell(self, protocol_factory, cmd, *, stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               **keywords):
+        if not isinstance(cmd, (bytes, str)):
+            raise ValueError('cmd must be a string')
+        if sys.platform == 'win32':
+            arguments = [os.environ.get('COMSPEC', 'cmd.exe'), '/c', os.fsdecode(cmd)]
+        else:
+            arguments = ['/bin/sh', '-c', os.fsdecode(cmd)]
+        return await self._make_subprocess_transport(protocol_factory, arguments, stdin,
+                                                     stdout, stderr, keywords)
+
+    # signals
+
+    def add_signal_handler(self, sig, callback, *args):
+        self._check_closed()
+        if asyncio.iscoroutine(callback) or asyncio.iscoroutinefunction(callback):
+            raise TypeError('coroutines cannot be used with add_signal_handler()')
+        if not isinstance(sig, int) or not 1 <= sig < signal.NSIG:
+            raise ValueError('invalid signal number {!r}'.format(sig))
+        signal_handle = self._signals.get(sig)
+        if signal_handle is None:
+            signal_handle = Signal(self.uv_loop, on_signal=self._on_signal)
+            self._signals[sig] = signal_handle
+        signal_handle.data = _make_handle(callback, args, self, None)
+        signal_handle.start(self._on_signal, sig)
+        signal_handle.dereference()
+
+    def remove_signal_handler(self, sig):
+        signal_handle = self._signals.pop(sig, None)
+        if signal_handle is None:
+            return False
+        signal_handle.close()
+        return True
+
+    def _on_signal(self, signal_handle, signum):
+        handle = signal_handle.data
+        if not handle._cancelled:
+            self._append_ready(handle)
+
+    # error handling
+
+    def get_exception_handler(self):
+        return self._exception_handler
+
+    def set_exception_handler(self, handler):
+        if handler is not None and not callable(handler):
+            raise TypeError('a callable object or None is expected, '
+                            'got {!r}'.format(handler))
+        self._exception_handler = handler
+
+    def default_exception_handler(self, context):
+        message = context.get('message') or 'Unhandled exception in event loop'
+        exception = context.get('exception')
+        if exception is not None:
+            exc_info = (type(exception), exception, exception.__traceback__)
+        else:
+            exc_info = False
+        lines = [message]
+        for key in sorted(context):
+            if key not in ('message', 'exception'):
+                lines.append('{}: {!r}'.format(key, context[key]))
+        logger.error('\n'.join(lines), exc_info=exc_info)
+
+    def call_exception_handler(self, context):
+        if self._exception_handler is None:
+            try:
+                self.default_exception_handler(context)
+            except Exception:
+                logger.error('Exception in default exception handler', exc_info=True)
+            return
+        try:
+            self._exception_handler(self, context)
+        except Exception as exception:
+            try:
+                self.default_exception_handler({
+                    'message': 'Unhandled error in exception handler',
+                    'exception': exception,
+                    'context': context})
+            except Exception:
+                logger.error('Exception in default exception handler while handling an '
+                             'unexpected error in custom exception handler',
+                             exc_info=True)
+
+    # debug mode
+
+    def get_debug(self):
+        return self._debug
+
+    def set_debug(self, enabled):
+        self._debug = enabled
+
+
+class EventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    """
+    Event loop policy creating :class:`uv.aio.EventLoop` instances.
+    """
+
+    _loop_factory = EventLoop
+
+
+def new_event_loop():
+    """
+    Create a new libuv based asyncio event loop.
+
+    :rtype:
+        uv.aio.EventLoop
+    """
+    return EventLoop()
+
+
+def install():
+    """
+    Install :class:`uv.aio.EventLoopPolicy` as asyncio's event loop
+    policy, so all event loops created afterwards run on libuv.
+    """
+    asyncio.set_event_loop_policy(EventLoopPolicy())
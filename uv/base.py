@@ -58,27 +58,82 @@ The semantic is archived by the following reference system:
 
 import weakref
 
-from . import error
+from . import error, library
 from .library import ffi, lib
 
 _loops = set()
 
+callback_profiler = None
+"""
+Active callback profiler or `None` (see :mod:`uv.profiler`).
+
+:type: uv.profiler.CallbackProfiler | None
+"""
+
+_callback_names = {
+    'uv_async_cb': 'on_wakeup',
+    'uv_timer_cb': 'on_timeout',
+    'uv_poll_cb': 'on_event',
+    'uv_fs_event_cb': 'on_event',
+    'uv_fs_poll_cb': 'on_change',
+    'uv_udp_recv_cb': 'on_receive',
+    'uv_udp_send_cb': 'on_send',
+    'uv_after_work_cb': 'on_done',
+    'uv_getaddrinfo_cb': 'callback',
+    'uv_getnameinfo_cb': 'callback'
+}
+
+
+def callback_name(callback_type):
+    """
+    Get the name of the user callback attribute corresponding to the
+    given libuv callback type, e.g. `on_read` for `uv_read_cb`.
+
+    :type callback_type:
+        unicode
+    :rtype:
+        unicode
+    """
+    try:
+        return _callback_names[callback_type]
+    except KeyError:
+        return 'on_' + callback_type[3:-3]
 
-@ffi.callback('uv_async_cb')
+
+@library.c_callback('uv_async_cb')
 def base_async_cb(uv_async):
     base_loop = ffi.from_handle(uv_async.data)
     """ :type: BaseLoop """
     base_loop.on_wakeup()
 
 
-@ffi.callback('uv_prepare_cb')
+@library.c_callback('uv_prepare_cb')
 def base_prepare_cb(uv_prepare):
     base_loop = ffi.from_handle(uv_prepare.data)
     """ :type: BaseLoop """
     base_loop.on_prepare()
 
 
-@ffi.callback('uv_walk_cb')
+@library.c_callback('uv_check_cb')
+def base_check_cb(uv_check):
+    base_loop = ffi.from_handle(uv_check.data)
+    """ :type: BaseLoop """
+    base_loop.on_check()
+
+
+@library.c_callback('uv_idle_cb')
+def base_idle_cb(uv_idle):
+    pass
+
+
+@library.c_callback('uv_timer_cb')
+def base_timer_cb(uv_timer):
+    base_loop = ffi.from_handle(uv_timer.data)
+    """ :type: BaseLoop """
+    base_loop.on_timer()
+
+
+@library.c_callback('uv_walk_cb')
 def base_walk_close_cb(uv_handle, _):
     if not lib.uv_is_closing(uv_handle):
         lib.uv_close(uv_handle, ffi.NULL)
@@ -126,15 +181,30 @@ class BaseLoop(object):
         self.handles = set()
         self.requests = set()
 
+        self.handle_index = {}
+
         self.handles_to_close = set()
         self.requests_to_cancel = set()
 
+        self.request_pools = {}
+        self.request_pool_size = 128
+
         self.closed = False
 
+        self.metrics = None
+
+        self.check_callbacks = []
+
         self.internal_uv_async = ffi.new('uv_async_t*')
         self.internal_uv_async.data = self.c_reference
         self.internal_uv_prepare = ffi.new('uv_prepare_t*')
         self.internal_uv_prepare.data = self.c_reference
+        self.internal_uv_timer = ffi.new('uv_timer_t*')
+        self.internal_uv_timer.data = self.c_reference
+        self.internal_uv_check = ffi.new('uv_check_t*')
+        self.internal_uv_check.data = self.c_reference
+        self.internal_uv_idle = ffi.new('uv_idle_t*')
+        self.internal_uv_idle.data = self.c_reference
 
         if not default:
             code = lib.uv_loop_init(self.uv_loop)
@@ -144,6 +214,9 @@ class BaseLoop(object):
 
         self._init_internal_async()
         self._init_internal_prepare()
+        self._init_internal_timer()
+        self._init_internal_check()
+        self._init_internal_idle()
 
         _loops.add(self)
 
@@ -178,6 +251,56 @@ class BaseLoop(object):
         if not lib.uv_is_closing(uv_handle):
             lib.uv_close(uv_handle, ffi.NULL)
 
+    def _init_internal_timer(self):
+        """
+        Initialize the internal timer handle. The timer is referenced
+        while it is started, so scheduled calls keep the loop alive.
+        """
+        lib.uv_timer_init(self.uv_loop, self.internal_uv_timer)
+
+    def _close_internal_timer(self):
+        """
+        Close the internal timer handle.
+        """
+        uv_handle = ffi.cast('uv_handle_t*', self.internal_uv_timer)
+        if not lib.uv_is_closing(uv_handle):
+            lib.uv_close(uv_handle, ffi.NULL)
+
+    def _init_internal_check(self):
+        """
+        Initialize the internal check handle. The check handle is only
+        started while metrics are collected or check callbacks are
+        scheduled.
+        """
+        lib.uv_check_init(self.uv_loop, self.internal_uv_check)
+        lib.uv_unref(ffi.cast('uv_handle_t*', self.internal_uv_check))
+        if self.metrics is not None or self.check_callbacks:
+            lib.uv_check_start(self.internal_uv_check, base_check_cb)
+
+    def _close_internal_check(self):
+        """
+        Close the internal check handle.
+        """
+        uv_handle = ffi.cast('uv_handle_t*', self.internal_uv_check)
+        if not lib.uv_is_closing(uv_handle):
+            lib.uv_close(uv_handle, ffi.NULL)
+
+    def _init_internal_idle(self):
+        """
+        Initialize the internal idle handle. The idle handle is started
+        while check callbacks which should run without blocking for IO
+        are scheduled, it keeps the loop alive in the meantime.
+        """
+        lib.uv_idle_init(self.uv_loop, self.internal_uv_idle)
+
+    def _close_internal_idle(self):
+        """
+        Close the internal idle handle.
+        """
+        uv_handle = ffi.cast('uv_handle_t*', self.internal_uv_idle)
+        if not lib.uv_is_closing(uv_handle):
+            lib.uv_close(uv_handle, ffi.NULL)
+
     def _destroy(self, _):
         """
         This method is invoked by the garbage collection after the user
@@ -220,6 +343,10 @@ class BaseLoop(object):
             Handle
         """
         self.handles.add(base_handle)
+        try:
+            self.handle_index[base_handle.handle_class].add(base_handle)
+        except KeyError:
+            self.handle_index[base_handle.handle_class] = {base_handle}
 
     def attach_request(self, base_request):
         """
@@ -238,6 +365,11 @@ class BaseLoop(object):
             self.handles_to_close.remove(base_handle)
         except KeyError:
             pass
+        index = self.handle_index.get(base_handle.handle_class)
+        if index is not None:
+            index.discard(base_handle)
+            if not index:
+                del self.handle_index[base_handle.handle_class]
 
     def detach_request(self, base_request):
         """
@@ -250,6 +382,107 @@ class BaseLoop(object):
         except KeyError:
             pass
 
+    def acquire_pool(self, request_type):
+        """
+        :type request_type:
+            unicode
+        :rtype:
+            RequestPool
+        """
+        try:
+            return self.request_pools[request_type]
+        except KeyError:
+            pool = self.request_pools[request_type] = RequestPool()
+            return pool
+
+    def release_request(self, base_request):
+        """
+        Put a finished request onto the free list of its type.
+
+        :type base_request:
+            BaseRequest
+        :return:
+            `False` if the free list is full or the loop is closed
+        :rtype:
+            bool
+        """
+        pool = self.acquire_pool(base_request.request_type)
+        if self.closed or len(pool.requests) >= self.request_pool_size:
+            pool.dropped += 1
+            return False
+        pool.recycled += 1
+        pool.requests.append(base_request)
+        return True
+
+    def trim_request_pools(self):
+        """
+        Shrink the free lists to the maximal pool size.
+        """
+        for pool in self.request_pools.values():
+            while len(pool.requests) > self.request_pool_size:
+                pool.requests.pop().c_reference = None
+                pool.dropped += 1
+
+    def start_internal_timer(self, timeout):
+        """
+        (Re)start the internal timer used for scheduled calls.
+
+        :param timeout:
+            timeout in milliseconds
+
+        :type timeout:
+            int
+        """
+        lib.uv_timer_start(self.internal_uv_timer, base_timer_cb, timeout, 0)
+
+    def stop_internal_timer(self):
+        """
+        Stop the internal timer used for scheduled calls.
+        """
+        lib.uv_timer_stop(self.internal_uv_timer)
+
+    def start_metrics(self, metrics):
+        """
+        Start collecting metrics with the given collector.
+
+        :type metrics:
+            uv.loop.LoopMetrics
+        """
+        self.metrics = metrics
+        lib.uv_check_start(self.internal_uv_check, base_check_cb)
+
+    def stop_metrics(self):
+        """
+        Stop collecting metrics.
+        """
+        self.metrics = None
+        if not self.check_callbacks:
+            lib.uv_check_stop(self.internal_uv_check)
+
+    def schedule_check(self, callback, nowait=False):
+        """
+        Run the callback once in the check phase of the current or next
+        loop iteration, i.e. right after polling for IO.
+
+        :param callback:
+            callback which should run
+        :param nowait:
+            do not block for IO until the callback has run and keep the
+            loop alive in the meantime
+
+        :type callback:
+            () -> None
+        :type nowait:
+            bool
+        """
+        if self.closed:
+            return
+        if not self.check_callbacks:
+            lib.uv_check_start(self.internal_uv_check, base_check_cb)
+        if nowait:
+            lib.uv_idle_start(self.internal_uv_idle, base_idle_cb)
+        self.check_callbacks.append(callback)
+
     def wakeup(self):
         """
         Wakeup the event loop from polling. This method is thread-safe.
@@ -276,6 +509,9 @@ class BaseLoop(object):
 
         self._close_internal_async()
         self._close_internal_prepare()
+        self._close_internal_timer()
+        self._close_internal_check()
+        self._close_internal_idle()
         for handle in self.handles_to_close:
             handle.close()
         for request in self.requests_to_cancel:
@@ -287,9 +523,17 @@ class BaseLoop(object):
         if code != error.StatusCodes.SUCCESS:
             self._init_internal_async()
             self._init_internal_prepare()
+            self._init_internal_timer()
+            self._init_internal_check()
+            self._init_internal_idle()
         else:
             _loops.remove(self)
             self.closed = True
+            del self.check_callbacks[:]
+            for pool in self.request_pools.values():
+                for base_request in pool.requests:
+                    base_request.c_reference = None
+                del pool.requests[:]
         return code
 
     def on_prepare(self):
@@ -310,6 +554,27 @@ class BaseLoop(object):
                 base_request.cancel()  # pragma: no cover
         except KeyError:
             pass
+        if self.metrics is not None:
+            self.metrics.on_prepare()
+
+    def on_check(self):
+        """
+        Internal check handle callback.
+        """
+        if self.metrics is not None:
+            self.metrics.on_check()
+        if self.check_callbacks:
+            callbacks, self.check_callbacks = self.check_callbacks, []
+            lib.uv_idle_stop(self.internal_uv_idle)
+            if self.metrics is None:
+                lib.uv_check_stop(self.internal_uv_check)
+            for callback in callbacks:
+                try:
+                    callback()
+                except:
+                    user_loop = self.user_loop
+                    if user_loop is not None:
+                        user_loop.handle_exception()
 
     def on_wakeup(self):
         """
@@ -318,10 +583,31 @@ class BaseLoop(object):
         user_loop = self.user_loop
         """ :type: uv.Loop """
         if user_loop is not None:
-            user_loop.on_wakeup()
+            metrics = self.metrics
+            if metrics is None:
+                user_loop.on_wakeup()
+            else:
+                start = lib.uv_hrtime()
+                user_loop.on_wakeup()
+                metrics.on_callback('Loop.call_later', lib.uv_hrtime() - start)
 
+    def on_timer(self):
+        """
+        Internal timer handle callback.
+        """
+        user_loop = self.user_loop
+        """ :type: uv.Loop """
+        if user_loop is not None:
+            metrics = self.metrics
+            if metrics is None:
+                user_loop.scheduler.on_timer()
+            else:
+                start = lib.uv_hrtime()
+                user_loop.scheduler.on_timer()
+                metrics.on_callback('Loop.call_at', lib.uv_hrtime() - start)
 
-@ffi.callback('uv_close_cb')
+
+@library.c_callback('uv_close_cb')
 def uv_close_cb(uv_handle):
     base_handle = ffi.from_handle(uv_handle.data)
     """ :type: Handle """
@@ -341,8 +627,8 @@ class BaseHandle(object):
     This class implements an internal low level handle.
     """
 
-    __slots__ = ['c_reference', 'weak_user_handle', 'base_loop', 'uv_object',
-                 'uv_handle', 'closed', 'closing']
+    __slots__ = ['c_reference', 'weak_user_handle', 'handle_class', 'base_loop',
+                 'uv_object', 'uv_handle', 'closed', 'closing']
 
     @staticmethod
     def detach(uv_handle):
@@ -374,6 +660,7 @@ class BaseHandle(object):
         self.c_reference = ffi.new_handle(self)
 
         self.weak_user_handle = weakref.ref(user_handle, self._destroy)
+        self.handle_class = type(user_handle)
         self.base_loop = base_loop
 
         self.uv_object = ffi.new(handle_type)
@@ -430,6 +717,27 @@ class BaseHandle(object):
             lib.uv_close(self.uv_handle, uv_close_cb)
 
 
+def record_callback(metrics, cls, name, duration):
+    """
+    Record the duration of a user callback with the loop's metrics
+    collector and the active callback profiler.
+
+    :type metrics:
+        uv.loop.LoopMetrics | None
+    :type cls:
+        type
+    :type name:
+        unicode
+    :type duration:
+        int
+    """
+    if metrics is not None:
+        metrics.on_callback(cls.__name__, duration)
+    profiler = callback_profiler
+    if profiler is not None:
+        profiler.record(cls, name, duration)
+
+
 def handle_callback(callback_type):
     """
     Decorator for handle callbacks.
@@ -437,28 +745,99 @@ def handle_callback(callback_type):
     :type callback_type:
         unicode
     """
+    name = callback_name(callback_type)
+
     def decorator(callback):
         def wrapper(uv_handle, *arguments):
             user_handle = BaseHandle.detach(uv_handle)
             if user_handle:
+                metrics = user_handle.base_handle.base_loop.metrics
+                if metrics is None and callback_profiler is None:
+                    try:
+                        callback(user_handle, *arguments)
+                    except:
+                        user_handle.loop.handle_exception()
+                    return
+                start = lib.uv_hrtime()
                 try:
                     callback(user_handle, *arguments)
                 except:
                     user_handle.loop.handle_exception()
-        return ffi.callback(callback_type, wrapper)
+                record_callback(metrics, user_handle.__class__, name,
+                                lib.uv_hrtime() - start)
+        return library.c_callback(callback_type, callback.__name__)(wrapper)
     return decorator
 
 
+def _no_user_request():
+    return None
+
+
+class RequestPool(object):
+    """
+    Free list of finished low level requests of one request type.
+    """
+
+    __slots__ = ['requests', 'hits', 'misses', 'recycled', 'dropped']
+
+    def __init__(self):
+        self.requests = []
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+        self.dropped = 0
+
+
 class BaseRequest(object):
     """
     This class implements an internal low level request.
+
+    Requests of types which are submitted at high rates (e.g. writes)
+    are pooled: after the callback has returned the request together
+    with its C structure and its CFFI handle is put back onto a free
+    list of the base loop and reused by the next request of the same
+    type instead of allocating new ones.
     """
 
     __slots__ = ['c_reference', 'weak_user_request', 'base_loop', 'uv_object',
-                 'uv_request', 'finished', 'canceled']
+                 'uv_request', 'request_type', 'pooled', 'finished', 'canceled']
+
+    @classmethod
+    def create(cls, user_request, base_loop, request_type, request_init, arguments,
+               uv_handle=None, pooled=False):
+        """
+        Create a new low level request or reuse one from the base loop's
+        free list of the request type if pooling is requested.
+
+        :type user_request:
+            uv.UVRequest
+        :type base_loop:
+            Loop
+        :type request_type:
+            unicode
+        :type request_init:
+            callable
+        :type arguments:
+            tuple
+        :type pooled:
+            bool
+
+        :rtype:
+            BaseRequest
+        """
+        if pooled:
+            pool = base_loop.acquire_pool(request_type)
+            if pool.requests:
+                pool.hits += 1
+                base_request = pool.requests.pop()
+                base_request.start(user_request, request_init, arguments, uv_handle)
+                return base_request
+            pool.misses += 1
+        return cls(user_request, base_loop, request_type, request_init, arguments,
+                   uv_handle, pooled)
 
     def __init__(self, user_request, base_loop, request_type, request_init,
-                 arguments, uv_handle=None):
+                 arguments, uv_handle=None, pooled=False):
         """
         :type user_request:
             uv.UVRequest
@@ -470,18 +849,36 @@ class BaseRequest(object):
             callable
         :type arguments:
             tuple
+        :type pooled:
+            bool
         """
         self.c_reference = ffi.new_handle(self)
 
-        self.weak_user_request = weakref.ref(user_request, self._destroy)
         self.base_loop = base_loop
+        self.request_type = request_type
+        self.pooled = pooled
 
         self.uv_object = ffi.new(request_type)
-        self.uv_object.data = self.c_reference
         self.uv_request = ffi.cast('uv_req_t*', self.uv_object)
 
+        self.start(user_request, request_init, arguments, uv_handle)
+
+    def start(self, user_request, request_init, arguments, uv_handle=None):
+        """
+        Bind the low level request to the user request and submit it.
+
+        :type user_request:
+            uv.UVRequest
+        :type request_init:
+            callable
+        :type arguments:
+            tuple
+        """
+        self.weak_user_request = weakref.ref(user_request, self._destroy)
+        self.uv_object.data = self.c_reference
+
         if uv_handle is None:
-            code = request_init(base_loop.uv_loop, self.uv_object, *arguments)
+            code = request_init(self.base_loop.uv_loop, self.uv_object, *arguments)
         else:
             code = request_init(self.uv_object, uv_handle, *arguments)
 
@@ -522,9 +919,21 @@ class BaseRequest(object):
         """
         self.uv_object.data = ffi.NULL
         self.finished = True
-        self.c_reference = None
+        if not self.pooled:
+            self.c_reference = None
         self.base_loop.detach_request(self)
 
+    def recycle(self):
+        """
+        Put the finished request back onto the base loop's free list of
+        its request type. This method is called from within the request
+        callback right before the user callback.
+        """
+        # dropping the weak reference prevents its finalizer from running
+        self.weak_user_request = _no_user_request
+        if not self.base_loop.release_request(self):
+            self.c_reference = None
+
     def cancel(self):
         """
         Cancel the request if it has not been canceled or has finished.
@@ -543,6 +952,8 @@ def request_callback(callback_type):
     :type callback_type:
         unicode
     """
+    name = callback_name(callback_type)
+
     def decorator(callback):
         def wrapper(uv_request, *arguments):
             base_request = ffi.from_handle(uv_request.data)
@@ -551,11 +962,27 @@ def request_callback(callback_type):
             user_request = base_request.user_request
             if user_request:
                 user_request.clear_pending()
-                try:
-                    callback(user_request, *arguments)
-                except Exception:
-                    user_request.loop.handle_exception()
-        return ffi.callback(callback_type, wrapper)
+                if base_request.pooled:
+                    # libuv does not touch the structure once the callback runs
+                    # so requests issued by the callback may already reuse it
+                    base_request.recycle()
+                metrics = base_request.base_loop.metrics
+                if metrics is None and callback_profiler is None:
+                    try:
+                        callback(user_request, *arguments)
+                    except Exception:
+                        user_request.loop.handle_exception()
+                else:
+                    start = lib.uv_hrtime()
+                    try:
+                        callback(user_request, *arguments)
+                    except Exception:
+                        user_request.loop.handle_exception()
+                    record_callback(metrics, user_request.__class__, name,
+                                    lib.uv_hrtime() - start)
+            elif base_request.pooled:
+                base_request.c_reference = None
+        return library.c_callback(callback_type, callback.__name__)(wrapper)
     return decorator
 
 
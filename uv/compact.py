@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Compact representation of TCP connections for servers which hold huge
+numbers of mostly idle connections, e.g. websocket gateways.
+
+Every :class:`uv.TCP` connection carries a stream object with many
+attributes, a low level handle with a CFFI handle and a weak reference
+and two entries in sets of the loop. A :class:`CompactConnection` only
+consists of a small object with a few slots and the `uv_tcp_t` structure.
+All connections of a :class:`CompactServer` share the server's callbacks
+and are found in C callbacks by the address of their structure instead
+of a CFFI handle stored in the structure's data field.
+
+Compact connections are not part of :attr:`uv.Loop.handles` and do not
+participate in metrics and profiling of callbacks. The server has to be
+closed before its loop is closed.
+"""
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+from . import common, dns, error, library
+from .library import ffi, lib
+from .handles import tcp
+
+
+_connections = {}
+"""
+Compact connections by the address of their `uv_tcp_t` structure.
+
+:type: dict[int, uv.compact.CompactConnection]
+"""
+
+_writes = {}
+"""
+Pending write requests by the address of their `uv_write_t` structure.
+
+:type: dict[int, (uv.compact.CompactConnection, ffi.CData, ffi.CData)]
+"""
+
+
+def _address(c_object):
+    return int(ffi.cast('uintptr_t', c_object))
+
+
+@library.c_callback('uv_alloc_cb')
+def compact_alloc_cb(uv_handle, suggested_size, uv_buffer):
+    connection = _connections.get(_address(uv_handle))
+    if connection is None:  # pragma: no cover
+        library.uv_buffer_set(uv_buffer, ffi.NULL, 0)
+        return
+    try:
+        connection.server.loop.allocator.allocate(connection, suggested_size,
+                                                  uv_buffer)
+    except Exception:  # pragma: no cover
+        library.uv_buffer_set(uv_buffer, ffi.NULL, 0)
+
+
+@library.c_callback('uv_read_cb')
+def compact_read_cb(uv_stream, length, uv_buffer):
+    connection = _connections.get(_address(uv_stream))
+    if connection is None:  # pragma: no cover
+        return
+    server = connection.server
+    try:
+        data = server.loop.allocator.finalize(connection, length, uv_buffer)
+        if length < 0:
+            server.on_read(connection, error.StatusCodes.get(length), b'')
+        else:
+            server.on_read(connection, error.StatusCodes.SUCCESS, data)
+    except:
+        server.loop.handle_exception()
+
+
+@library.c_callback('uv_write_cb')
+def compact_write_cb(uv_write, status):
+    connection, _, _ = _writes.pop(_address(uv_write))
+    if status != error.StatusCodes.SUCCESS:
+        connection.close()
+
+
+@library.c_callback('uv_close_cb')
+def compact_close_cb(uv_handle):
+    connection = _connections.pop(_address(uv_handle), None)
+    if connection is None:  # pragma: no cover
+        return
+    server = connection.server
+    server.connections -= 1
+    try:
+        server.on_closed(connection)
+    except:
+        server.loop.handle_exception()
+
+
+class CompactConnection(object):
+    """
+    Compact TCP connection accepted by a :class:`CompactServer`.
+
+    .. warning::
+        Connections must only be created by the server.
+
+    :param server:
+        server the connection belongs to
+    :param uv_tcp:
+        initialized libuv TCP structure
+
+    :type server:
+        uv.compact.CompactServer
+    :type uv_tcp:
+        ffi.CData[uv_tcp_t*]
+    """
+
+    __slots__ = ['__weakref__', 'server', 'uv_tcp', 'uv_stream', 'data']
+
+    def __init__(self, server, uv_tcp):
+        self.server = server
+        """
+        Server the connection belongs to.
+
+        :readonly:
+            True
+        :type:
+            uv.compact.CompactServer
+        """
+        self.uv_tcp = uv_tcp
+        self.uv_stream = ffi.cast('uv_stream_t*', uv_tcp)
+        self.data = None
+        """
+        User-specific data of any type, e.g. the session of the peer.
+
+        :readonly:
+            False
+        :type:
+            Any
+        """
+
+    @property
+    def closing(self):
+        """
+        Connection is closed or being closed.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        return bool(lib.uv_is_closing(ffi.cast('uv_handle_t*', self.uv_tcp)))
+
+    @property
+    def peername(self):
+        """
+        The address of the peer connected to the connection.
+
+        :raises uv.UVError:
+            error while receiving peername
+        :raises uv.ClosedHandleError:
+            connection has already been closed or is closing
+
+        :readonly:
+            True
+        :rtype:
+            uv.Address4 | uv.Address6
+        """
+        if self.closing:
+            raise error.ClosedHandleError()
+        c_storage = ffi.new('struct sockaddr_storage*')
+        c_sockaddr = ffi.cast('struct sockaddr*', c_storage)
+        c_size = ffi.new('int*', ffi.sizeof('struct sockaddr_storage'))
+        code = lib.uv_tcp_getpeername(self.uv_tcp, c_sockaddr, c_size)
+        if code != error.StatusCodes.SUCCESS:
+            raise error.UVError(code)
+        return dns.unpack_sockaddr(c_sockaddr)
+
+    def write(self, data):
+        """
+        Write data to the connection. The data is written immediately if
+        the socket's send buffer has enough space, otherwise a write
+        request is queued. Failed write requests close the connection.
+
+        :raises uv.UVError:
+            error while writing data
+        :raises uv.ClosedHandleError:
+            connection has already been closed or is closing
+
+        :param data:
+            data which should be written
+
+        :type data:
+            bytes | bytearray | memoryview
+        """
+        if self.closing:
+            raise error.ClosedHandleError()
+        uv_stream = self.uv_stream
+        uv_buffers = library.make_uv_buffers(data)
+        written = lib.uv_try_write(uv_stream, uv_buffers, 1)
+        if written == library.uv_buffers_size(uv_buffers):
+            return
+        if written == error.StatusCodes.EAGAIN:
+            written = 0
+        elif written < 0:
+            raise error.UVError(written)
+        if written:
+            uv_buffers = library.advance_uv_buffers(uv_buffers, written)
+        uv_write = ffi.new('uv_write_t*')
+        code = lib.uv_write(uv_write, uv_stream, uv_buffers, 1, compact_write_cb)
+        if code != error.StatusCodes.SUCCESS:
+            raise error.UVError(code)
+        _writes[_address(uv_write)] = self, uv_write, uv_buffers
+
+    def close(self):
+        """
+        Close the connection. The server's `on_closed` callback runs
+        after the connection has been closed.
+        """
+        uv_handle = ffi.cast('uv_handle_t*', self.uv_tcp)
+        if not lib.uv_is_closing(uv_handle):
+            lib.uv_close(uv_handle, compact_close_cb)
+
+
+class CompactServer(object):
+    """
+    TCP server which keeps its connections in compact form. Accepted
+    connections start reading immediately and share the callbacks of
+    the server.
+
+    :raises uv.UVError:
+        error while initializing the listening handle
+
+    :param loop:
+        event loop the server should run on
+    :param on_read:
+        callback which should be called when data has been read from
+        one of the connections
+    :param on_connection:
+        callback which should run after a connection has been accepted
+    :param on_closed:
+        callback which should run after a connection has been closed
+    :param on_error:
+        callback which should run if accepting a connection failed
+
+    :type loop:
+        uv.Loop
+    :type on_read:
+        ((uv.compact.CompactConnection, uv.StatusCodes, bytes) -> None)
+    :type on_connection:
+        ((uv.compact.CompactConnection) -> None)
+    :type on_closed:
+        ((uv.compact.CompactConnection) -> None)
+    :type on_error:
+        ((uv.compact.CompactServer, uv.StatusCodes) -> None)
+    """
+
+    def __init__(self, loop=None, on_read=None, on_connection=None, on_closed=None,
+                 on_error=None):
+        self.listener = tcp.TCP(loop, on_connection=self._on_connection)
+        self.loop = self.listener.loop
+        self.on_read = on_read or self._close_on_error
+        """
+        Callback which should be called when data has been read from one
+        of the connections. The default callback closes connections on
+        end of file and errors and ignores data.
+
+
+        .. function:: on_read(connection, status, data)
+
+            :param connection:
+                connection the data has been read from
+            :param status:
+                status of the connection (indicate any errors)
+            :param data:
+                data which has been read
+
+            :type connection:
+                uv.compact.CompactConnection
+            :type status:
+                uv.StatusCodes
+            :type data:
+                bytes | Any
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.compact.CompactConnection, uv.StatusCodes, bytes) -> None)
+        """
+        self.on_connection = on_connection or common.dummy_callback
+        """
+        Callback which should run after a connection has been accepted.
+
+        :readonly:
+            False
+        :type:
+            ((uv.compact.CompactConnection) -> None)
+        """
+        self.on_closed = on_closed or common.dummy_callback
+        """
+        Callback which should run after a connection has been closed.
+
+        :readonly:
+            False
+        :type:
+            ((uv.compact.CompactConnection) -> None)
+        """
+        self.on_error = on_error or common.dummy_callback
+        """
+        Callback which should run if accepting a connection failed, e.g.
+        because the process ran out of file descriptors. The server
+        keeps listening.
+
+
+        .. function:: on_error(server, status)
+
+            :param server:
+                server the call originates from
+            :param status:
+                status of the failed accept
+
+            :type server:
+                uv.compact.CompactServer
+            :type status:
+                uv.StatusCodes
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.compact.CompactServer, uv.StatusCodes) -> None)
+        """
+        self.connections = 0
+        """
+        Number of connections which have not been closed yet.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+
+    @staticmethod
+    def _close_on_error(connection, status, data):
+        if status != error.StatusCodes.SUCCESS:
+            connection.close()
+
+    def bind(self, address, flags=0):
+        """
+        Bind the server to an address.
+
+        :raises uv.UVError:
+            error while binding to the address
+
+        :type address:
+            tuple | uv.Address4 | uv.Address6
+        :type flags:
+            int
+        """
+        self.listener.bind(address, flags)
+
+    def listen(self, backlog=128):
+        """
+        Start listening for incoming connections.
+
+        :raises uv.UVError:
+            error while start listening
+
+        :type backlog:
+            int
+        """
+        self.listener.listen(backlog=backlog)
+
+    @property
+    def sockname(self):
+        """
+        Address the server is bound to.
+
+        :readonly:
+            True
+        :rtype:
+            uv.Address4 | uv.Address6
+        """
+        return self.listener.sockname
+
+    def _on_connection(self, listener, status):
+        if status != error.StatusCodes.SUCCESS:
+            self.on_error(self, status)
+            return
+        uv_tcp = ffi.new('uv_tcp_t*')
+        code = lib.uv_tcp_init(self.loop.base_loop.uv_loop, uv_tcp)
+        if code != error.StatusCodes.SUCCESS:
+            self.on_error(self, error.StatusCodes.get(code))
+            return
+        connection = CompactConnection(self, uv_tcp)
+        # registered before accepting so that the close callback finds it
+        _connections[_address(uv_tcp)] = connection
+        self.connections += 1
+        uv_stream = connection.uv_stream
+        code = lib.uv_accept(listener.uv_stream, uv_stream)
+        if code == error.StatusCodes.SUCCESS:
+            code = lib.uv_read_start(uv_stream, compact_alloc_cb, compact_read_cb)
+        if code != error.StatusCodes.SUCCESS:
+            # transient errors like EMFILE must not stop the server
+            connection.close()
+            self.on_error(self, error.StatusCodes.get(code))
+            return
+        self.on_connection(connection)
+
+    def close_connections(self):
+        """
+        Close all connections of the server.
+        """
+        for connection in list(_connections.values()):
+            if connection.server is self:
+                connection.close()
+
+    def close(self):
+        """
+        Stop listening and close all connections of the server.
+        """
+        self.listener.close()
+        self.close_connections()
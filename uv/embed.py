@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Adapters to embed a loop into foreign event loops.
+
+On kqueue, epoll and event ports libuv exposes a backend file descriptor
+which becomes readable whenever there are IO events to process, together
+with the time until the next timer expires. The adapters watch this file
+descriptor with the foreign event loop and run exactly one non-blocking
+iteration of the loop whenever it becomes readable or the timeout has
+expired. Between those iterations no CPU time is spent on the loop.
+
+libuv only registers new IO watchers with the backend while it runs an
+iteration. Whenever handles are started or stopped from outside of the
+loop's callbacks, e.g. from callbacks of the foreign event loop, call
+:func:`SelectorAdapter.process` or :func:`AsyncioAdapter.process` to let
+the loop pick up the changes and to update the timeout.
+"""
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+try:
+    from selectors import DefaultSelector, EVENT_READ
+except ImportError:  # pragma: no cover
+    # Python 2, a compatible selector (e.g. selectors34) has to be passed
+    DefaultSelector, EVENT_READ = None, 1
+
+from .loop import Loop, RunModes
+
+
+def backend_timeout(loop):
+    """
+    Get the time in seconds until the loop has to run its next iteration
+    or `None` if it only has to run when its backend file descriptor
+    becomes readable.
+
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        float | None
+    """
+    if not loop.alive:
+        return None
+    # the timeout is relative to the cached time of the last iteration
+    loop.update_time()
+    timeout = loop.get_timeout()
+    return None if timeout < 0 else timeout / 1000
+
+
+class SelectorAdapter(object):
+    """
+    Adapter to embed a loop into an application which is driven by a
+    :mod:`selectors` selector. The application passes :func:`timeout`
+    to `select` and calls :func:`process` if the selector reports the
+    adapter (the `data` of the key) as ready or the timeout expired.
+
+    :raises uv.UVError:
+        backend file descriptor is not supported on this platform
+
+    :param loop:
+        event loop which should be embedded
+    :param selector:
+        selector of the application (defaults to a new selector)
+
+    :type loop:
+        uv.Loop
+    :type selector:
+        selectors.BaseSelector
+    """
+
+    def __init__(self, loop=None, selector=None):
+        self.loop = loop or Loop.get_current()
+        self.selector = selector or DefaultSelector()
+        self.fd = self.loop.fileno()
+        self.selector.register(self.fd, EVENT_READ, self)
+
+    def timeout(self):
+        """
+        Get the timeout which should be passed to `select`.
+
+        :rtype:
+            float | None
+        """
+        return backend_timeout(self.loop)
+
+    def process(self):
+        """
+        Run one non-blocking iteration of the loop.
+
+        :return:
+            loop is still alive
+        :rtype:
+            bool
+        """
+        return self.loop.run(RunModes.NOWAIT)
+
+    def run(self):
+        """
+        Drive the selector until the loop is no longer alive. Keys of
+        other file objects registered by the application are ignored.
+        """
+        self.process()
+        while self.loop.alive:
+            self.selector.select(self.timeout())
+            self.process()
+
+    def close(self):
+        """
+        Unregister the backend file descriptor from the selector.
+        """
+        self.selector.unregister(self.fd)
+
+
+class AsyncioAdapter(object):
+    """
+    Adapter to embed a loop into an :mod:`asyncio` event loop. The
+    backend file descriptor is watched with `add_reader` and the timeout
+    is honoured with `call_later`.
+
+    :raises uv.UVError:
+        backend file descriptor is not supported on this platform
+
+    :param loop:
+        event loop which should be embedded
+    :param aio_loop:
+        asyncio event loop the loop should be embedded into
+
+    :type loop:
+        uv.Loop
+    :type aio_loop:
+        asyncio.AbstractEventLoop
+    """
+
+    def __init__(self, loop=None, aio_loop=None):
+        import asyncio
+        self.loop = loop or Loop.get_current()
+        self.aio_loop = aio_loop or asyncio.get_event_loop()
+        self.fd = self.loop.fileno()
+        self.timer_handle = None
+        self.aio_loop.add_reader(self.fd, self.process)
+        self.aio_loop.call_soon(self.process)
+
+    def process(self):
+        """
+        Run one non-blocking iteration of the loop and reschedule the
+        timeout.
+
+        :return:
+            loop is still alive
+        :rtype:
+            bool
+        """
+        if self.timer_handle is not None:
+            self.timer_handle.cancel()
+            self.timer_handle = None
+        if self.loop.closed:
+            return False
+        alive = self.loop.run(RunModes.NOWAIT)
+        timeout = backend_timeout(self.loop)
+        if timeout is not None:
+            self.timer_handle = self.aio_loop.call_later(timeout, self.process)
+        return alive
+
+    def close(self):
+        """
+        Stop watching the backend file descriptor.
+        """
+        if self.timer_handle is not None:
+            self.timer_handle.cancel()
+            self.timer_handle = None
+        self.aio_loop.remove_reader(self.fd)
@@ -141,7 +141,7 @@ def post_stat(request):
     return [status, request.stat]
 
 
-@ffi.callback('uv_fs_cb')
+@library.c_callback('uv_fs_cb')
 def fs_callback(uv_request):
     fs_request = library.detach(uv_request)
     """ :type: uv.FSRequest """
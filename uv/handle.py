@@ -15,7 +15,9 @@
 
 from __future__ import print_function, unicode_literals, division, absolute_import
 
+import importlib
 import warnings
+import weakref
 
 from . import abstract, base, common, error, library
 from .library import ffi, lib
@@ -55,11 +57,48 @@ class HandleTypes(common.Enumeration):
         the corresponding enumeration object. Allows the usage of
         enumeration fields as class decorators.
         """
-        self.cls = cls
+        _handle_classes[self] = cls
         return cls
 
+    @property
+    def cls(self):
+        """
+        Class which implements the handle type. Handle modules are
+        loaded lazily, so the module of the class is imported if it
+        has not been imported yet.
 
-@ffi.callback('uv_alloc_cb')
+        :readonly:
+            True
+        :type:
+            type
+        """
+        if self not in _handle_classes and self in _handle_modules:
+            importlib.import_module(_handle_modules[self], __package__)
+        return _handle_classes.get(self, UVHandle)
+
+
+_handle_classes = {}
+
+_handle_modules = {
+    HandleTypes.ASYNC: '.handles.async',
+    HandleTypes.CHECK: '.handles.check',
+    HandleTypes.IDLE: '.handles.idle',
+    HandleTypes.PIPE: '.handles.pipe',
+    HandleTypes.POLL: '.handles.poll',
+    HandleTypes.PREPARE: '.handles.prepare',
+    HandleTypes.PROCESS: '.handles.process',
+    HandleTypes.SIGNAL: '.handles.signal',
+    HandleTypes.STREAM: '.handles.stream',
+    HandleTypes.TCP: '.handles.tcp',
+    HandleTypes.TIMER: '.handles.timer',
+    HandleTypes.TTY: '.handles.tty',
+    HandleTypes.UDP: '.handles.udp',
+    HandleTypes.FS_EVENT: '.handles.fs_event',
+    HandleTypes.FS_POLL: '.handles.fs_poll'
+}
+
+
+@library.c_callback('uv_alloc_cb')
 def uv_alloc_cb(uv_handle, suggested_size, uv_buf):
     handle = base.BaseHandle.detach(uv_handle)
     """ :type: uv.Handle """
@@ -403,6 +442,135 @@ class UVHandle(object):
         self.loop.structure_clear_pending(self)
 
 
-HandleTypes.cls = UVHandle
+class ReadBudget(object):
+    """
+    Read fairness budget of a stream or UDP handle. Handles which exceed
+    their budget within one loop iteration stop reading until the loop
+    has finished polling for IO.
+
+    .. warning::
+        This class is only for internal purposes and is not part of
+        the official API. Use :func:`uv.UVStream.set_read_budget` or
+        :func:`uv.UDP.set_read_budget` instead.
+
+    :param max_bytes:
+        maximal number of bytes read per loop iteration
+    :param max_callbacks:
+        maximal number of read callbacks per loop iteration
+
+    :type max_bytes:
+        int | None
+    :type max_callbacks:
+        int | None
+    """
+
+    __slots__ = ['max_bytes', 'max_callbacks', 'bytes', 'callbacks', 'throttled']
+
+    def __init__(self, max_bytes=None, max_callbacks=None):
+        self.max_bytes = max_bytes
+        self.max_callbacks = max_callbacks
+        self.bytes = 0
+        self.callbacks = 0
+        self.throttled = False
+
+    @classmethod
+    def create(cls, max_bytes=None, max_callbacks=None):
+        """
+        :rtype:
+            uv.handle.ReadBudget | None
+        """
+        if max_bytes is None and max_callbacks is None:
+            return None
+        return cls(max_bytes, max_callbacks)
+
+
+class ReadThrottler(object):
+    """
+    Accounts the reads of handles with a read budget, pauses handles
+    which exceed their budget and resumes them right after polling for
+    IO so that they read again during the next loop iteration.
+
+    .. warning::
+        This class is only for internal purposes and is not part of
+        the official API. Use :func:`uv.Loop.read_throttle_report` to
+        inspect which handles have been throttled.
+
+    :param base_loop:
+        internal loop of the event loop the handles are running on
+
+    :type base_loop:
+        uv.base.BaseLoop
+    """
+
+    def __init__(self, base_loop):
+        # the internal loop only references the user loop weakly
+        self.base_loop = base_loop
+        self.handles = []
+        self.throttled = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def get(cls, loop):
+        """
+        Get the throttler of the given loop.
+
+        :type loop:
+            uv.Loop
+
+        :rtype:
+            uv.handle.ReadThrottler
+        """
+        if loop.read_throttler is None:
+            loop.read_throttler = cls(loop.base_loop)
+        return loop.read_throttler
+
+    def account(self, handle, length):
+        """
+        Account a read callback of the handle and pause the handle if it
+        has exceeded its budget.
+
+        :type handle:
+            uv.UVStream | uv.UDP
+        :type length:
+            int
+        """
+        budget = handle.read_budget
+        if not budget.callbacks:
+            if not self.handles:
+                self.base_loop.schedule_check(self.on_check)
+            self.handles.append(handle)
+        budget.callbacks += 1
+        if length > 0:
+            budget.bytes += length
+        if budget.throttled or handle.closing:
+            return
+        if ((budget.max_bytes is not None and budget.bytes >= budget.max_bytes) or
+                (budget.max_callbacks is not None and
+                 budget.callbacks >= budget.max_callbacks)):
+            budget.throttled = True
+            handle._pause_reading()
+            self.throttled[handle] = self.throttled.get(handle, 0) + 1
+
+    def on_check(self):
+        handles, self.handles = self.handles, []
+        for handle in handles:
+            budget = handle.read_budget
+            if budget is None:
+                continue
+            budget.bytes = budget.callbacks = 0
+            if budget.throttled:
+                budget.throttled = False
+                if not handle.closing:
+                    handle._resume_reading()
+
+    def report(self, reset=True):
+        """
+        :rtype:
+            dict[uv.Handle, int]
+        """
+        report = dict(self.throttled)
+        if reset:
+            self.throttled.clear()
+        return report
+
 
 abstract.Handle.register(UVHandle)
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Forwarding of data from one stream to another, see
+:func:`uv.UVStream.pipe_to`.
+
+On Linux data is moved with `splice` through an intermediate pipe
+without ever being copied into user space. The sockets are watched with
+poll handles which are shared per file descriptor, this allows to
+forward data in both directions between two streams. On all other
+platforms or if splicing is not possible the data is read into Python
+and written to the destination with backpressure through the write
+buffer limits of the destination.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import errno
+import os
+import socket
+import sys
+
+from .. import common, error
+from . import poll
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+splice_supported = sys.platform.startswith('linux') and hasattr(os, 'splice')
+
+SPLICE_FLAGS = (getattr(os, 'SPLICE_F_MOVE', 0) | getattr(os, 'SPLICE_F_NONBLOCK', 0) |
+                getattr(os, 'SPLICE_F_MORE', 0))
+
+PIPE_CAPACITY = 2**16
+F_GETPIPE_SZ = getattr(fcntl, 'F_GETPIPE_SZ', 1032)
+
+
+def _status(exception):
+    return error.StatusCodes.get(-exception.errno)
+
+
+class Forwarder(object):
+    """
+    Base class of forwarders returned by :func:`uv.UVStream.pipe_to`.
+
+    :param source:
+        stream data is read from
+    :param destination:
+        stream data is written to
+    :param on_done:
+        callback which should run after forwarding has finished
+    :param end:
+        shutdown the destination after the source has reached `EOF`
+
+    :type source:
+        uv.UVStream
+    :type destination:
+        uv.UVStream
+    :type on_done:
+        ((uv.handles.forward.Forwarder, uv.StatusCodes) -> None) | None
+    :type end:
+        bool
+    """
+
+    method = None
+    """
+    Forwarding method, either `splice` or `copy`.
+
+    :readonly:
+        True
+    :type:
+        unicode
+    """
+
+    def __init__(self, source, destination, on_done, end):
+        self.source = source
+        self.destination = destination
+        self.on_done = on_done or common.dummy_callback
+        """
+        Callback which should run after forwarding has finished because
+        the source has reached `EOF` (status `SUCCESS`), an error
+        occurred or forwarding has been stopped (status `ECANCELED`).
+
+
+        .. function:: on_done(forwarder, status)
+
+            :param forwarder:
+                forwarder which has finished
+            :param status:
+                status of the forwarding
+
+            :type forwarder:
+                uv.handles.forward.Forwarder
+            :type status:
+                uv.StatusCodes
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.handles.forward.Forwarder, uv.StatusCodes) -> None)
+        """
+        self.end = end
+        self.bytes = 0
+        """
+        Number of bytes forwarded to the destination.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.done = False
+
+    def finish(self, status):
+        if self.done:
+            return
+        self.done = True
+        self.release()
+        if (status == error.StatusCodes.SUCCESS and self.end and
+                not self.destination.closing):
+            self.shutdown()
+        try:
+            self.on_done(self, status)
+        except:
+            self.source.loop.handle_exception()
+
+    def release(self):
+        raise NotImplementedError()
+
+    def shutdown(self):
+        self.destination.shutdown()
+
+    def stop(self):
+        """
+        Stop forwarding. The callback is called with status
+        :class:`uv.StatusCodes.ECANCELED`.
+        """
+        self.end = False
+        self.finish(error.StatusCodes.ECANCELED)
+
+
+class CopyForwarder(Forwarder):
+    """
+    Portable forwarder which reads the data into Python and writes it to
+    the destination. Reading from the source is paused while the write
+    queue of the destination is above its high watermark.
+    """
+
+    method = 'copy'
+
+    def __init__(self, source, destination, on_done, end, high_watermark):
+        super(CopyForwarder, self).__init__(source, destination, on_done, end)
+        if destination.write_high_watermark is None:
+            destination.set_write_buffer_limits(high_watermark)
+        destination.read_source = source
+        source.start_read(on_read=self.on_read)
+
+    def on_read(self, source, status, data):
+        if status == error.StatusCodes.EOF:
+            self.finish(error.StatusCodes.SUCCESS)
+        elif status != error.StatusCodes.SUCCESS:
+            self.finish(status)
+        elif data:
+            if self.destination.closing:
+                self.finish(error.StatusCodes.ECANCELED)
+                return
+            self.bytes += len(data)
+            self.destination.write(data, on_write=self.on_write)
+
+    def on_write(self, _, status):
+        if status != error.StatusCodes.SUCCESS:
+            self.finish(status)
+
+    def release(self):
+        if self.destination.read_source is self.source:
+            self.destination.read_source = None
+        self.source.stop_read()
+
+
+class SplicePoller(object):
+    """
+    Poll handle shared by all forwarders using the same file descriptor.
+    """
+
+    def __init__(self, loop, fd):
+        # only keep the loop's pollers, the poll handle references the loop
+        self.pollers = loop.splice_pollers
+        self.fd = fd
+        self.poll = poll.Poll(loop, fd, on_event=self.on_event)
+        self.reader = None
+        self.writer = None
+
+    @classmethod
+    def get(cls, loop, fd):
+        """
+        :raises uv.UVError:
+            error while initializing the poll handle
+
+        :rtype:
+            uv.handles.forward.SplicePoller
+        """
+        poller = loop.splice_pollers.get(fd)
+        if poller is None:
+            poller = loop.splice_pollers[fd] = cls(loop, fd)
+        return poller
+
+    def update(self):
+        events = 0
+        if self.reader is not None and self.reader.reading:
+            events |= poll.PollEvent.READABLE
+        if self.writer is not None and self.writer.writing:
+            events |= poll.PollEvent.WRITABLE
+        if events:
+            self.poll.start(events)
+        else:
+            self.poll.stop()
+        if self.reader is None and self.writer is None:
+            self.poll.close()
+            del self.pollers[self.fd]
+
+    def on_event(self, _, status, events):
+        reader, writer = self.reader, self.writer
+        if status != error.StatusCodes.SUCCESS:
+            for forwarder in (reader, writer):
+                if forwarder is not None:
+                    forwarder.finish(status)
+            return
+        if writer is not None and events & poll.PollEvent.WRITABLE:
+            writer.on_writable()
+        if reader is not None and events & poll.PollEvent.READABLE:
+            reader.on_readable()
+
+
+class SpliceForwarder(Forwarder):
+    """
+    Linux forwarder which moves the data from the source socket through
+    a pipe into the destination socket with `splice`. Reading from the
+    source is paused while the pipe is full.
+
+    :raises uv.UVError:
+        file descriptors could not be polled
+    """
+
+    method = 'splice'
+
+    def __init__(self, source, destination, on_done, end):
+        super(SpliceForwarder, self).__init__(source, destination, on_done, end)
+        self.source_fd = source.fileno()
+        self.destination_fd = destination.fileno()
+        loop = source.loop
+        try:
+            self.source_poller = SplicePoller.get(loop, self.source_fd)
+            self.destination_poller = SplicePoller.get(loop, self.destination_fd)
+            if (self.source_poller.reader is not None or
+                    self.destination_poller.writer is not None):
+                raise error.UVError(error.StatusCodes.EBUSY)
+        except error.UVError:
+            # close the pollers which have been created for this forwarder
+            for fd in (self.source_fd, self.destination_fd):
+                poller = loop.splice_pollers.get(fd)
+                if poller is not None and poller.reader is poller.writer is None:
+                    poller.update()
+            raise
+        self.pipe_read, self.pipe_write = os.pipe()
+        for fd in (self.pipe_read, self.pipe_write):
+            os.set_blocking(fd, False)
+        try:
+            self.capacity = fcntl.fcntl(self.pipe_write, F_GETPIPE_SZ)
+        except (AttributeError, IOError, OSError):  # pragma: no cover
+            self.capacity = PIPE_CAPACITY
+        self.buffered = 0
+        self.eof = False
+        self.reading = True
+        self.writing = False
+        self.source_poller.reader = self
+        self.destination_poller.writer = self
+        self.source_poller.update()
+
+    def on_readable(self):
+        try:
+            length = os.splice(self.source_fd, self.pipe_write,
+                               self.capacity - self.buffered, flags=SPLICE_FLAGS)
+        except OSError as exception:
+            if exception.errno != errno.EAGAIN:
+                self.finish(_status(exception))
+            elif self.buffered >= self.capacity:  # pragma: no cover
+                self.reading = False
+                self.source_poller.update()
+            return
+        if length == 0:
+            self.eof = True
+            self.reading = False
+            self.source_poller.update()
+        self.buffered += length
+        self.flush()
+
+    def on_writable(self):
+        self.flush()
+
+    def flush(self):
+        while self.buffered:
+            try:
+                length = os.splice(self.pipe_read, self.destination_fd, self.buffered,
+                                   flags=SPLICE_FLAGS)
+            except OSError as exception:
+                if exception.errno != errno.EAGAIN:
+                    self.finish(_status(exception))
+                    return
+                if not self.writing:
+                    self.writing = True
+                    self.destination_poller.update()
+                if self.reading and self.buffered >= self.capacity:
+                    # the pipe is full, wait for the destination
+                    self.reading = False
+                    self.source_poller.update()
+                return
+            self.buffered -= length
+            self.bytes += length
+        if self.eof:
+            self.finish(error.StatusCodes.SUCCESS)
+            return
+        if self.writing:
+            self.writing = False
+            self.destination_poller.update()
+        if not self.reading:
+            self.reading = True
+            self.source_poller.update()
+
+    def release(self):
+        self.reading = self.writing = False
+        self.source_poller.reader = None
+        self.source_poller.update()
+        self.destination_poller.writer = None
+        self.destination_poller.update()
+        os.close(self.pipe_read)
+        os.close(self.pipe_write)
+
+    def shutdown(self):
+        # a shutdown request would make libuv watch the file descriptor
+        # which is still polled if data is forwarded in both directions
+        try:
+            connection = socket.fromfd(self.destination_fd, socket.AF_UNIX,
+                                       socket.SOCK_STREAM)
+        except OSError:  # pragma: no cover
+            return
+        try:
+            connection.shutdown(socket.SHUT_WR)
+        except OSError:  # pragma: no cover
+            pass
+        finally:
+            connection.close()
+
+
+def pipe(source, destination, on_done=None, end=True, splice=None,
+         high_watermark=2**20):
+    """
+    Forward data from the source to the destination stream, see
+    :func:`uv.UVStream.pipe_to`.
+
+    :rtype:
+        uv.handles.forward.Forwarder
+    """
+    if splice is None:
+        splice = not (source.active or destination.active)
+    if splice and splice_supported:
+        try:
+            return SpliceForwarder(source, destination, on_done, end)
+        except error.UVError:
+            pass
+    return CopyForwarder(source, destination, on_done, end, high_watermark)
@@ -15,9 +15,15 @@
 
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import errno
+import os
+import socket
+
 from .. import abstract, base, common, error, handle, library, request
 from ..library import ffi, lib
 
+from . import check, idle
+
 
 @base.request_callback('uv_shutdown_cb')
 def uv_shutdown_cb(shutdown_request, status):
@@ -56,6 +62,7 @@ class ShutdownRequest(request.UVRequest):
     __slots__ = ['uv_shutdown', 'stream', 'on_shutdown']
 
     uv_request_type = 'uv_shutdown_t*'
+    uv_request_pooled = True
     uv_request_init = lib.uv_shutdown
 
     def __init__(self, stream, on_shutdown=None):
@@ -106,7 +113,13 @@ def uv_write_cb(write_request, status):
     :type status:
         int
     """
-    write_request.on_write(write_request, error.StatusCodes.get(status))
+    # libuv has already lowered the write queue size, check the watermarks
+    # before the user's callback has a chance to close the stream
+    try:
+        if write_request.stream.write_high_watermark is not None:
+            write_request.stream.update_write_queue()
+    finally:
+        write_request.on_write(write_request, error.StatusCodes.get(status))
 
 
 @request.RequestType.WRITE
@@ -116,6 +129,11 @@ class WriteRequest(request.UVRequest):
     process communication support, to send stream handles. Buffers
     are written in the given order.
 
+    Buffers might be any objects supporting the buffer protocol. Their
+    memory is passed to libuv without copying and they are kept alive
+    until the request has finished, so mutable buffers must not be
+    modified in the meantime.
+
     :raises uv.UVError:
         error while initializing the request
     :raises uv.ClosedHandleError:
@@ -133,7 +151,7 @@ class WriteRequest(request.UVRequest):
     :type stream:
         uv.UVStream
     :type buffers:
-        tuple[bytes] | list[bytes] | bytes
+        tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
     :type send_stream:
         uv.TCP | uv.Pipe | None
     :type on_write:
@@ -144,6 +162,7 @@ class WriteRequest(request.UVRequest):
     __slots__ = ['uv_buffers', 'stream', 'send_stream', 'on_write']
 
     uv_request_type = 'uv_write_t*'
+    uv_request_pooled = True
 
     def __init__(self, stream, buffers, send_stream=None, on_write=None):
         if stream.closing:
@@ -201,6 +220,465 @@ class WriteRequest(request.UVRequest):
         super(WriteRequest, self).__init__(stream.loop, arguments, stream.uv_stream, init)
 
 
+class CompletedWrite(request.CompletedRequest):
+    """
+    Returned by :func:`uv.UVStream.write` instead of a write request if
+    all data has been written immediately. The write callback runs with
+    status :class:`uv.StatusCodes.SUCCESS` after polling for IO.
+
+    :param stream:
+        stream the data has been written to
+    :param on_write:
+        callback which should run after all data has been written
+
+    :type stream:
+        uv.UVStream
+    :type on_write:
+        ((uv.CompletedWrite, uv.StatusCodes) -> None) |
+        ((Any, uv.CompletedWrite, uv.StatusCodes) -> None) | None
+    """
+
+    __slots__ = ['stream', 'send_stream', 'on_write']
+
+    def __init__(self, stream, on_write=None):
+        super(CompletedWrite, self).__init__(stream.loop)
+        self.stream = stream
+        """
+        Stream the data has been written to.
+
+        :readonly:
+            True
+        :type:
+            uv.UVStream
+        """
+        self.send_stream = None
+        self.on_write = on_write or common.dummy_callback
+        """
+        Callback which should run after all data has been written.
+
+        :readonly:
+            False
+        :type:
+            ((uv.CompletedWrite, uv.StatusCodes) -> None) |
+            ((Any, uv.CompletedWrite, uv.StatusCodes) -> None)
+        """
+        if on_write is not None:
+            request.CompletionQueue.get(self.loop).schedule(self)
+
+    def complete(self):
+        self.on_write(self, error.StatusCodes.SUCCESS)
+
+
+class CorkedWrite(object):
+    """
+    Write which has been queued on a corked stream. All writes queued
+    on a stream are passed to libuv as one vectored write request when
+    the stream is flushed. The callbacks of the queued writes are
+    called in the order the writes have been issued.
+
+    :param stream:
+        stream the data should be written to
+    :param buffers:
+        data which should be written
+    :param on_write:
+        callback which should run after all data has been written
+
+    :type stream:
+        uv.UVStream
+    :type buffers:
+        tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
+    :type on_write:
+        ((uv.CorkedWrite, uv.StatusCodes) -> None) |
+        ((Any, uv.CorkedWrite, uv.StatusCodes) -> None)
+    """
+
+    __slots__ = ['stream', 'uv_buffers', 'on_write', 'write_request', 'status']
+
+    def __init__(self, stream, buffers, on_write=None):
+        self.stream = stream
+        """
+        Stream the data should be written to.
+
+        :readonly:
+            True
+        :type:
+            uv.UVStream
+        """
+        self.uv_buffers = library.make_uv_buffers(buffers)
+        self.on_write = on_write or common.dummy_callback
+        """
+        Callback which should run after all data has been written.
+
+
+        .. function: on_write(corked_write, status)
+
+            :param corked_write:
+                write the call originates from
+            :param status:
+                status of the write
+
+            :type corked_write:
+                uv.CorkedWrite
+            :type status:
+                uv.StatusCodes
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.CorkedWrite, uv.StatusCodes) -> None) |
+            ((Any, uv.CorkedWrite, uv.StatusCodes) -> None)
+        """
+        self.write_request = None
+        """
+        Write request the data has been flushed with or `None` if the
+        stream has not been flushed yet.
+
+        :readonly:
+            True
+        :type:
+            uv.WriteRequest | None
+        """
+        self.status = None
+        """
+        Status of the write or `None` if the write has not finished.
+
+        :readonly:
+            True
+        :type:
+            uv.StatusCodes | None
+        """
+
+    @property
+    def finished(self):
+        """
+        Write has been finished.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        return self.status is not None
+
+    def finish(self, status):
+        """
+        Set the status of the write and run the callback.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :type status:
+            uv.StatusCodes
+        """
+        self.status = status
+        try:
+            self.on_write(self, status)
+        except Exception:
+            self.stream.loop.handle_exception()
+
+
+def finish_corked_writes(corked_writes):
+    """
+    Create a write callback which finishes the given corked writes.
+
+    :type corked_writes:
+        list[uv.CorkedWrite]
+    """
+    def on_write(_, status):
+        for corked_write in corked_writes:
+            corked_write.finish(status)
+    return on_write
+
+
+class CorkFlusher(object):
+    """
+    Flushes automatically corked streams of a loop once per loop
+    iteration right after polling for IO using the loop's internal
+    check and idle handles. The loop does not block for IO as long as
+    there are streams with unflushed writes.
+
+    .. warning::
+        This class is only for internal purposes and is not part of
+        the official API. Use :func:`uv.UVStream.auto_cork` instead.
+
+    :param base_loop:
+        internal loop of the event loop the streams are running on
+
+    :type base_loop:
+        uv.base.BaseLoop
+    """
+
+    def __init__(self, base_loop):
+        # the internal loop only references the user loop weakly
+        self.base_loop = base_loop
+        self.streams = []
+
+    @classmethod
+    def get(cls, loop):
+        """
+        Get the flusher of the given loop.
+
+        :type loop:
+            uv.Loop
+
+        :rtype:
+            uv.handles.stream.CorkFlusher
+        """
+        if loop.cork_flusher is None:
+            loop.cork_flusher = cls(loop.base_loop)
+        return loop.cork_flusher
+
+    def schedule(self, stream):
+        """
+        Flush the stream after polling for IO.
+
+        :type stream:
+            uv.UVStream
+        """
+        if not self.streams:
+            self.base_loop.schedule_check(self.on_check, nowait=True)
+        self.streams.append(stream)
+
+    def on_check(self):
+        streams, self.streams = self.streams, []
+        for stream in streams:
+            if not stream.corked:
+                stream.flush_writes()
+
+
+class HandlePool(object):
+    """
+    Keeps initialized streams ready to be used by
+    :func:`uv.UVStream.accept` of a listening stream. Accepting a
+    connection from the pool only calls `uv_accept` instead of creating
+    and initializing a new handle which reduces the latency during
+    connection bursts. Consumed streams are replaced by an idle handle
+    once the loop has nothing else to do.
+
+    .. warning::
+        This class is only for internal purposes and is not part of
+        the official API. Use :func:`uv.UVStream.preallocate` instead.
+
+    :param stream:
+        listening stream the pool belongs to
+    :param size:
+        number of streams which should be kept ready
+    :param cls:
+        type of the preallocated streams
+    :param keywords:
+        keywords passed to the constructor of the preallocated streams
+
+    :type stream:
+        uv.UVStream
+    :type size:
+        int
+    :type cls:
+        type
+    :type keywords:
+        dict
+    """
+
+    refill_batch = 64
+    """
+    Maximal number of streams created per loop iteration while refilling.
+    """
+
+    def __init__(self, stream, size, cls, keywords):
+        self.loop = stream.loop
+        self.size = size
+        self.cls = cls
+        self.keywords = keywords
+        self.handles = []
+        self.idle_handle = None
+        self.hits = 0
+        self.misses = 0
+
+    def fill(self, count=None):
+        """
+        Create streams until the pool is full or `count` streams have
+        been created.
+
+        :type count:
+            int | None
+        """
+        missing = self.size - len(self.handles)
+        if count is not None:
+            missing = min(missing, count)
+        for _ in range(missing):
+            self.handles.append(self.cls(loop=self.loop, **self.keywords))
+
+    def matches(self, cls, arguments, keywords):
+        """
+        Check whether an accept call with the given arguments can be
+        served from the pool.
+
+        :rtype:
+            bool
+        """
+        if arguments or (cls is not None and cls is not self.cls):
+            return False
+        for name, value in keywords.items():
+            if name == 'loop':
+                if value is not self.loop:
+                    return False
+            elif name not in ('on_read', 'on_connection'):
+                return False
+        return True
+
+    def acquire(self):
+        """
+        Take a stream out of the pool and schedule a refill.
+
+        :rtype:
+            uv.UVStream | None
+        """
+        connection = None
+        while self.handles:
+            connection = self.handles.pop()
+            if not connection.closing:
+                break
+            connection = None
+        if connection is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.schedule()
+        return connection
+
+    def release(self, connection):
+        """
+        Put a stream which has not been used back into the pool.
+
+        :type connection:
+            uv.UVStream
+        """
+        if len(self.handles) < self.size and not connection.closing:
+            self.handles.append(connection)
+        else:
+            connection.close()
+
+    def schedule(self):
+        if self.loop.closed:
+            return
+        if self.idle_handle is None or self.idle_handle.closing:
+            self.idle_handle = idle.Idle(self.loop, on_idle=self.on_idle)
+            self.idle_handle.dereference()
+        self.idle_handle.start()
+
+    def on_idle(self, _):
+        self.fill(self.refill_batch)
+        if len(self.handles) >= self.size:
+            self.idle_handle.stop()
+
+    def close(self):
+        """
+        Close all streams in the pool and stop refilling.
+        """
+        handles, self.handles = self.handles, []
+        for connection in handles:
+            connection.close()
+        if self.idle_handle is not None:
+            self.idle_handle.close()
+            self.idle_handle = None
+
+
+class BatchAcceptor(object):
+    """
+    Accepts the incoming connections of a listening stream in batches
+    and passes each batch to one callback. At most `max_batch`
+    connections are accepted per loop iteration, further connections
+    stay in the kernel's backlog until the next iteration.
+
+    .. warning::
+        This class is only for internal purposes and is not part of
+        the official API. Use :func:`uv.UVStream.listen_batch` instead.
+
+    :param stream:
+        listening stream
+    :param on_connections:
+        callback which should run with each batch of connections
+    :param max_batch:
+        maximal number of connections per loop iteration or `None`
+    :param cls:
+        type of the accepted streams
+    :param keywords:
+        keywords passed to the constructor of the accepted streams
+
+    :type stream:
+        uv.UVStream
+    :type on_connections:
+        ((uv.UVStream, uv.StatusCodes, list[uv.UVStream]) -> None)
+    :type max_batch:
+        int | None
+    :type cls:
+        type | None
+    :type keywords:
+        dict
+    """
+
+    def __init__(self, stream, on_connections, max_batch, cls, keywords):
+        self.stream = stream
+        self.loop = stream.loop
+        self.on_connections = on_connections
+        self.max_batch = max_batch
+        self.cls = cls
+        self.keywords = keywords
+        self.accepted = 0
+        self.deferred = False
+        self.check_handle = None
+        self.idle_handle = None
+        self.batches = 0
+        self.connections = 0
+
+    def on_connection(self, stream, status):
+        if status != error.StatusCodes.SUCCESS:
+            self.on_connections(stream, status, [])
+            return
+        if self.max_batch is not None and self.accepted >= self.max_batch:
+            # libuv stops accepting until the pending connection is taken
+            self.deferred = True
+            return
+        count = None if self.max_batch is None else self.max_batch - self.accepted
+        connections = stream.accept_many(count, self.cls, **self.keywords)
+        if not connections:  # pragma: no cover
+            return
+        if not self.accepted:
+            self.schedule()
+        self.accepted += len(connections)
+        self.batches += 1
+        self.connections += len(connections)
+        self.on_connections(stream, error.StatusCodes.SUCCESS, connections)
+
+    def schedule(self):
+        if self.check_handle is None or self.check_handle.closing:
+            self.check_handle = check.Check(self.loop, on_check=self.on_check)
+            self.idle_handle = idle.Idle(self.loop, on_idle=self.on_idle)
+        self.check_handle.start()
+
+    def on_check(self, _):
+        self.accepted = 0
+        self.check_handle.stop()
+        if self.deferred:
+            self.idle_handle.start()
+
+    def on_idle(self, _):
+        self.idle_handle.stop()
+        self.deferred = False
+        if not self.stream.closing:
+            self.on_connection(self.stream, error.StatusCodes.SUCCESS)
+
+    def close(self):
+        """
+        Close the handles of the acceptor.
+        """
+        if self.check_handle is not None:
+            self.check_handle.close()
+            self.idle_handle.close()
+            self.check_handle = self.idle_handle = None
+
+
 @base.request_callback('uv_connect_cb')
 def uv_connect_cb(connect_request, status):
     """
@@ -236,6 +714,7 @@ class ConnectRequest(request.UVRequest):
     __slots__ = ['stream', 'on_connect']
 
     uv_request_type = 'uv_connect_t*'
+    uv_request_pooled = True
 
     def __init__(self, stream, arguments, on_connect=None):
         if stream.closing:
@@ -287,6 +766,8 @@ def uv_connection_cb(stream_handle, status):
     :type status:
         int
     """
+    if status == error.StatusCodes.SUCCESS:
+        stream_handle.connection_pending = True
     stream_handle.on_connection(stream_handle, error.StatusCodes.get(status))
 
 
@@ -300,13 +781,15 @@ def uv_read_cb(stream_handle, length, uv_buffer):
     :type uv_buffer:
         ffi.CData[uv_buf_t*]
     """
-    data = stream_handle.loop.allocator.finalize(stream_handle, length, uv_buffer)
+    data = stream_handle.allocator.finalize(stream_handle, length, uv_buffer)
     if length < 0:  # pragma: no cover
         status = error.StatusCodes.get(length)
         data = b''
     else:
         status = error.StatusCodes.SUCCESS
     stream_handle.on_read(stream_handle, status, data)
+    if stream_handle.read_budget is not None:
+        handle.ReadThrottler.get(stream_handle.loop).account(stream_handle, length)
 
 
 @handle.HandleTypes.STREAM
@@ -344,7 +827,11 @@ class UVStream(handle.UVHandle):
         ((Any, uv.UVStream, uv.StatusCodes, bytes) -> None)
     """
 
-    __slots__ = ['uv_stream', 'on_read', 'on_connection', 'ipc']
+    __slots__ = ['uv_stream', 'on_read', 'on_connection', 'ipc', 'corked', 'auto_cork',
+                 'corked_writes', 'on_pause_writing', 'on_resume_writing',
+                 'write_high_watermark', 'write_low_watermark', 'writing_paused',
+                 'read_source', 'handle_pool', 'read_budget', 'write_fast_path',
+                 'connection_pending', 'accept_socket', 'batch_acceptor']
 
     def __init__(self, loop, ipc, arguments, on_read, on_connection):
         super(UVStream, self).__init__(loop, arguments)
@@ -416,6 +903,160 @@ class UVStream(handle.UVHandle):
         :type:
             bool
         """
+        self.corked = False
+        """
+        Stream has been corked with :func:`uv.UVStream.cork`.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.auto_cork = False
+        """
+        Queue all writes issued during one loop iteration and flush
+        them as one vectored write request right after polling for IO.
+
+        :readonly:
+            False
+        :type:
+            bool
+        """
+        self.corked_writes = []
+        self.on_pause_writing = common.dummy_callback
+        """
+        Callback which should run after the size of the write queue has
+        risen above the high watermark.
+
+
+        .. function:: on_pause_writing(stream_handle)
+
+            :param stream_handle:
+                handle the call originates from
+
+            :type stream_handle:
+                uv.UVStream
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.UVStream) -> None) | ((Any, uv.UVStream) -> None)
+        """
+        self.on_resume_writing = common.dummy_callback
+        """
+        Callback which should run after the size of the write queue has
+        dropped to or below the low watermark after writing has been
+        paused.
+
+
+        .. function:: on_resume_writing(stream_handle)
+
+            :param stream_handle:
+                handle the call originates from
+
+            :type stream_handle:
+                uv.UVStream
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.UVStream) -> None) | ((Any, uv.UVStream) -> None)
+        """
+        self.write_high_watermark = None
+        """
+        Size of the write queue in bytes above which writing is paused
+        or `None` if there is no limit.
+
+        :readonly:
+            True
+        :type:
+            int | None
+        """
+        self.write_low_watermark = None
+        """
+        Size of the write queue in bytes at or below which writing is
+        resumed after it has been paused.
+
+        :readonly:
+            True
+        :type:
+            int | None
+        """
+        self.writing_paused = False
+        """
+        Writing has been paused because the write queue has risen above
+        the high watermark.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.read_source = None
+        """
+        Stream which stops reading while writing is paused and starts
+        reading again after writing has been resumed. This allows to
+        propagate backpressure when forwarding data from one stream to
+        another.
+
+        :readonly:
+            False
+        :type:
+            uv.UVStream | None
+        """
+        self.handle_pool = None
+        """
+        Pool of initialized streams used by :func:`uv.UVStream.accept`
+        or `None` if no streams have been preallocated.
+
+        :readonly:
+            True
+        :type:
+            uv.handles.stream.HandlePool | None
+        """
+        self.read_budget = None
+        """
+        Read fairness budget set with :func:`uv.UVStream.set_read_budget`
+        or `None` if the stream reads without limits.
+
+        :readonly:
+            True
+        :type:
+            uv.handle.ReadBudget | None
+        """
+        self.write_fast_path = True
+        """
+        Try to write data immediately before issuing a write request,
+        see :func:`uv.UVStream.write`.
+
+        :readonly:
+            False
+        :type:
+            bool
+        """
+        self.connection_pending = False
+        """
+        A connection has been accepted by libuv and waits to be taken
+        with :func:`uv.UVStream.accept`.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.accept_socket = None
+        self.batch_acceptor = None
+        """
+        Acceptor of :func:`uv.UVStream.listen_batch` or `None` if the
+        stream does not listen in batch mode.
+
+        :readonly:
+            True
+        :type:
+            uv.handles.stream.BatchAcceptor | None
+        """
 
     @property
     def readable(self):
@@ -441,6 +1082,101 @@ class UVStream(handle.UVHandle):
             return False
         return bool(lib.uv_is_writable(self.uv_stream))
 
+    @property
+    def write_queue_size(self):
+        """
+        Number of bytes waiting to be written. This includes the data
+        queued by libuv as well as the data of corked writes which have
+        not been flushed yet.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        if self.closed:
+            return 0
+        size = self.uv_stream.write_queue_size
+        for corked_write in self.corked_writes:
+            size += library.uv_buffers_size(corked_write.uv_buffers)
+        return size
+
+    def set_write_buffer_limits(self, high=None, low=None, on_pause_writing=None,
+                                on_resume_writing=None, read_source=None):
+        """
+        Set the high and low watermarks of the write queue. If the size
+        of the write queue rises above the high watermark the pause
+        writing callback is called and, if a read source is set, the
+        source stops reading. If the size drops to or below the low
+        watermark afterwards the resume writing callback is called and
+        the source starts reading again.
+
+        :param high:
+            high watermark in bytes or `None` to disable the limits
+        :param low:
+            low watermark in bytes (defaults to a quarter of `high`)
+        :param on_pause_writing:
+            callback which should run after writing has been paused
+            (overrides the current callback if specified)
+        :param on_resume_writing:
+            callback which should run after writing has been resumed
+            (overrides the current callback if specified)
+        :param read_source:
+            stream which should stop reading while writing is paused
+            (overrides the current source if specified)
+
+        :type high:
+            int | None
+        :type low:
+            int | None
+        :type on_pause_writing:
+            ((uv.UVStream) -> None) | ((Any, uv.UVStream) -> None)
+        :type on_resume_writing:
+            ((uv.UVStream) -> None) | ((Any, uv.UVStream) -> None)
+        :type read_source:
+            uv.UVStream | None
+        """
+        if high is not None:
+            low = high // 4 if low is None else low
+            if not 0 <= low <= high:
+                raise ValueError('low watermark must be between 0 and high watermark')
+        self.write_high_watermark = high
+        self.write_low_watermark = None if high is None else low
+        self.on_pause_writing = on_pause_writing or self.on_pause_writing
+        self.on_resume_writing = on_resume_writing or self.on_resume_writing
+        self.read_source = read_source or self.read_source
+        self.update_write_queue()
+
+    def update_write_queue(self):
+        """
+        Compare the size of the write queue with the watermarks and
+        pause or resume writing if necessary.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if self.write_high_watermark is None:
+            if self.writing_paused:
+                self._resume_writing()
+            return
+        if self.closing:
+            return
+        size = self.write_queue_size
+        if not self.writing_paused and size > self.write_high_watermark:
+            self.writing_paused = True
+            if self.read_source is not None:
+                self.read_source.stop_read()
+            self.on_pause_writing(self)
+        elif self.writing_paused and size <= self.write_low_watermark:
+            self._resume_writing()
+
+    def _resume_writing(self):
+        self.writing_paused = False
+        if self.read_source is not None and not self.read_source.closing:
+            self.read_source.start_read()
+        self.on_resume_writing(self)
+
     @property
     def family(self):
         """
@@ -459,6 +1195,7 @@ class UVStream(handle.UVHandle):
         :rtype:
             uv.ShutdownRequest
         """
+        self.flush_writes()
         return ShutdownRequest(self, on_shutdown)
 
     def listen(self, on_connection=None, backlog=5):
@@ -489,6 +1226,59 @@ class UVStream(handle.UVHandle):
         if code != error.StatusCodes.SUCCESS:
             raise error.UVError(code)
 
+    def listen_batch(self, on_connections, backlog=128, max_batch=64, cls=None,
+                     **keywords):
+        """
+        Start listening for incoming connections and accept them in
+        batches with :func:`uv.UVStream.accept_many`. Every batch is
+        passed to one callback instead of calling `on_connection` for
+        each connection. At most `max_batch` connections are accepted
+        per loop iteration, further connections stay in the kernel's
+        backlog until the next iteration which keeps connection storms
+        from starving established connections.
+
+        :raises uv.UVError:
+            error while start listening for incoming connections
+        :raises uv.ClosedHandleError:
+            handle has already been closed or is closing
+
+        :param on_connections:
+            callback which should run with each batch of connections
+        :param backlog:
+            number of connections the kernel might queue
+        :param max_batch:
+            maximal number of connections accepted per loop iteration
+            or `None` to accept all pending connections
+        :param cls:
+            type of the accepted streams
+        :param keywords:
+            keywords passed to the constructor of the accepted streams
+
+        :type on_connections:
+            ((uv.UVStream, uv.StatusCodes, list[uv.UVStream]) -> None)
+        :type backlog:
+            int
+        :type max_batch:
+            int | None
+        :type cls:
+            type | None
+        :type keywords:
+            dict
+
+        :return:
+            acceptor which counts the accepted connections and batches
+        :rtype:
+            uv.handles.stream.BatchAcceptor
+        """
+        if self.closing:
+            raise error.ClosedHandleError()
+        acceptor = BatchAcceptor(self, on_connections, max_batch, cls, keywords)
+        self.listen(on_connection=acceptor.on_connection, backlog=backlog)
+        if self.batch_acceptor is not None:
+            self.batch_acceptor.close()
+        self.batch_acceptor = acceptor
+        return acceptor
+
     def start_read(self, on_read=None):
         """
         :raises uv.UVError:
@@ -503,6 +1293,8 @@ class UVStream(handle.UVHandle):
         if self.closing:
             raise error.ClosedHandleError()
         self.on_read = on_read or self.on_read
+        if self.read_budget is not None:
+            self.read_budget.throttled = False
         code = lib.uv_read_start(self.uv_stream, handle.uv_alloc_cb, uv_read_cb)
         if code != error.StatusCodes.SUCCESS:
             raise error.UVError(code)
@@ -515,15 +1307,64 @@ class UVStream(handle.UVHandle):
         """
         if self.closing:
             return
+        if self.read_budget is not None:
+            self.read_budget.throttled = False
         code = lib.uv_read_stop(self.uv_stream)
         if code != error.StatusCodes.SUCCESS:
             raise error.UVError(code)
         self.clear_pending()
 
+    def set_read_budget(self, max_bytes=None, max_callbacks=None):
+        """
+        Limit the number of bytes or read callbacks per loop iteration.
+        A stream which exceeds its budget stops reading until the loop
+        has finished polling for IO and continues reading within the
+        next iteration. This prevents a single busy stream from starving
+        other streams. Throttled streams are reported by
+        :func:`uv.Loop.read_throttle_report`. Without arguments the
+        budget is removed.
+
+        :param max_bytes:
+            maximal number of bytes read per loop iteration
+        :param max_callbacks:
+            maximal number of read callbacks per loop iteration
+
+        :type max_bytes:
+            int | None
+        :type max_callbacks:
+            int | None
+        """
+        budget = self.read_budget
+        self.read_budget = handle.ReadBudget.create(max_bytes, max_callbacks)
+        if budget is not None and budget.throttled and not self.closing:
+            self._resume_reading()
+
+    def _pause_reading(self):
+        lib.uv_read_stop(self.uv_stream)
+
+    def _resume_reading(self):
+        code = lib.uv_read_start(self.uv_stream, handle.uv_alloc_cb, uv_read_cb)
+        if code != error.StatusCodes.SUCCESS:
+            raise error.UVError(code)
+
     def write(self, buffers, on_write=None, send_stream=None):
         """
+        Write data to the stream. If the stream is corked the write is
+        queued until the stream is flushed, writes sending a stream
+        handle flush the stream first.
+
+        Unless :attr:`write_fast_path` is disabled the data is written
+        to the socket immediately as far as possible and a write request
+        is issued only for the remainder. If all data has been written a
+        :class:`uv.CompletedWrite` is returned instead of a request.
+
+        :raises uv.UVError:
+            error while initializing the write request
+        :raises uv.ClosedHandleError:
+            handle has already been closed or is closing
+
         :type buffers:
-            tuple[bytes] | list[bytes] | bytes
+            tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
         :type send_stream:
             uv.TCP | uv.Pipe | None
         :type on_write:
@@ -531,11 +1372,80 @@ class UVStream(handle.UVHandle):
             ((Any, uv.WriteRequest, uv.StatusCodes) -> None)
 
         :returns:
-            issued write request
+            issued write request, queued write or completed write
         :rtype:
-            uv.WriteRequest
+            uv.WriteRequest | uv.CorkedWrite | uv.CompletedWrite
+        """
+        if send_stream is None and (self.corked or self.auto_cork):
+            if self.closing:
+                raise error.ClosedHandleError()
+            if not self.corked_writes and not self.corked:
+                CorkFlusher.get(self.loop).schedule(self)
+            corked_write = CorkedWrite(self, buffers, on_write)
+            self.corked_writes.append(corked_write)
+            if self.write_high_watermark is not None:
+                self.update_write_queue()
+            return corked_write
+        self.flush_writes()
+        if send_stream is None and self.write_fast_path and not self.closing:
+            # write as much as possible without a request and only queue the rest
+            uv_buffers = library.make_uv_buffers(buffers)
+            written = lib.uv_try_write(self.uv_stream, uv_buffers, len(uv_buffers))
+            if written > 0:
+                if written == library.uv_buffers_size(uv_buffers):
+                    return CompletedWrite(self, on_write)
+                uv_buffers = library.advance_uv_buffers(uv_buffers, written)
+            buffers = uv_buffers
+        write_request = WriteRequest(self, buffers, send_stream, on_write)
+        if self.write_high_watermark is not None:
+            self.update_write_queue()
+        return write_request
+
+    def cork(self):
         """
-        return WriteRequest(self, buffers, send_stream, on_write)
+        Cork the stream. All writes are queued until the stream gets
+        uncorked and are then passed to libuv as one vectored write.
+        """
+        self.corked = True
+
+    def uncork(self):
+        """
+        Uncork the stream and flush all queued writes.
+        """
+        self.corked = False
+        self.flush_writes()
+
+    def flush_writes(self):
+        """
+        Pass all queued writes to libuv as one vectored write request.
+        If the stream has been closed or the request could not be
+        issued the callbacks of the queued writes are called with the
+        corresponding error status.
+
+        :returns:
+            issued write request or `None` if there were no queued writes
+        :rtype:
+            uv.WriteRequest | None
+        """
+        if not self.corked_writes:
+            return None
+        corked_writes, self.corked_writes = self.corked_writes, []
+        if self.closing:
+            for corked_write in corked_writes:
+                corked_write.finish(error.StatusCodes.ECANCELED)
+            return None
+        uv_buffers = [corked_write.uv_buffers for corked_write in corked_writes]
+        on_write = finish_corked_writes(corked_writes)
+        try:
+            write_request = WriteRequest(self, library.merge_uv_buffers(uv_buffers),
+                                         on_write=on_write)
+        except error.UVError as uv_error:
+            for corked_write in corked_writes:
+                corked_write.finish(error.StatusCodes.get(uv_error.code))
+            return None
+        for corked_write in corked_writes:
+            corked_write.write_request = write_request
+        return write_request
 
     def try_write(self, buffers):
         """
@@ -554,7 +1464,7 @@ class UVStream(handle.UVHandle):
         :param buffers:
             data which should be written
         :type buffers:
-            tuple[bytes] | list[bytes] | bytes
+            tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
 
         :return:
             number of bytes written
@@ -563,16 +1473,171 @@ class UVStream(handle.UVHandle):
         """
         if self.closing:
             raise error.ClosedHandleError()
+        status, written = self.try_write_status(buffers)
+        if status != error.StatusCodes.SUCCESS:
+            raise error.UVError(status)
+        return written
+
+    def try_write_status(self, buffers):
+        """
+        Same as :func:`try_write` but returns the status instead of
+        raising an exception, e.g. :class:`uv.StatusCodes.EAGAIN` if no
+        data could be written immediately.
+
+        :param buffers:
+            data which should be written
+        :type buffers:
+            tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
+
+        :return:
+            status and number of bytes written
+        :rtype:
+            (uv.StatusCodes, int)
+        """
+        if self.closing:
+            return error.StatusCodes.EBADF, 0
+        if self.corked_writes:
+            # writing immediately would reorder the data
+            return error.StatusCodes.EAGAIN, 0
         uv_buffers = library.make_uv_buffers(buffers)
         code = lib.uv_try_write(self.uv_stream, uv_buffers, len(uv_buffers))
-        if code < 0:  # pragma: no cover
-            raise error.UVError(code)
-        return code
+        if code < 0:
+            return error.StatusCodes.get(code), 0
+        return error.StatusCodes.SUCCESS, code
+
+    def pipe_to(self, destination, on_done=None, end=True, splice=None,
+                high_watermark=2**20):
+        """
+        Forward all data read from the stream to the destination stream
+        until end of file has been reached, an error occurred or
+        forwarding has been stopped with the returned forwarder. Neither
+        stream should be read from or written to while forwarding.
+
+        On Linux the data is moved with `splice` through an intermediate
+        pipe without being copied into Python, both file descriptors are
+        watched with poll handles and reading pauses while the pipe is
+        full. Otherwise the data is read and written with the usual
+        stream methods and reading pauses while the destination's write
+        queue is above its high watermark.
+
+        :raises uv.UVError:
+            error while start reading
+        :raises uv.ClosedHandleError:
+            stream or destination has already been closed or is closing
+
+        :param destination:
+            stream the data should be written to
+        :param on_done:
+            callback which should run after forwarding has finished
+        :param end:
+            shutdown the destination after end of file has been reached
+        :param splice:
+            use `splice` if available (defaults to splicing if neither
+            stream is active, e.g. reading)
+        :param high_watermark:
+            high watermark of the destination's write queue if data is
+            copied and no write buffer limits have been set
+
+        :type destination:
+            uv.UVStream
+        :type on_done:
+            ((uv.handles.forward.Forwarder, uv.StatusCodes) -> None) | None
+        :type end:
+            bool
+        :type splice:
+            bool | None
+        :type high_watermark:
+            int
+
+        :return:
+            forwarder which moves the data
+        :rtype:
+            uv.handles.forward.Forwarder
+        """
+        if self.closing or destination.closing:
+            raise error.ClosedHandleError()
+        from . import forward
+        return forward.pipe(self, destination, on_done, end, splice, high_watermark)
+
+    def close(self, on_closed=None):
+        """
+        Close the stream. Queued writes which have not been flushed are
+        finished with status :class:`uv.StatusCodes.ECANCELED`.
+
+        :param on_closed:
+            callback which should run after the handle has been closed
+            (overrides the current callback if specified)
+
+        :type on_closed:
+            ((uv.Handle) -> None) | ((Any, uv.Handle) -> None)
+        """
+        super(UVStream, self).close(on_closed)
+        self.flush_writes()
+        if self.handle_pool is not None:
+            self.handle_pool.close()
+            self.handle_pool = None
+        if self.batch_acceptor is not None:
+            self.batch_acceptor.close()
+            self.batch_acceptor = None
+        if self.accept_socket is not None:
+            self.accept_socket.close()
+            self.accept_socket = None
+
+    def preallocate(self, count, cls=None, **keywords):
+        """
+        Keep `count` initialized streams ready to be accepted. While the
+        pool is not empty :func:`uv.UVStream.accept` only has to call
+        `uv_accept` which reduces the latency during connection bursts.
+        The pool is filled immediately and refilled by an idle handle
+        after streams have been taken out of it. Calling this method
+        again resizes the pool, a count of zero removes it.
+
+        Accept calls with other arguments than `on_read` and
+        `on_connection` or another stream type are not served from the
+        pool.
+
+        :raises uv.UVError:
+            error while initializing the streams
+        :raises uv.ClosedHandleError:
+            handle has already been closed or is closing
+
+        :param count:
+            number of streams which should be kept ready
+        :param cls:
+            type of the preallocated streams (defaults to the type of
+            the listening stream)
+        :param keywords:
+            keywords passed to the constructor of the preallocated
+            streams
+
+        :type count:
+            int
+        :type cls:
+            type
+        :type keywords:
+            dict
+
+        :return:
+            pool of preallocated streams
+        :rtype:
+            uv.handles.stream.HandlePool | None
+        """
+        if self.closing:
+            raise error.ClosedHandleError()
+        if self.handle_pool is not None:
+            self.handle_pool.close()
+            self.handle_pool = None
+        if count > 0:
+            self.handle_pool = HandlePool(self, count, cls or type(self), keywords)
+            self.handle_pool.fill()
+        return self.handle_pool
 
     def accept(self, cls=None, *arguments, **keywords):
         """
         Accept a new stream. This might be a new client connection or a
-        stream sent by inter process communication.
+        stream sent by inter process communication. If streams have been
+        preallocated with :func:`uv.UVStream.preallocate` the new stream
+        is taken from the pool if possible.
 
         .. warning::
             There should be no need to use this method directly, it is
@@ -604,11 +1669,110 @@ class UVStream(handle.UVHandle):
         """
         if self.closing:
             raise error.ClosedHandleError()
-        connection = (cls or type(self))(*arguments, **keywords)
+        connection = self._new_connection(cls, arguments, keywords)
+        self.connection_pending = False
         code = lib.uv_accept(self.uv_stream, connection.uv_stream)
         if code != error.StatusCodes.SUCCESS:
+            self._discard_connection(connection)
             raise error.UVError(code)
         return connection
 
+    def accept_many(self, max_n=None, cls=None, *arguments, **keywords):
+        """
+        Accept up to `max_n` connections at once. Besides the connection
+        libuv has already accepted, the kernel's backlog is drained with
+        non-blocking `accept` calls on the listening socket, so all of
+        them can be handled within one `on_connection` callback. On
+        Windows only the connection accepted by libuv is returned.
+
+        :raises uv.UVError:
+            error while accepting the first connection
+        :raises uv.ClosedHandleError:
+            handle has already been closed or is closing
+
+        :param max_n:
+            maximal number of connections or `None` to accept all
+            pending connections
+        :param cls:
+            type of the new streams
+        :param arguments:
+            arguments passed to the constructor of the new streams
+        :param keywords:
+            keywords passed to the constructor of the new streams
+
+        :type max_n:
+            int | None
+        :type cls:
+            type
+        :type arguments:
+            tuple
+        :type keywords:
+            dict
+
+        :return:
+            new stream connections of type `cls` (might be empty)
+        :rtype:
+            list[uv.UVStream]
+        """
+        if self.closing:
+            raise error.ClosedHandleError()
+        connections = []
+        if self.connection_pending and (max_n is None or max_n > 0):
+            connections.append(self.accept(cls, *arguments, **keywords))
+        listener = self._get_accept_socket()
+        while listener is not None and (max_n is None or len(connections) < max_n):
+            try:
+                connection_socket, _ = listener.accept()
+            except socket.error as exception:
+                if exception.errno in (errno.EINTR, errno.ECONNABORTED):
+                    continue
+                if exception.errno in (errno.EAGAIN, errno.EWOULDBLOCK) or connections:
+                    break
+                raise error.UVError(error.StatusCodes.get(-exception.errno))
+            try:
+                fd = connection_socket.detach()
+            except AttributeError:  # pragma: no cover
+                # Python 2 sockets can not be detached
+                fd = os.dup(connection_socket.fileno())
+                connection_socket.close()
+            connection = self._new_connection(cls, arguments, keywords)
+            try:
+                connection.open(fd)
+            except error.UVError:
+                os.close(fd)
+                self._discard_connection(connection)
+                if connections:
+                    break
+                raise
+            connections.append(connection)
+        return connections
+
+    def _get_accept_socket(self):
+        if self.accept_socket is None and not common.is_win32:
+            family = self.family or socket.AF_INET
+            self.accept_socket = socket.fromfd(self.fileno(), family, socket.SOCK_STREAM)
+            self.accept_socket.setblocking(False)
+        return self.accept_socket
+
+    def _new_connection(self, cls, arguments, keywords):
+        pool = self.handle_pool
+        connection = None
+        if pool is not None and pool.matches(cls, arguments, keywords):
+            connection = pool.acquire()
+        if connection is None:
+            return (cls or type(self))(*arguments, **keywords)
+        if 'on_read' in keywords:
+            connection.on_read = keywords['on_read'] or common.dummy_callback
+        if 'on_connection' in keywords:
+            connection.on_connection = keywords['on_connection'] or common.dummy_callback
+        return connection
+
+    def _discard_connection(self, connection):
+        pool = self.handle_pool
+        if pool is not None and isinstance(connection, pool.cls):
+            pool.release(connection)
+        else:
+            connection.close()
+
 
 abstract.Stream.register(UVStream)
@@ -87,7 +87,9 @@ def uv_udp_send_cb(send_request, status):
 @request.RequestType.UDP_SEND
 class UDPSendRequest(request.UVRequest):
     """
-    Request to send a UDP datagram.
+    Request to send a UDP datagram. Buffers might be any objects
+    supporting the buffer protocol, they are sent without copying and
+    must not be modified until the request has finished.
 
     :raises uv.UVError:
         error while initializing the request
@@ -106,7 +108,7 @@ class UDPSendRequest(request.UVRequest):
     :type udp:
         uv.UDP
     :type buffers:
-        list[bytes] | bytes
+        tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
     :type address:
         tuple | uv.Address
     :type on_send:
@@ -117,6 +119,7 @@ class UDPSendRequest(request.UVRequest):
     __slots__ = ['uv_send', 'uv_buffers', 'udp', 'on_send']
 
     uv_request_type = 'uv_udp_send_t*'
+    uv_request_pooled = True
     uv_request_init = lib.uv_udp_send
 
     def __init__(self, udp, buffers, address, on_send=None):
@@ -162,6 +165,54 @@ class UDPSendRequest(request.UVRequest):
         super(UDPSendRequest, self).__init__(udp.loop, arguments, uv_udp)
 
 
+class CompletedSend(request.CompletedRequest):
+    """
+    Returned by :func:`uv.UDP.send` instead of a send request if the
+    datagram has been sent immediately. The send callback runs with
+    status :class:`uv.StatusCodes.SUCCESS` after polling for IO.
+
+    :param udp:
+        udp handle the datagram has been sent with
+    :param on_send:
+        callback which should run after all data has been sent
+
+    :type udp:
+        uv.UDP
+    :type on_send:
+        ((uv.CompletedSend, uv.StatusCode) -> None) |
+        ((Any, uv.CompletedSend, uv.StatusCode) -> None) | None
+    """
+
+    __slots__ = ['udp', 'on_send']
+
+    def __init__(self, udp, on_send=None):
+        super(CompletedSend, self).__init__(udp.loop)
+        self.udp = udp
+        """
+        UDP handle the datagram has been sent with.
+
+        :readonly:
+            True
+        :type:
+            uv.UDP
+        """
+        self.on_send = on_send or common.dummy_callback
+        """
+        Callback which should run after all data has been sent.
+
+        :readonly:
+            False
+        :type:
+            ((uv.CompletedSend, uv.StatusCode) -> None) |
+            ((Any, uv.CompletedSend, uv.StatusCode) -> None)
+        """
+        if on_send is not None:
+            request.CompletionQueue.get(self.loop).schedule(self)
+
+    def complete(self):
+        self.on_send(self, error.StatusCodes.SUCCESS)
+
+
 @base.handle_callback('uv_udp_recv_cb')
 def uv_udp_recv_cb(udp_handle, length, uv_buffer, c_sockaddr, flags):
     """
@@ -176,7 +227,7 @@ def uv_udp_recv_cb(udp_handle, length, uv_buffer, c_sockaddr, flags):
     :type flags:
         int
     """
-    data = udp_handle.loop.allocator.finalize(udp_handle, length, uv_buffer)
+    data = udp_handle.allocator.finalize(udp_handle, length, uv_buffer)
     if length < 0:  # pragma: no cover
         status = error.StatusCodes.get(length)
     else:
@@ -186,6 +237,10 @@ def uv_udp_recv_cb(udp_handle, length, uv_buffer, c_sockaddr, flags):
     else:  # pragma: no cover
         address = None
     udp_handle.on_receive(udp_handle, status, address, data, flags)
+    if udp_handle.read_budget is not None and (c_sockaddr or length):
+        # libuv signals that there is nothing more to read with an empty
+        # callback without address which is not accounted
+        handle.ReadThrottler.get(udp_handle.loop).account(udp_handle, length)
 
 
 @handle.HandleTypes.UDP
@@ -212,7 +267,7 @@ class UDP(handle.UVHandle):
         ((Any, uv.UDP, uv.StatusCode, uv.Address, bytes, int) -> None)
     """
 
-    __slots__ = ['uv_udp', 'on_receive']
+    __slots__ = ['uv_udp', 'on_receive', 'read_budget', 'send_fast_path']
 
     uv_handle_type = 'uv_udp_t*'
     uv_handle_init = lib.uv_udp_init_ex
@@ -256,6 +311,26 @@ class UDP(handle.UVHandle):
             ((Any, uv.UDP, uv.StatusCode, uv.Address, bytes,
               int) -> None)
         """
+        self.read_budget = None
+        """
+        Read fairness budget set with :func:`uv.UDP.set_read_budget` or
+        `None` if the handle receives without limits.
+
+        :readonly:
+            True
+        :type:
+            uv.handle.ReadBudget | None
+        """
+        self.send_fast_path = True
+        """
+        Try to send datagrams immediately before issuing a send request,
+        see :func:`uv.UDP.send`.
+
+        :readonly:
+            False
+        :type:
+            bool
+        """
 
     def open(self, fd):
         """
@@ -309,6 +384,10 @@ class UDP(handle.UVHandle):
         been bound with `bind()` it will be bound to 0.0.0.0 (the "all
         interfaces" IPv4 address) and a random port number.
 
+        Unless :attr:`send_fast_path` is disabled the datagram is sent
+        immediately if possible and a :class:`uv.CompletedSend` is
+        returned instead of a request.
+
         :raises uv.UVError:
             error while initializing the request
         :raises uv.ClosedHandleError:
@@ -322,7 +401,7 @@ class UDP(handle.UVHandle):
             callback called after all data has been sent
 
         :type buffers:
-            tuple[bytes] | list[bytes] | bytes
+            tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
         :type address:
             tuple | uv.Address4 | uv.Address6
         :type on_send:
@@ -330,8 +409,14 @@ class UDP(handle.UVHandle):
             ((Any, uv.UDPSendRequest, uv.StatusCode) -> None)
 
         :rtype:
-            uv.UDPSendRequest
-        """
+            uv.UDPSendRequest | uv.CompletedSend
+        """
+        if self.send_fast_path and not self.closing:
+            buffers = library.make_uv_buffers(buffers)
+            c_sockaddr = dns.make_c_sockaddr(*address)
+            code = lib.uv_udp_try_send(self.uv_udp, buffers, len(buffers), c_sockaddr)
+            if code >= 0:
+                return CompletedSend(self, on_send)
         return UDPSendRequest(self, buffers, address, on_send)
 
     def try_send(self, buffers, address):
@@ -350,7 +435,7 @@ class UDP(handle.UVHandle):
             address tuple `(ip, port, flowinfo=0, scope_id=0)`
 
         :type buffers:
-            tuple[bytes] | list[bytes] | bytes
+            tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
         :type address:
             tuple | uv.Address4 | uv.Address6
 
@@ -361,12 +446,40 @@ class UDP(handle.UVHandle):
         """
         if self.closing:
             raise error.ClosedHandleError()
+        status, sent = self.try_send_status(buffers, address)
+        if status != error.StatusCodes.SUCCESS:  # pragma: no cover
+            raise error.UVError(status)
+        return sent
+
+    def try_send_status(self, buffers, address):
+        """
+        Same as :func:`try_send` but returns the status instead of
+        raising an exception, e.g. :class:`uv.StatusCodes.EAGAIN` if the
+        datagram could not be sent immediately.
+
+        :param buffers:
+            data which should be send
+        :param address:
+            address tuple `(ip, port, flowinfo=0, scope_id=0)`
+
+        :type buffers:
+            tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
+        :type address:
+            tuple | uv.Address4 | uv.Address6
+
+        :return:
+            status and number of bytes sent
+        :rtype:
+            (uv.StatusCodes, int)
+        """
+        if self.closing:
+            return error.StatusCodes.EBADF, 0
         c_sockaddr = dns.make_c_sockaddr(*address)
         uv_buffers = library.make_uv_buffers(buffers)
         code = lib.uv_udp_try_send(self.uv_udp, uv_buffers, len(uv_buffers), c_sockaddr)
-        if code < 0:  # pragma: no cover
-            raise error.UVError(code)
-        return code
+        if code < 0:
+            return error.StatusCodes.get(code), 0
+        return error.StatusCodes.SUCCESS, code
 
     def receive_start(self, on_receive=None):
         """
@@ -391,6 +504,8 @@ class UDP(handle.UVHandle):
         if self.closing:
             raise error.ClosedHandleError()
         self.on_receive = on_receive or self.on_receive
+        if self.read_budget is not None:
+            self.read_budget.throttled = False
         code = lib.uv_udp_recv_start(self.uv_udp, handle.uv_alloc_cb, uv_udp_recv_cb)
         if code != error.StatusCodes.SUCCESS:
             raise error.UVError(code)
@@ -405,11 +520,45 @@ class UDP(handle.UVHandle):
         """
         if self.closing:
             return
+        if self.read_budget is not None:
+            self.read_budget.throttled = False
         code = lib.uv_udp_recv_stop(self.uv_udp)
         if code != error.StatusCodes.SUCCESS:
             raise error.UVError(code)
         self.clear_pending()
 
+    def set_read_budget(self, max_bytes=None, max_callbacks=None):
+        """
+        Limit the number of bytes or receive callbacks per loop
+        iteration. A handle which exceeds its budget stops receiving
+        until the loop has finished polling for IO and continues within
+        the next iteration. Throttled handles are reported by
+        :func:`uv.Loop.read_throttle_report`. Without arguments the
+        budget is removed.
+
+        :param max_bytes:
+            maximal number of bytes received per loop iteration
+        :param max_callbacks:
+            maximal number of receive callbacks per loop iteration
+
+        :type max_bytes:
+            int | None
+        :type max_callbacks:
+            int | None
+        """
+        budget = self.read_budget
+        self.read_budget = handle.ReadBudget.create(max_bytes, max_callbacks)
+        if budget is not None and budget.throttled and not self.closing:
+            self._resume_reading()
+
+    def _pause_reading(self):
+        lib.uv_udp_recv_stop(self.uv_udp)
+
+    def _resume_reading(self):
+        code = lib.uv_udp_recv_start(self.uv_udp, handle.uv_alloc_cb, uv_udp_recv_cb)
+        if code != error.StatusCodes.SUCCESS:
+            raise error.UVError(code)
+
     def set_membership(self, multicast_address, membership, interface_address=None):
         """
         Set membership for a multicast address
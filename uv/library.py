@@ -61,6 +61,38 @@ else:
     lib = uvcffi.lib
 
 
+extern_callbacks = not trace_uvcffi and hasattr(ffi, 'def_extern')
+
+
+def c_callback(callback_type, name=None):
+    """
+    Decorator which turns a Python function into a C callback of the
+    given type. If the base library has been compiled in API-mode with
+    a matching `extern "Python"` declaration (see `cffi_callbacks.c`)
+    the function is attached to it, otherwise a libffi closure is
+    created with `ffi.callback`. The extern name is the function's name
+    prefixed with `python_`.
+
+    :param callback_type:
+        C type of the callback
+    :param name:
+        name of the extern declaration without prefix (defaults to the
+        decorated function's name)
+
+    :type callback_type:
+        unicode
+    :type name:
+        unicode
+    """
+    def decorator(function):
+        extern_name = 'python_' + (name or function.__name__)
+        if extern_callbacks and hasattr(lib, extern_name):
+            ffi.def_extern(name=extern_name)(function)
+            return getattr(lib, extern_name)
+        return ffi.callback(callback_type, function)
+    return decorator
+
+
 Version = collections.namedtuple('Version', ['string', 'major', 'minor', 'patch'])
 version_string = ffi.string(lib.uv_version_string()).decode()
 version_hex = lib.uv_version()
@@ -113,6 +145,29 @@ def uv_buffer_get(uv_buffer):
     return UVBuffer(lib.py_uv_buf_get(uv_buffer, length_pointer), length_pointer[0])
 
 
+def uv_buffers_size(uv_buffers):
+    """
+    Get the total length of an array of libuv buffers.
+
+    :param uv_buffers:
+        array of libuv buffers
+
+    :type uv_buffers:
+        ffi.CData[uv_buf_t[]]
+
+    :return:
+        total length in bytes
+    :rtype:
+        int
+    """
+    length_pointer = ffi.new('unsigned long*')
+    size = 0
+    for index in range(len(uv_buffers)):
+        lib.py_uv_buf_get(uv_buffers + index, length_pointer)
+        size += length_pointer[0]
+    return size
+
+
 _c_dependencies = weakref.WeakKeyDictionary()
 
 
@@ -123,18 +178,153 @@ def c_require(structure, *requirements):
         _c_dependencies[structure] = [requirements]
 
 
-def make_uv_buffers(iterable_or_bytes):
-    if isinstance(iterable_or_bytes, bytes):
-        buffers = (iterable_or_bytes, )
-    elif isinstance(iterable_or_bytes, (list, tuple)):
-        buffers = iterable_or_bytes
-    elif isinstance(iterable_or_bytes, collections.Iterable):
-        buffers = [bytes(item) for item in iterable_or_bytes]
+def make_c_buffer(item):
+    """
+    Make a C buffer from an object supporting the buffer protocol. The
+    memory of the object is used directly if possible, otherwise its
+    contents are copied.
+
+    :param item:
+        object supporting the buffer protocol
+
+    :type item:
+        bytes | bytearray | memoryview | Any
+
+    :return:
+        buffer information `(base, len)`
+    :rtype:
+        UVBuffer[ffi.CData[char*], int]
+    """
+    try:
+        c_base = ffi.from_buffer(item)
+    except (BufferError, TypeError, ValueError):
+        # older versions of cffi refuse read-only buffers like bytes, non
+        # contiguous buffers are never accepted — fall back to copying
+        data = bytes(item)
+        return UVBuffer(ffi.new('char[]', data), len(data))
+    return UVBuffer(c_base, len(c_base))
+
+
+def make_uv_buffers(buffers):
+    """
+    Make an array of libuv buffers from one or multiple objects which
+    support the buffer protocol (e.g. :class:`bytes`, :class:`bytearray`,
+    :class:`memoryview` or :class:`mmap.mmap`). The memory of those
+    objects is passed to libuv without copying, they are kept alive as
+    long as the returned array is alive.
+
+    .. note::
+        Mutable objects must not be modified until the corresponding
+        write or send request has finished.
+
+    :param buffers:
+        object or list of objects supporting the buffer protocol
+
+    :type buffers:
+        tuple[bytes] | list[bytes] | bytes | bytearray | memoryview | Any
+
+    :return:
+        array of libuv buffers
+    :rtype:
+        ffi.CData[uv_buf_t[]]
+    """
+    if is_uv_buffers(buffers):
+        return buffers
+    if isinstance(buffers, (list, tuple)):
+        c_buffers = [make_c_buffer(item) for item in buffers]
+    elif isinstance(buffers, (bytes, bytearray, memoryview)):
+        c_buffers = [make_c_buffer(buffers)]
     else:
-        raise Exception('fix me')
-    c_buffers = [ffi.new('char[]', item) for item in buffers]
-    uv_buffers = ffi.new('uv_buf_t[]', len(buffers))
+        try:
+            c_base = ffi.from_buffer(buffers)
+        except TypeError:
+            c_buffers = [make_c_buffer(item) for item in buffers]
+        else:
+            c_buffers = [UVBuffer(c_base, len(c_base))]
+    uv_buffers = ffi.new('uv_buf_t[]', len(c_buffers))
     c_require(uv_buffers, c_buffers)
-    for index, c_base in enumerate(c_buffers):
-        lib.py_uv_buf_set(uv_buffers + index, c_base, len(c_base) - 1)
+    for index, (c_base, length) in enumerate(c_buffers):
+        lib.py_uv_buf_set(uv_buffers + index, c_base, length)
     return uv_buffers
+
+
+def is_uv_buffers(obj):
+    """
+    Check whether the object is an array of libuv buffers as created by
+    :func:`make_uv_buffers`.
+
+    :type obj:
+        Any
+
+    :rtype:
+        bool
+    """
+    return isinstance(obj, ffi.CData) and ffi.typeof(obj) == ffi.typeof('uv_buf_t[]')
+
+
+def advance_uv_buffers(uv_buffers, offset):
+    """
+    Make an array of libuv buffers which references the memory of the
+    given array without its first `offset` bytes, e.g. the part of the
+    data which has not been written by a partial write. The source array
+    is kept alive as long as the returned array is alive.
+
+    :param uv_buffers:
+        array of libuv buffers
+    :param offset:
+        number of bytes to skip
+
+    :type uv_buffers:
+        ffi.CData[uv_buf_t[]]
+    :type offset:
+        int
+
+    :return:
+        array of libuv buffers
+    :rtype:
+        ffi.CData[uv_buf_t[]]
+    """
+    length_pointer = ffi.new('unsigned long*')
+    remaining = []
+    for index in range(len(uv_buffers)):
+        c_base = lib.py_uv_buf_get(uv_buffers + index, length_pointer)
+        length = length_pointer[0]
+        if offset >= length:
+            offset -= length
+            continue
+        remaining.append((c_base + offset, length - offset))
+        offset = 0
+    advanced = ffi.new('uv_buf_t[]', len(remaining))
+    c_require(advanced, uv_buffers)
+    for index, (c_base, length) in enumerate(remaining):
+        lib.py_uv_buf_set(advanced + index, c_base, length)
+    return advanced
+
+
+def merge_uv_buffers(uv_buffers_list):
+    """
+    Merge multiple arrays of libuv buffers into one array without copying
+    the referenced memory. The source arrays and therefore the memory
+    they reference are kept alive as long as the merged array is alive.
+
+    :param uv_buffers_list:
+        arrays of libuv buffers to merge
+
+    :type uv_buffers_list:
+        list[ffi.CData[uv_buf_t[]]]
+
+    :return:
+        array of libuv buffers
+    :rtype:
+        ffi.CData[uv_buf_t[]]
+    """
+    if len(uv_buffers_list) == 1:
+        return uv_buffers_list[0]
+    merged = ffi.new('uv_buf_t[]', sum(len(uv_buffers) for uv_buffers in uv_buffers_list))
+    c_require(merged, uv_buffers_list)
+    index = 0
+    for uv_buffers in uv_buffers_list:
+        for position in range(len(uv_buffers)):
+            merged[index] = uv_buffers[position]
+            index += 1
+    return merged
@@ -17,9 +17,13 @@ from __future__ import print_function, unicode_literals, division, absolute_impo
 
 import abc
 import collections
+import heapq
+import itertools
+import math
 import sys
 import threading
 import traceback
+import weakref
 
 from . import base, common, error, library
 from .library import ffi, lib
@@ -60,6 +64,18 @@ class RunModes(common.Enumeration):
     :type: uv.RunModes
     """
 
+    BUSY_POLL = 0x100
+    """
+    Run the event loop like :attr:`uv.RunModes.DEFAULT` but instead of
+    blocking for IO right away poll for IO without blocking for
+    :attr:`uv.Loop.busy_poll_time` microseconds after each wakeup. Only
+    if nothing happens within this time the loop blocks for IO. This
+    trades CPU time for a lower wakeup latency. Statistics are provided
+    by :func:`uv.Loop.busy_poll_stats`.
+
+    :type: uv.RunModes
+    """
+
 
 def default_excepthook(loop, exc_type, exc_value, exc_traceback):  # pragma: no cover
     """
@@ -187,11 +203,849 @@ class DefaultAllocator(Allocator):
         return bytes(ffi.buffer(c_base, length)) if length > 0 else b''
 
 
-@ffi.callback('uv_walk_cb')
-def uv_walk_cb(uv_handle, c_handles_set):
-    handle = base.BaseHandle.detach(uv_handle)
-    if handle is not None:
-        ffi.from_handle(c_handles_set).add(handle)
+def _chunk_view(c_base, length, on_collect):
+    """
+    Create a memoryview of `length` bytes at `c_base` which keeps an
+    owner object alive. The owner, and therefore `on_collect`, is only
+    garbage collected after the view and all views derived from it.
+    """
+    c_owner = ffi.gc(ffi.cast('char*', c_base), on_collect)
+    return memoryview(ffi.buffer(c_owner, length))
+
+
+class PooledBuffer(object):
+    """
+    Read result of :class:`uv.loop.PoolAllocator` and, with zero copy
+    reads, :class:`uv.loop.AdaptiveAllocator`. Provides access to
+    the data read as a :class:`memoryview` into the allocator's memory
+    pool. The underlying chunk should be given back to the pool either
+    explicitly by calling :func:`release` or by using the buffer as a
+    context manager. Otherwise the chunk is given back once the buffer
+    and all views of the data have been garbage collected.
+
+    .. warning::
+        The memoryview must not be used after the buffer has been
+        released explicitly because the chunk might already be reused
+        by another read. This includes pending write requests of the
+        data.
+
+    :param allocator:
+        allocator the chunk belongs to
+    :param index:
+        index of the chunk within the allocator's memory pool
+    :param data:
+        view of the data which has been read
+
+    :type allocator:
+        uv.loop.PoolAllocator | uv.loop.AdaptiveAllocator
+    :type index:
+        int
+    :type data:
+        memoryview
+    """
+
+    __slots__ = ['allocator', 'index', 'data']
+
+    def __init__(self, allocator, index, data):
+        self.allocator = allocator
+        self.index = index
+        self.data = data
+        """
+        View of the data which has been read or `None` if the buffer
+        has already been released.
+
+        :readonly:
+            True
+        :type:
+            memoryview | None
+        """
+
+    def __len__(self):
+        return 0 if self.data is None else len(self.data)
+
+    def __enter__(self):
+        return self.data
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.release()
+
+    @property
+    def released(self):
+        """
+        `True` if the buffer has been released, `False` otherwise.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        return self.data is None
+
+    def tobytes(self):
+        """
+        Copy the data into a new :class:`bytes` object.
+
+        :rtype:
+            bytes
+        """
+        return b'' if self.data is None else self.data.tobytes()
+
+    def release(self):
+        """
+        Give the chunk back to the memory pool. Calling this method
+        multiple times has no effect.
+        """
+        if self.data is not None:
+            self.data = None
+            self.allocator.release(self.index)
+
+
+class PoolAllocator(Allocator):
+    """
+    Read buffer allocator which hands out fixed-size chunks of a
+    preallocated memory pool. Instead of copying the data to a new
+    :class:`bytes` object it passes a :class:`uv.loop.PooledBuffer`
+    referencing the read chunk to the read callback. If all chunks are
+    in use the allocator falls back to the behavior of the default
+    allocator and passes a :class:`bytes` object.
+
+    :param chunk_size:
+        size of each chunk in bytes
+    :param chunk_count:
+        number of chunks in the memory pool
+
+    :type chunk_size:
+        int
+    :type chunk_count:
+        int
+    """
+
+    def __init__(self, chunk_size=2**16, chunk_count=64):
+        self.chunk_size = chunk_size
+        self.chunk_count = chunk_count
+
+        self.c_pool = ffi.new('char[]', chunk_size * chunk_count)
+        self.c_pool_address = int(ffi.cast('uintptr_t', self.c_pool))
+
+        self.free_chunks = list(range(chunk_count - 1, -1, -1))
+        self.owners = {}
+        self.serials = itertools.count()
+
+        self.fallback = DefaultAllocator(chunk_size)
+        self.fallbacks = 0
+        """
+        Number of allocations which have been served by the fallback
+        allocator because all chunks were in use.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+
+    @property
+    def available(self):
+        """
+        Number of chunks which are currently not in use.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        return len(self.free_chunks)
+
+    def allocate(self, handle, suggested_size, uv_buffer):
+        if self.free_chunks:
+            index = self.free_chunks.pop()
+            c_base = self.c_pool + index * self.chunk_size
+            library.uv_buffer_set(uv_buffer, c_base, self.chunk_size)
+        else:
+            self.fallbacks += 1
+            self.fallback.allocate(handle, suggested_size, uv_buffer)
+
+    def finalize(self, handle, length, uv_buffer):
+        c_base = library.uv_buffer_get(uv_buffer).base
+        offset = int(ffi.cast('uintptr_t', c_base)) - self.c_pool_address
+        if not 0 <= offset < self.chunk_size * self.chunk_count:
+            return self.fallback.finalize(handle, length, uv_buffer)
+        index = offset // self.chunk_size
+        if length <= 0:
+            self.free_chunks.append(index)
+            return b''
+        serial = self.owners[index] = next(self.serials)
+        data = _chunk_view(c_base, length, self._collect(index, serial))
+        return PooledBuffer(self, index, data)
+
+    def _collect(self, index, serial):
+        def callback(_):
+            # the chunk might already have been released and reused
+            if self.owners.get(index) == serial:
+                self.release(index)
+        return callback
+
+    def release(self, index):
+        """
+        Give the chunk with the given index back to the pool.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. Use :func:`uv.loop.PooledBuffer.release`
+            instead.
+
+        :type index:
+            int
+        """
+        if self.owners.pop(index, None) is not None:
+            self.free_chunks.append(index)
+
+
+_new_uncleared = ffi.new_allocator(should_clear_after_alloc=False)
+
+
+class AdaptiveAllocator(Allocator):
+    """
+    Read buffer allocator which adapts the read size of every stream to
+    its recent reads, similar to TCP receive buffer autotuning. Sizes
+    are powers of two between `min_size` and `max_size`. If a read fills
+    the buffer the size of the stream doubles, if `shrink_after`
+    consecutive reads would have fitted into half of the buffer it is
+    halved. Chatty streams therefore read into small buffers while bulk
+    transfers read up to `max_size` bytes per callback.
+
+    Buffers are cached per size and reused. The memory of all buffers is
+    limited by `memory_limit`, if the limit is reached cached buffers
+    are dropped, smaller buffers are used and finally reads fall back to
+    one shared buffer of `max_size` bytes. Handles other than streams,
+    e.g. UDP handles, always read with libuv's suggested size to not
+    truncate datagrams.
+
+    By default the data is copied into a :class:`bytes` object and the
+    buffer is reused immediately. With `zero_copy` the read callback
+    receives a :class:`uv.loop.PooledBuffer` referencing the buffer
+    instead, which has to be released as with :class:`PoolAllocator`.
+
+    :param min_size:
+        minimal read size in bytes
+    :param max_size:
+        maximal read size in bytes
+    :param initial_size:
+        read size of new streams in bytes
+    :param memory_limit:
+        maximal memory of all buffers in bytes
+    :param shrink_after:
+        number of small reads after which the read size is halved
+    :param zero_copy:
+        pass buffers instead of copies to the read callbacks
+
+    :type min_size:
+        int
+    :type max_size:
+        int
+    :type initial_size:
+        int
+    :type memory_limit:
+        int
+    :type shrink_after:
+        int
+    :type zero_copy:
+        bool
+    """
+
+    def __init__(self, min_size=2**10, max_size=2**20, initial_size=2**14,
+                 memory_limit=2**26, shrink_after=4, zero_copy=False):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.initial_size = min(max(initial_size, min_size), max_size)
+        self.memory_limit = memory_limit
+        self.shrink_after = shrink_after
+        self.zero_copy = zero_copy
+
+        self.sizes = weakref.WeakKeyDictionary()
+        self.cached = collections.defaultdict(list)
+        self.in_use = {}
+        self.owners = {}
+        self.serials = itertools.count()
+        self.memory = 0
+        """
+        Memory of all cached and used buffers in bytes.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+
+        self.fallback = DefaultAllocator(max_size)
+        self.counters = {'reads': 0, 'bytes': 0, 'grows': 0, 'shrinks': 0,
+                         'fallbacks': 0, 'dropped': 0}
+
+    def size_of(self, handle):
+        """
+        Current read size of the given handle in bytes.
+
+        :type handle:
+            uv.Handle
+
+        :rtype:
+            int
+        """
+        try:
+            return self.sizes.get(handle, (self.initial_size, 0))[0]
+        except TypeError:
+            # handles without weak references do not adapt
+            return self.initial_size
+
+    def allocate(self, handle, suggested_size, uv_buffer):
+        adaptive = getattr(handle, 'uv_stream', None) is not None
+        size = self.size_of(handle) if adaptive else suggested_size
+        c_buffer = self._take(size)
+        while c_buffer is None and adaptive and size > self.min_size:
+            size //= 2
+            c_buffer = self._take(size)
+        if c_buffer is None:
+            self.counters['fallbacks'] += 1
+            self.fallback.allocate(handle, suggested_size, uv_buffer)
+            return
+        self.in_use[int(ffi.cast('uintptr_t', c_buffer))] = c_buffer, size
+        library.uv_buffer_set(uv_buffer, c_buffer, size)
+
+    def _take(self, size):
+        cached = self.cached.get(size)
+        if cached:
+            return cached.pop()
+        if self.memory + size > self.memory_limit:
+            # drop cached buffers of other sizes to make room
+            for other_size, other_cached in self.cached.items():
+                while other_cached and self.memory + size > self.memory_limit:
+                    other_cached.pop()
+                    self.memory -= other_size
+                    self.counters['dropped'] += 1
+            if self.memory + size > self.memory_limit:
+                return None
+        self.memory += size
+        return _new_uncleared('char[]', size)
+
+    def finalize(self, handle, length, uv_buffer):
+        c_base = library.uv_buffer_get(uv_buffer).base
+        entry = self.in_use.pop(int(ffi.cast('uintptr_t', c_base)), None)
+        if entry is None:
+            return self.fallback.finalize(handle, length, uv_buffer)
+        c_buffer, size = entry
+        if length > 0:
+            self.counters['reads'] += 1
+            self.counters['bytes'] += length
+            if getattr(handle, 'uv_stream', None) is not None:
+                self._adapt(handle, length, size)
+        if length <= 0 or not self.zero_copy:
+            data = bytes(ffi.buffer(c_buffer, length)) if length > 0 else b''
+            self.cached[size].append(c_buffer)
+            return data
+        address = int(ffi.cast('uintptr_t', c_buffer))
+        self.in_use[address] = entry
+        serial = self.owners[address] = next(self.serials)
+        data = _chunk_view(c_buffer, length, self._collect(address, serial))
+        return PooledBuffer(self, address, data)
+
+    def _adapt(self, handle, length, size):
+        try:
+            current, small_reads = self.sizes.get(handle, (self.initial_size, 0))
+        except TypeError:
+            return
+        if length >= size:
+            if size >= current and current < self.max_size:
+                current = min(current * 2, self.max_size)
+                self.counters['grows'] += 1
+            small_reads = 0
+        elif length <= current // 2 and current > self.min_size:
+            small_reads += 1
+            if small_reads >= self.shrink_after:
+                current = max(current // 2, self.min_size)
+                self.counters['shrinks'] += 1
+                small_reads = 0
+        else:
+            small_reads = 0
+        self.sizes[handle] = current, small_reads
+
+    def _collect(self, address, serial):
+        def callback(_):
+            # the buffer might already have been released and reused
+            if self.owners.get(address) == serial:
+                self.release(address)
+        return callback
+
+    def release(self, address):
+        """
+        Give the buffer with the given address back to the cache.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. Use :func:`uv.loop.PooledBuffer.release`
+            instead.
+
+        :type address:
+            int
+        """
+        if self.owners.pop(address, None) is not None:
+            c_buffer, size = self.in_use.pop(address)
+            self.cached[size].append(c_buffer)
+
+    def stats(self, reset=False):
+        """
+        Statistics of the allocator. The result is a dictionary with the
+        number of non-empty reads (`reads`) and bytes read (`bytes`),
+        the average read size (`average_read`), the number of times a
+        read size has been doubled (`grows`) or halved (`shrinks`),
+        allocations served by the shared fallback buffer (`fallbacks`),
+        cached buffers dropped because of the memory limit (`dropped`),
+        the current `memory` of all buffers and the number of streams
+        by read size (`sizes`).
+
+        :param reset:
+            start counting from zero after the statistics are returned
+
+        :type reset:
+            bool
+
+        :rtype:
+            dict[unicode, int | float | dict[int, int]]
+        """
+        stats = dict(self.counters)
+        stats['average_read'] = stats['bytes'] / stats['reads'] if stats['reads'] else 0.0
+        stats['memory'] = self.memory
+        sizes = collections.Counter(size for size, _ in self.sizes.values())
+        stats['sizes'] = dict(sizes)
+        if reset:
+            for name in self.counters:
+                self.counters[name] = 0
+        return stats
+
+
+class ScheduledCall(object):
+    """
+    Callback scheduled with :func:`uv.Loop.call_at` or
+    :func:`uv.Loop.call_after`. Scheduled calls are ordered by their
+    deadline and, for equal deadlines, by the order they have been
+    scheduled in.
+
+    :param scheduler:
+        scheduler the call belongs to
+    :param deadline:
+        loop time in milliseconds the call is due at
+    :param sequence:
+        sequence number used to order calls with equal deadlines
+    :param callback:
+        callback which should be called
+    :param arguments:
+        arguments that should be passed to the callback
+    :param keywords:
+        keyword arguments that should be passed to the callback
+
+    :type scheduler:
+        uv.loop.TimerScheduler
+    :type deadline:
+        int | float
+    :type sequence:
+        int
+    :type callback:
+        callable
+    :type arguments:
+        tuple
+    :type keywords:
+        dict
+    """
+
+    __slots__ = ['scheduler', 'deadline', 'sequence', 'callback', 'arguments',
+                 'keywords']
+
+    def __init__(self, scheduler, deadline, sequence, callback, arguments, keywords):
+        self.scheduler = scheduler
+        self.deadline = deadline
+        """
+        Loop time in milliseconds the call is due at.
+
+        :readonly:
+            True
+        :type:
+            int | float
+        """
+        self.sequence = sequence
+        self.callback = callback
+        self.arguments = arguments
+        self.keywords = keywords
+
+    def __lt__(self, other):
+        if self.deadline == other.deadline:
+            return self.sequence < other.sequence
+        return self.deadline < other.deadline
+
+    def __repr__(self):
+        state = 'pending' if self.pending else 'done'
+        return '<ScheduledCall deadline={}, callback={!r}, {}>'.format(self.deadline,
+                                                                      self.callback,
+                                                                      state)
+
+    @property
+    def pending(self):
+        """
+        Call has neither been executed nor cancelled yet.
+
+        :readonly:
+            True
+        :rtype:
+            bool
+        """
+        return self.scheduler is not None
+
+    def cancel(self):
+        """
+        Cancel the call. Cancelling a call which has already been
+        executed or cancelled has no effect. This is an O(1)
+        operation, the call is removed from the scheduler lazily.
+        """
+        scheduler = self.scheduler
+        if scheduler is not None:
+            self.scheduler = None
+            self.callback = self.arguments = self.keywords = None
+            scheduler.on_cancel(self)
+
+
+class TimerScheduler(object):
+    """
+    Multiplexes an arbitrary number of scheduled calls onto a single
+    internal libuv timer. Calls are kept in a binary heap ordered by
+    their deadline. Scheduling is O(log n), cancelling is O(1) because
+    cancelled calls are only marked and either skipped when they reach
+    the top of the heap or dropped when they make up more than half
+    of the heap.
+
+    .. note::
+        Every loop creates its scheduler automatically, use
+        :func:`uv.Loop.call_at` and :func:`uv.Loop.call_after` to
+        schedule calls.
+
+    :param base_loop:
+        internal loop of the event loop the scheduler belongs to
+
+    :type base_loop:
+        uv.base.BaseLoop
+    """
+
+    __slots__ = ['base_loop', 'calls', 'sequence', 'cancelled', 'armed_deadline']
+
+    COMPACT_THRESHOLD = 256
+    """
+    Minimal number of cancelled calls before the heap is compacted.
+
+    :type: int
+    """
+
+    def __init__(self, base_loop):
+        # the internal loop only references the user loop weakly
+        self.base_loop = base_loop
+        self.calls = []
+        self.sequence = 0
+        self.cancelled = 0
+        """
+        Number of cancelled calls still stored in the heap.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.armed_deadline = None
+
+    def __len__(self):
+        """
+        Number of pending calls.
+        """
+        return len(self.calls) - self.cancelled
+
+    def schedule(self, deadline, callback, arguments, keywords):
+        """
+        Schedule a callback to be called at the given deadline.
+
+        :param deadline:
+            loop time in milliseconds the call is due at
+        :param callback:
+            callback which should be called
+        :param arguments:
+            arguments that should be passed to the callback
+        :param keywords:
+            keyword arguments that should be passed to the callback
+
+        :type deadline:
+            int | float
+        :type callback:
+            callable
+        :type arguments:
+            tuple
+        :type keywords:
+            dict
+
+        :rtype:
+            uv.loop.ScheduledCall
+        """
+        self.sequence += 1
+        call = ScheduledCall(self, deadline, self.sequence, callback, arguments, keywords)
+        heapq.heappush(self.calls, call)
+        if self.armed_deadline is None or deadline < self.armed_deadline:
+            self.arm()
+        return call
+
+    def on_cancel(self, call):
+        """
+        Called after a scheduled call has been cancelled.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :type call:
+            uv.loop.ScheduledCall
+        """
+        self.cancelled += 1
+        if self.cancelled == len(self.calls):
+            del self.calls[:]
+            self.cancelled = 0
+            self.arm()
+        elif (self.cancelled > self.COMPACT_THRESHOLD and
+              self.cancelled * 2 > len(self.calls)):
+            self.calls = [pending for pending in self.calls if pending.pending]
+            heapq.heapify(self.calls)
+            self.cancelled = 0
+
+    def arm(self):
+        """
+        Start or stop the internal timer according to the earliest
+        pending deadline.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        calls = self.calls
+        while calls and not calls[0].pending:
+            heapq.heappop(calls)
+            self.cancelled -= 1
+        base_loop = self.base_loop
+        if base_loop.closed:
+            return
+        if not calls:
+            if self.armed_deadline is not None:
+                self.armed_deadline = None
+                base_loop.stop_internal_timer()
+            return
+        deadline = calls[0].deadline
+        if deadline != self.armed_deadline:
+            self.armed_deadline = deadline
+            now = lib.uv_now(base_loop.uv_loop)
+            base_loop.start_internal_timer(max(0, int(math.ceil(deadline - now))))
+
+    def on_timer(self):
+        """
+        Run all calls which are due. Calls scheduled by the callbacks
+        run at the earliest on the next timer expiration, even if they
+        are already due.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        base_loop = self.base_loop
+        now = lib.uv_now(base_loop.uv_loop)
+        metrics = base_loop.metrics
+        last = self.sequence
+        self.armed_deadline = None
+        # the heap might be replaced by a callback cancelling calls
+        while self.calls and self.calls[0].deadline <= now:
+            if self.calls[0].sequence > last:
+                break
+            call = heapq.heappop(self.calls)
+            if not call.pending:
+                self.cancelled -= 1
+                continue
+            call.scheduler = None
+            callback, arguments, keywords = call.callback, call.arguments, call.keywords
+            call.callback = call.arguments = call.keywords = None
+            if metrics is not None:
+                metrics.on_lag(now - call.deadline)
+            try:
+                callback(*arguments, **keywords)
+            except Exception:
+                user_loop = base_loop.user_loop
+                if user_loop is not None:
+                    user_loop.handle_exception()
+        self.arm()
+
+
+MetricsSummary = collections.namedtuple('MetricsSummary', ['mean', 'minimum', 'maximum',
+                                                           'p50', 'p90', 'p99'])
+
+
+def summarize(values, scale=1):
+    """
+    Summarize the given values with their mean, extrema and percentiles.
+
+    :param values:
+        values which should be summarized
+    :param scale:
+        factor the values are divided by
+
+    :type values:
+        collections.Iterable[int | float]
+    :type scale:
+        int | float
+
+    :rtype:
+        uv.loop.MetricsSummary
+    """
+    values = sorted(values)
+    if not values:
+        return MetricsSummary(0, 0, 0, 0, 0, 0)
+
+    def percentile(fraction):
+        return values[min(len(values) - 1, int(math.ceil(fraction * len(values))) - 1)]
+
+    return MetricsSummary(sum(values) / len(values) / scale, values[0] / scale,
+                          values[-1] / scale, percentile(0.5) / scale,
+                          percentile(0.9) / scale, percentile(0.99) / scale)
+
+
+class LoopMetrics(object):
+    """
+    Collector of per iteration metrics of an event loop. An iteration
+    starts when the internal prepare handle runs right before the loop
+    polls for IO and ends with the next one. The time between the
+    prepare handle and the internal check handle, which runs right
+    after polling, minus the time spent in callbacks invoked while
+    polling is the time the loop has been blocked in poll.
+
+    Scheduling lag is the time scheduled calls (see
+    :func:`uv.Loop.call_at`) run after their deadline. A growing lag
+    indicates a saturated loop.
+
+    .. warning::
+        This class is only for internal purposes and is not part of the
+        official API. Use :func:`uv.Loop.enable_metrics` and
+        :func:`uv.Loop.metrics` instead.
+
+    :param window:
+        number of recent iterations the aggregates are computed from
+
+    :type window:
+        int
+    """
+
+    __slots__ = ['window', 'iterations', 'samples', 'lags', 'callbacks',
+                 'iteration_start', 'poll_start', 'poll_callback_time', 'poll_time',
+                 'callback_time', 'events']
+
+    def __init__(self, window=1024):
+        self.window = window
+        self.iterations = 0
+        self.samples = collections.deque(maxlen=window)
+        self.lags = collections.deque(maxlen=window)
+        self.callbacks = {}
+
+        self.iteration_start = None
+        self.poll_start = None
+        self.poll_callback_time = 0
+        self.poll_time = 0
+        self.callback_time = 0
+        self.events = 0
+
+    def finish_iteration(self, now):
+        """
+        Record the current iteration ending at the given point in time.
+
+        :param now:
+            current high resolution time in nanoseconds
+
+        :type now:
+            int
+        """
+        if self.iteration_start is not None:
+            self.iterations += 1
+            self.samples.append((now - self.iteration_start, self.poll_time,
+                                 self.callback_time, self.events))
+        self.iteration_start = None
+        self.poll_start = None
+        self.poll_time = 0
+        self.callback_time = 0
+        self.events = 0
+
+    def on_prepare(self):
+        """
+        Called right before the loop polls for IO.
+        """
+        now = lib.uv_hrtime()
+        self.finish_iteration(now)
+        self.iteration_start = self.poll_start = now
+        self.poll_callback_time = self.callback_time
+
+    def on_check(self):
+        """
+        Called right after the loop has polled for IO.
+        """
+        if self.poll_start is not None:
+            poll_callback_time = self.callback_time - self.poll_callback_time
+            self.poll_time = lib.uv_hrtime() - self.poll_start - poll_callback_time
+            self.poll_start = None
+
+    def on_callback(self, name, duration):
+        """
+        Record a callback which has been dispatched by the loop.
+
+        :param name:
+            name of the handle or request type
+        :param duration:
+            time spent in the callback in nanoseconds
+
+        :type name:
+            unicode
+        :type duration:
+            int
+        """
+        self.callback_time += duration
+        self.events += 1
+        self.callbacks[name] = self.callbacks.get(name, 0) + 1
+
+    def on_lag(self, lag):
+        """
+        Record the scheduling lag of a scheduled call.
+
+        :param lag:
+            lag in milliseconds
+
+        :type lag:
+            int | float
+        """
+        self.lags.append(lag)
+
+    def snapshot(self):
+        """
+        Compute the aggregates over the recent iterations. All times
+        are in milliseconds.
+
+        :rtype:
+            dict
+        """
+        samples = self.samples
+        iteration_time = sum(sample[0] for sample in samples)
+        callback_time = sum(sample[2] for sample in samples)
+        return {
+            'iterations': self.iterations,
+            'window': len(samples),
+            'iteration_time': summarize((sample[0] for sample in samples), 1e6),
+            'poll_time': summarize((sample[1] for sample in samples), 1e6),
+            'callback_time': summarize((sample[2] for sample in samples), 1e6),
+            'events': summarize(sample[3] for sample in samples),
+            'lag': summarize(self.lags),
+            'utilization': callback_time / iteration_time if iteration_time else 0.0,
+            'callbacks': dict(self.callbacks)
+        }
 
 
 class Loop(object):
@@ -206,7 +1060,8 @@ class Loop(object):
         error initializing the new event loop
 
     :param allocator:
-        read buffer allocator
+        read buffer allocator, e.g. :class:`uv.loop.AdaptiveAllocator`
+        to size the reads of every stream individually
     :param buffer_size:
         size of the default allocators read buffer
     :param default:
@@ -356,8 +1211,90 @@ class Loop(object):
 
         self.make_current()
         self.pending_structures = set()
-        self.pending_callbacks = collections.deque()
+        self.pending_callbacks = []
         self.pending_callbacks_lock = threading.RLock()
+        self.wakeup_pending = False
+
+        self.scheduler = TimerScheduler(self.base_loop)
+        """
+        Scheduler of the calls scheduled with :func:`uv.Loop.call_at`
+        and :func:`uv.Loop.call_after`.
+
+        :readonly:
+            True
+        :type:
+            uv.loop.TimerScheduler
+        """
+
+        self.completion_queue = None
+        """
+        Queue running the callbacks of requests which have been completed
+        immediately, created when the first such request is issued.
+
+        .. warning::
+            This attribute is only for internal purposes and is not part
+            of the official API.
+
+        :readonly:
+            True
+        :type:
+            uv.request.CompletionQueue | None
+        """
+        self.cork_flusher = None
+        """
+        Flusher of the automatically corked streams running on the loop,
+        created when the first write is corked.
+
+        .. warning::
+            This attribute is only for internal purposes and is not part
+            of the official API.
+
+        :readonly:
+            True
+        :type:
+            uv.handles.stream.CorkFlusher | None
+        """
+        self.read_throttler = None
+        """
+        Throttler of the handles running on the loop with a read budget,
+        created when the first budgeted read is accounted.
+
+        .. warning::
+            This attribute is only for internal purposes and is not part
+            of the official API.
+
+        :readonly:
+            True
+        :type:
+            uv.handle.ReadThrottler | None
+        """
+        self.splice_pollers = {}
+        """
+        Poll handles shared by the splice based forwarders running on
+        the loop by file descriptor.
+
+        .. warning::
+            This attribute is only for internal purposes and is not part
+            of the official API.
+
+        :readonly:
+            True
+        :type:
+            dict[int, uv.handles.forward.SplicePoller]
+        """
+
+        self.busy_poll_time = 50
+        """
+        Time in microseconds to poll for IO without blocking after each
+        wakeup when running in :attr:`uv.RunModes.BUSY_POLL` mode.
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.stop_requested = False
+        self.busy_poll_counters = [0, 0, 0, 0]
 
     @property
     def closed(self):
@@ -411,10 +1348,145 @@ class Loop(object):
         :rtype:
             set
         """
-        handles = set()
-        if not self.closed:
-            lib.uv_walk(self.uv_loop, uv_walk_cb, ffi.new_handle(handles))
-        return handles
+        return set(self.iter_handles())
+
+    def iter_handles(self, cls=None):
+        """
+        Iterate over the handles running on the loop which are instances
+        of the given class without walking all libuv handles. The loop
+        keeps an index of its handles by type which is updated whenever
+        a handle is initialized or closed.
+
+        :param cls:
+            class of the handles (defaults to all handles)
+
+        :type cls:
+            type
+
+        :return:
+            handles of the given class
+        :rtype:
+            collections.Iterator[uv.Handle]
+        """
+        if self.closed:
+            return
+        for handle_class, base_handles in list(self.base_loop.handle_index.items()):
+            if cls is not None and not issubclass(handle_class, cls):
+                continue
+            for base_handle in list(base_handles):
+                user_handle = base_handle.user_handle
+                if user_handle is not None:
+                    yield user_handle
+
+    def read_throttle_report(self, reset=True):
+        """
+        Report which streams and UDP handles have been paused because
+        they exceeded their read budget (see
+        :func:`uv.UVStream.set_read_budget`). The result maps handles to
+        the number of loop iterations they have been throttled in.
+
+        :param reset:
+            start counting from zero after the report
+
+        :type reset:
+            bool
+
+        :rtype:
+            dict[uv.Handle, int]
+        """
+        if self.read_throttler is None:
+            return {}
+        return self.read_throttler.report(reset)
+
+    def handle_counts(self, states=False):
+        """
+        Number of handles running on the loop by handle class. The
+        counts are maintained when handles are initialized or closed
+        and are available in constant time per class. Handles which
+        have been garbage collected but are not closed yet are included.
+
+        With `states` set the result maps each class to a dictionary
+        with the keys `total`, `active` and `referenced`. Because the
+        active and referenced state change with every start and stop
+        they are not indexed but queried from libuv for the handles of
+        each class.
+
+        :param states:
+            include the number of active and referenced handles
+
+        :type states:
+            bool
+
+        :rtype:
+            dict[type, int] | dict[type, dict[unicode, int]]
+        """
+        index = self.base_loop.handle_index
+        if not states:
+            return {cls: len(base_handles) for cls, base_handles in index.items()}
+        counts = {}
+        for cls, base_handles in list(index.items()):
+            active = referenced = 0
+            for base_handle in base_handles:
+                active += lib.uv_is_active(base_handle.uv_handle) != 0
+                referenced += lib.uv_has_ref(base_handle.uv_handle) != 0
+            counts[cls] = {'total': len(base_handles), 'active': active,
+                           'referenced': referenced}
+        return counts
+
+    @property
+    def request_pool_size(self):
+        """
+        Maximal number of finished requests kept per request type for
+        reuse. Pooling avoids allocating new C structures and CFFI
+        handles for every write, send, shutdown and connect request.
+        Set it to `0` to disable pooling.
+
+        :readonly:
+            False
+        :rtype:
+            int
+        """
+        return self.base_loop.request_pool_size
+
+    @request_pool_size.setter
+    def request_pool_size(self, size):
+        """
+        :param size:
+            maximal number of pooled requests per request type
+
+        :type size:
+            int
+        """
+        self.base_loop.request_pool_size = size
+        self.base_loop.trim_request_pools()
+
+    def request_pool_stats(self):
+        """
+        Get statistics of the request free lists by C request type,
+        e.g. `uv_write_t`. Each entry is a dictionary with the number of
+        requests served from the pool (`hits`), the number of newly
+        allocated requests (`misses`), the number of requests put back
+        onto the pool (`recycled`) or discarded because it was full
+        (`dropped`), the number of currently pooled requests
+        (`available`) and the `hit_rate`.
+
+        :return:
+            statistics by request type
+        :rtype:
+            dict[unicode, dict]
+        """
+        stats = {}
+        for request_type, pool in self.base_loop.request_pools.items():
+            total = pool.hits + pool.misses
+            stats[request_type.rstrip('*')] = {
+                'hits': pool.hits,
+                'misses': pool.misses,
+                'recycled': pool.recycled,
+                'dropped': pool.dropped,
+                'available': len(pool.requests),
+                'hit_rate': pool.hits / total if total else 0.0
+            }
+        return stats
 
     def fileno(self):
         """
@@ -498,7 +1570,63 @@ class Loop(object):
         if self.closed:
             raise error.ClosedLoopError()
         self.make_current()
-        return bool(lib.uv_run(self.uv_loop, mode))
+        if mode == RunModes.BUSY_POLL:
+            result = self._run_busy_poll()
+        else:
+            result = bool(lib.uv_run(self.uv_loop, mode))
+            # libuv resets its stop flag at the end of every run
+            self.stop_requested = False
+        if self.base_loop.metrics is not None:
+            # do not account the time between two runs to an iteration
+            self.base_loop.metrics.finish_iteration(lib.uv_hrtime())
+        return result
+
+    def _run_busy_poll(self):
+        uv_loop, counters = self.uv_loop, self.busy_poll_counters
+        spin_start = lib.uv_hrtime()
+        deadline = spin_start + self.busy_poll_time * 1000
+        while True:
+            alive = lib.uv_run(uv_loop, lib.UV_RUN_NOWAIT)
+            counters[0] += 1
+            if not alive or self.stop_requested:
+                break
+            now = lib.uv_hrtime()
+            if now < deadline:
+                continue
+            counters[1] += 1
+            counters[2] += now - spin_start
+            alive = lib.uv_run(uv_loop, lib.UV_RUN_ONCE)
+            spin_start = lib.uv_hrtime()
+            counters[3] += spin_start - now
+            if not alive or self.stop_requested:
+                break
+            deadline = spin_start + self.busy_poll_time * 1000
+        counters[2] += lib.uv_hrtime() - spin_start
+        self.stop_requested = False
+        return bool(alive) and not self.closed
+
+    def busy_poll_stats(self, reset=False):
+        """
+        Statistics of :attr:`uv.RunModes.BUSY_POLL` runs. The result is a
+        dictionary with the number of non-blocking polls (`spins`), the
+        number of times the loop blocked for IO (`parks`) and the time
+        spent spinning and blocked in milliseconds (`spin_time` and
+        `park_time`).
+
+        :param reset:
+            start counting from zero after the statistics are returned
+
+        :type reset:
+            bool
+
+        :rtype:
+            dict[unicode, int | float]
+        """
+        spins, parks, spin_time, park_time = self.busy_poll_counters
+        if reset:
+            self.busy_poll_counters[:] = [0, 0, 0, 0]
+        return {'spins': spins, 'parks': parks, 'spin_time': spin_time / 1e6,
+                'park_time': park_time / 1e6}
 
     def stop(self):
         """
@@ -509,6 +1637,7 @@ class Loop(object):
         """
         if self.closed:
             return
+        self.stop_requested = True
         lib.uv_stop(self.uv_loop)
 
     def close(self):
@@ -544,7 +1673,7 @@ class Loop(object):
         :type on_closed:
             ((uv.Handle) -> None) | ((Any, uv.Handle) -> None)
         """
-        for handle in self.handles:
+        for handle in list(self.iter_handles()):
             handle.close(on_closed)
 
     def call_later(self, callback, *arguments, **keywords):
@@ -571,7 +1700,207 @@ class Loop(object):
         """
         with self.pending_callbacks_lock:
             self.pending_callbacks.append((callback, arguments, keywords))
-            self.base_loop.wakeup()
+            if self.wakeup_pending:
+                return
+            self.wakeup_pending = True
+        self.base_loop.wakeup()
+
+    def call_later_many(self, calls):
+        """
+        Schedule multiple callbacks to run at some later point in time
+        in the given order. Compared to calling :func:`uv.Loop.call_later`
+        for each callback the lock is only taken once and the event loop
+        is woken up at most once.
+
+        This method is thread safe.
+
+        :param calls:
+            `(callback, arguments)` or `(callback, arguments, keywords)`
+            tuples of the callbacks which should run
+
+        :type calls:
+            collections.Iterable[tuple]
+        """
+        calls = [(call[0], call[1], call[2] if len(call) > 2 else {}) for call in calls]
+        if not calls:
+            return
+        with self.pending_callbacks_lock:
+            self.pending_callbacks.extend(calls)
+            if self.wakeup_pending:
+                return
+            self.wakeup_pending = True
+        self.base_loop.wakeup()
+
+    def call_at(self, deadline, callback, *arguments, **keywords):
+        """
+        Schedule a callback to run at the given loop time. All calls
+        share one internal timer, so scheduling a call is much cheaper
+        than creating a :class:`uv.Timer` handle. Like active timers,
+        pending calls keep the loop alive.
+
+        This method is not thread safe.
+
+        :raises uv.ClosedLoopError:
+            loop has already been closed
+
+        :param deadline:
+            loop time in milliseconds (see :attr:`uv.Loop.now`)
+        :param callback:
+            callback which should run at the given loop time
+        :param arguments:
+            arguments that should be passed to the callback
+        :param keywords:
+            keyword arguments that should be passed to the callback
+
+        :type deadline:
+            int | float
+        :type callback:
+            callable
+        :type arguments:
+            tuple
+        :type keywords:
+            dict
+
+        :return:
+            cancellable scheduled call
+        :rtype:
+            uv.loop.ScheduledCall
+        """
+        if self.closed:
+            raise error.ClosedLoopError()
+        return self.scheduler.schedule(deadline, callback, arguments, keywords)
+
+    def call_after(self, timeout, callback, *arguments, **keywords):
+        """
+        Schedule a callback to run after the given timeout. See
+        :func:`uv.Loop.call_at` for details.
+
+        This method is not thread safe.
+
+        :raises uv.ClosedLoopError:
+            loop has already been closed
+
+        :param timeout:
+            timeout in milliseconds
+        :param callback:
+            callback which should run after the timeout
+        :param arguments:
+            arguments that should be passed to the callback
+        :param keywords:
+            keyword arguments that should be passed to the callback
+
+        :type timeout:
+            int | float
+        :type callback:
+            callable
+        :type arguments:
+            tuple
+        :type keywords:
+            dict
+
+        :return:
+            cancellable scheduled call
+        :rtype:
+            uv.loop.ScheduledCall
+        """
+        if self.closed:
+            raise error.ClosedLoopError()
+        deadline = lib.uv_now(self.uv_loop) + timeout
+        return self.scheduler.schedule(deadline, callback, arguments, keywords)
+
+    def run_in_threadpool(self, function, *arguments, **keywords):
+        """
+        Run a callable in libuv's thread pool. The keyword argument
+        `on_done` is not passed to the callable but is used as the
+        callback of the returned :class:`uv.Work` request which runs in
+        the event loop's thread. See :class:`uv.Work` for details.
+
+        This method is not thread safe.
+
+        :raises uv.UVError:
+            error while queueing the request
+        :raises uv.ClosedLoopError:
+            loop has already been closed
+
+        :param function:
+            callable which should run in the thread pool
+        :param arguments:
+            arguments that should be passed to the callable
+        :param keywords:
+            keyword arguments that should be passed to the callable
+
+        :type function:
+            callable
+        :type arguments:
+            tuple
+        :type keywords:
+            dict
+
+        :return:
+            cancellable work request
+        :rtype:
+            uv.Work
+        """
+        from .work import Work
+        on_done = keywords.pop('on_done', None)
+        return Work(function, arguments, keywords, on_done=on_done, loop=self)
+
+    def enable_metrics(self, window=1024):
+        """
+        Start collecting per iteration metrics. The aggregates returned
+        by :func:`uv.Loop.metrics` are computed over the given number of
+        recent iterations. Collecting metrics adds a small overhead to
+        every callback, so it is disabled by default.
+
+        :raises uv.ClosedLoopError:
+            loop has already been closed
+
+        :param window:
+            number of recent iterations to compute the aggregates from
+
+        :type window:
+            int
+        """
+        if self.closed:
+            raise error.ClosedLoopError()
+        if self.base_loop.metrics is None or self.base_loop.metrics.window != window:
+            self.base_loop.start_metrics(LoopMetrics(window))
+
+    def disable_metrics(self):
+        """
+        Stop collecting per iteration metrics and discard the metrics
+        collected so far.
+        """
+        if not self.closed:
+            self.base_loop.stop_metrics()
+
+    def metrics(self):
+        """
+        Get the aggregates of the recent iterations or `None` if metrics
+        are not collected. The result is a dictionary with the following
+        keys, all times are in milliseconds:
+
+        - `iterations`: total number of iterations recorded
+        - `window`: number of iterations the aggregates are computed from
+        - `iteration_time`: duration of the iterations
+        - `poll_time`: time blocked polling for IO per iteration
+        - `callback_time`: time spent in Python callbacks per iteration
+        - `events`: number of callbacks dispatched per iteration
+        - `lag`: lag of scheduled calls behind their deadline
+        - `utilization`: fraction of time spent in Python callbacks
+        - `callbacks`: total number of callbacks by handle or request type
+
+        All entries except for `iterations`, `window`, `utilization` and
+        `callbacks` are :class:`uv.loop.MetricsSummary` tuples with the
+        mean, the extrema and the 50th, 90th and 99th percentiles.
+
+        :return:
+            metrics of the recent iterations
+        :rtype:
+            dict | None
+        """
+        metrics = self.base_loop.metrics
+        return None if metrics is None else metrics.snapshot()
 
     def reset_exception(self):
         """
@@ -589,16 +1918,15 @@ class Loop(object):
             This method is only for internal purposes and is not part
             of the official API. You should never call it directly!
         """
-        try:
-            while True:
-                with self.pending_callbacks_lock:
-                    callback, arguments, keywords = self.pending_callbacks.popleft()
-                try:
-                    callback(*arguments, **keywords)
-                except Exception:
-                    self.handle_exception()
-        except IndexError:
-            pass
+        with self.pending_callbacks_lock:
+            pending_callbacks, self.pending_callbacks = self.pending_callbacks, []
+            # callbacks submitted from now on need another wakeup
+            self.wakeup_pending = False
+        for callback, arguments, keywords in pending_callbacks:
+            try:
+                callback(*arguments, **keywords)
+            except Exception:
+                self.handle_exception()
 
     def handle_exception(self):
         """
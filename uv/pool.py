@@ -0,0 +1,475 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Pool of connected client streams keyed by their remote address.
+
+Connections are kept per `(host, port)` tuple (:class:`uv.TCP`) or path
+(:class:`uv.Pipe`) and reused instead of connecting for every request.
+While a connection is idle the pool reads from it, so connections closed
+by the peer are detected by end of file and dropped immediately. Idle
+connections are evicted by one shared timer after the idle timeout.
+
+If the limit of connections per key or in total is reached, checkouts
+wait in first-in first-out order until a connection is released or
+closed.
+"""
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import collections
+
+from . import common, error, request
+from .library import lib
+from .loop import Loop
+from .handles import pipe, tcp, timer
+
+
+class Checkout(request.CompletedRequest):
+    """
+    Pending or completed checkout of a connection from a
+    :class:`ConnectionPool`.
+
+    .. warning::
+        Checkouts must only be created by :func:`ConnectionPool.acquire`.
+
+    :param pool:
+        pool the connection is checked out from
+    :param key:
+        address of the connection
+    :param on_acquire:
+        callback which should run with the connection
+
+    :type pool:
+        uv.pool.ConnectionPool
+    :type key:
+        tuple | unicode
+    :type on_acquire:
+        ((uv.pool.Checkout, uv.StatusCodes, uv.TCP | uv.Pipe | None) -> None)
+    """
+
+    __slots__ = ['pool', 'key', 'on_acquire', 'stream', 'status', 'queued', 'cancelled']
+
+    def __init__(self, pool, key, on_acquire):
+        super(Checkout, self).__init__(pool.loop)
+        self.finished = False
+        self.pool = pool
+        self.key = key
+        """
+        Address of the connection, `(host, port)` or a path.
+
+        :readonly:
+            True
+        :type:
+            tuple | unicode
+        """
+        self.on_acquire = on_acquire
+        """
+        Callback which should run after a connection has been checked
+        out or with an error status if no connection could be made.
+
+
+        .. function:: on_acquire(checkout, status, stream)
+
+            :param checkout:
+                checkout the call originates from
+            :param status:
+                status of the checkout
+            :param stream:
+                connected stream or `None` on error
+
+            :type checkout:
+                uv.pool.Checkout
+            :type status:
+                uv.StatusCodes
+            :type stream:
+                uv.TCP | uv.Pipe | None
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.pool.Checkout, uv.StatusCodes, uv.TCP | uv.Pipe | None) -> None)
+        """
+        self.stream = None
+        self.status = None
+        self.queued = None
+        self.cancelled = False
+
+    def deliver(self, status, stream=None):
+        self.status = status
+        self.stream = stream
+        request.CompletionQueue.get(self.loop).schedule(self)
+
+    def complete(self):
+        self.finished = True
+        if self.cancelled:
+            if self.stream is not None:
+                self.pool.release(self.stream)
+            return
+        if self.stream is not None and self.stream.closing:
+            # closed by the peer before the callback had a chance to run
+            self.pool.discard(self.stream)
+            self.stream = None
+            self.status = error.StatusCodes.ECONNRESET
+        self.on_acquire(self, self.status, self.stream)
+
+    def cancel(self):
+        """
+        Stop waiting for a connection. The callback will not be called.
+        """
+        if self.finished or self.cancelled:
+            return
+        self.cancelled = True
+        waiters = self.pool.waiters.get(self.key)
+        if waiters is not None and self in waiters:
+            waiters.remove(self)
+            if not waiters:
+                del self.pool.waiters[self.key]
+
+
+class ConnectionPool(object):
+    """
+    Keyed pool of connected :class:`uv.TCP` and :class:`uv.Pipe`
+    streams.
+
+    :raises uv.ClosedLoopError:
+        loop has already been closed
+
+    :param loop:
+        event loop the connections should run on
+    :param max_per_key:
+        maximal number of connections per key
+    :param max_total:
+        maximal number of connections of the pool
+    :param idle_timeout:
+        time in milliseconds after which idle connections are closed
+
+    :type loop:
+        uv.Loop
+    :type max_per_key:
+        int
+    :type max_total:
+        int
+    :type idle_timeout:
+        int
+    """
+
+    def __init__(self, loop=None, max_per_key=8, max_total=256, idle_timeout=30000):
+        self.loop = loop or Loop.get_current()
+        if self.loop.closed:
+            raise error.ClosedLoopError()
+        self.max_per_key = max_per_key
+        """
+        Maximal number of connections (idle, checked out and connecting)
+        per key.
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.max_total = max_total
+        """
+        Maximal number of connections of the pool.
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.idle_timeout = idle_timeout
+        """
+        Time in milliseconds after which idle connections are closed.
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.idle = {}
+        """
+        Idle connections and the time they have been released by key,
+        the most recently released connection last.
+
+        :readonly:
+            True
+        :type:
+            dict[tuple | unicode, list[(uv.TCP | uv.Pipe, int)]]
+        """
+        self.waiters = collections.OrderedDict()
+        self.keys = {}
+        self.counts = collections.defaultdict(int)
+        self.total = 0
+        self.closed = False
+        self.dispatching = False
+        self.eviction_timer = None
+        self.counters = {'hits': 0, 'misses': 0, 'waits': 0, 'wait_time': 0,
+                         'max_wait_time': 0, 'evicted': 0, 'dead': 0, 'errors': 0}
+
+    def acquire(self, key, on_acquire):
+        """
+        Check out a connection to the given address. An idle connection
+        is reused if possible, otherwise a new connection is made or, if
+        a limit has been reached, the checkout waits for a connection to
+        become available. The callback always runs after this method
+        has returned.
+
+        The connection must be given back with :func:`release` or
+        :func:`discard`. Streams are handed out without reading.
+
+        :raises uv.ClosedHandleError:
+            pool has already been closed
+
+        :param key:
+            `(host, port)` tuple with an IP address or the path of a
+            Unix domain socket or named pipe
+        :param on_acquire:
+            callback which should run with the connection
+
+        :type key:
+            tuple | unicode
+        :type on_acquire:
+            ((uv.pool.Checkout, uv.StatusCodes, uv.TCP | uv.Pipe | None) -> None)
+
+        :rtype:
+            uv.pool.Checkout
+        """
+        if self.closed:
+            raise error.ClosedHandleError()
+        checkout = Checkout(self, key, on_acquire)
+        stream = self.take_idle(key)
+        if stream is not None:
+            self.counters['hits'] += 1
+            checkout.deliver(error.StatusCodes.SUCCESS, stream)
+        elif self.has_capacity(key):
+            self.counters['misses'] += 1
+            self.connect(checkout)
+        else:
+            self.counters['waits'] += 1
+            checkout.queued = lib.uv_hrtime()
+            self.waiters.setdefault(key, collections.deque()).append(checkout)
+        return checkout
+
+    def release(self, stream):
+        """
+        Give a healthy connection back to the pool. The stream must not
+        be read from or written to afterwards.
+
+        :type stream:
+            uv.TCP | uv.Pipe
+        """
+        key = self.keys.get(stream)
+        if key is None:
+            return
+        if self.closed or stream.closing:
+            self.discard(stream)
+            return
+        stream.stop_read()
+        waiters = self.waiters.get(key)
+        if waiters:
+            self.hand_over(waiters, stream)
+            return
+        if self.waiters and self.total >= self.max_total:
+            # other keys are waiting for the connection's capacity
+            self.discard(stream)
+            return
+        try:
+            stream.start_read(on_read=self.on_idle_read)
+        except error.UVError:
+            self.discard(stream)
+            return
+        self.idle.setdefault(key, []).append((stream, self.loop.now))
+        if self.eviction_timer is None:
+            self.eviction_timer = timer.Timer(self.loop, on_timeout=self.on_timeout)
+            self.eviction_timer.dereference()
+        if not self.eviction_timer.active:
+            interval = max(1, self.idle_timeout // 4)
+            self.eviction_timer.start(self.on_timeout, interval, interval)
+
+    def discard(self, stream):
+        """
+        Close a connection and remove it from the pool, e.g. after an
+        error or if the connection is in an unknown protocol state.
+
+        :type stream:
+            uv.TCP | uv.Pipe
+        """
+        key = self.keys.pop(stream, None)
+        if not stream.closing:
+            stream.close()
+        if key is None:
+            return
+        connections = self.idle.get(key)
+        if connections:
+            for index, (connection, _) in enumerate(connections):
+                if connection is stream:
+                    del connections[index]
+                    break
+        self.counts[key] -= 1
+        if not self.counts[key]:
+            del self.counts[key]
+        self.total -= 1
+        if not self.dispatching:
+            self.dispatch()
+
+    def take_idle(self, key):
+        connections = self.idle.get(key)
+        while connections:
+            stream, _ = connections.pop()
+            if stream.closing:  # pragma: no cover
+                self.discard(stream)
+                continue
+            stream.stop_read()
+            stream.on_read = common.dummy_callback
+            return stream
+        return None
+
+    def has_capacity(self, key):
+        if self.counts[key] >= self.max_per_key:
+            return False
+        if self.total < self.max_total:
+            return True
+        # make room by evicting the least recently used idle connection
+        oldest = None
+        for connections in self.idle.values():
+            if connections and (oldest is None or connections[0][1] < oldest[1]):
+                oldest = connections[0]
+        if oldest is None:
+            return False
+        self.counters['evicted'] += 1
+        self.discard(oldest[0])
+        return self.total < self.max_total
+
+    def connect(self, checkout):
+        key = checkout.key
+        if isinstance(key, tuple):
+            stream = tcp.TCP(self.loop)
+        else:
+            stream = pipe.Pipe(self.loop)
+        self.keys[stream] = key
+        self.counts[key] += 1
+        self.total += 1
+
+        def on_connect(_, status):
+            if status == error.StatusCodes.SUCCESS and not stream.closing:
+                checkout.deliver(error.StatusCodes.SUCCESS, stream)
+                return
+            self.counters['errors'] += 1
+            self.discard(stream)
+            checkout.deliver(status or error.StatusCodes.ECANCELED)
+
+        try:
+            stream.connect(key, on_connect=on_connect)
+        except error.UVError as uv_error:
+            self.counters['errors'] += 1
+            self.discard(stream)
+            checkout.deliver(error.StatusCodes.get(uv_error.code))
+
+    def hand_over(self, waiters, stream):
+        checkout = waiters.popleft()
+        if not waiters:
+            del self.waiters[checkout.key]
+        wait_time = (lib.uv_hrtime() - checkout.queued) / 1e6
+        self.counters['wait_time'] += wait_time
+        self.counters['max_wait_time'] = max(self.counters['max_wait_time'], wait_time)
+        if stream is None:
+            self.connect(checkout)
+        else:
+            checkout.deliver(error.StatusCodes.SUCCESS, stream)
+
+    def dispatch(self):
+        """
+        Serve waiting checkouts whose limits allow a new connection.
+        """
+        self.dispatching = True
+        try:
+            for key in list(self.waiters):
+                waiters = self.waiters.get(key)
+                while waiters and self.has_capacity(key):
+                    self.hand_over(waiters, None)
+                if self.total >= self.max_total and not any(self.idle.values()):
+                    break
+        finally:
+            self.dispatching = False
+
+    def on_idle_read(self, stream, status, data):
+        # idle connections must neither send data nor be closed by the peer
+        if status == error.StatusCodes.SUCCESS and not data:
+            return
+        self.counters['dead'] += 1
+        self.discard(stream)
+
+    def on_timeout(self, eviction_timer):
+        deadline = self.loop.now - self.idle_timeout
+        for key, connections in list(self.idle.items()):
+            while connections and connections[0][1] <= deadline:
+                self.counters['evicted'] += 1
+                self.discard(connections[0][0])
+            if not connections:
+                del self.idle[key]
+        if not self.idle:
+            eviction_timer.stop()
+
+    def stats(self, reset=False):
+        """
+        Statistics of the pool. The result is a dictionary with the
+        number of checkouts served by idle connections (`hits`), by new
+        connections (`misses`) and checkouts which had to wait (`waits`),
+        the total and maximal wait time in milliseconds (`wait_time` and
+        `max_wait_time`), the number of evicted idle connections
+        (`evicted`), idle connections closed by the peer (`dead`) and
+        failed connection attempts (`errors`). Further the `hit_rate`
+        and the current number of `idle`, `connections` and `waiting`
+        checkouts are reported.
+
+        :param reset:
+            start counting from zero after the statistics are returned
+
+        :type reset:
+            bool
+
+        :rtype:
+            dict[unicode, int | float]
+        """
+        stats = dict(self.counters)
+        checkouts = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / checkouts if checkouts else 0.0
+        stats['idle'] = sum(len(connections) for connections in self.idle.values())
+        stats['connections'] = self.total
+        stats['waiting'] = sum(len(waiters) for waiters in self.waiters.values())
+        if reset:
+            for name in self.counters:
+                self.counters[name] = 0
+        return stats
+
+    def close(self):
+        """
+        Close all idle connections and stop the eviction timer. Waiting
+        checkouts are finished with status `ECANCELED` and connections
+        released afterwards are closed.
+        """
+        self.closed = True
+        waiters, self.waiters = self.waiters, collections.OrderedDict()
+        for key_waiters in waiters.values():
+            for checkout in key_waiters:
+                checkout.deliver(error.StatusCodes.ECANCELED)
+        for connections in list(self.idle.values()):
+            for stream, _ in list(connections):
+                self.discard(stream)
+        self.idle = {}
+        if self.eviction_timer is not None:
+            self.eviction_timer.close()
+            self.eviction_timer = None
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Opt-in profiler for the latency of user callbacks.
+
+Every libuv callback is dispatched by the decorators in :mod:`uv.base`.
+While a profiler is enabled they measure each user callback with
+`uv_hrtime` and record the duration in a latency histogram keyed by the
+handle or request class and the name of the callback, for example
+`TCP.on_read` or `WriteRequest.on_write`. While no profiler is enabled
+the decorators only perform one additional check per callback.
+
+The profiler is process wide and collects the callbacks of all loops.
+Call :func:`dump` to print the histograms, e.g. from a signal handler
+installed with :func:`dump_on_signal` to inspect a running process.
+"""
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import sys
+
+from . import base
+
+
+class LatencyHistogram(object):
+    """
+    HDR-style latency histogram with logarithmic buckets which are
+    linearly subdivided. Recorded values are kept with a relative
+    precision of `2 ** -(precision - 1)` independent of their magnitude
+    which allows to record nanoseconds up to minutes in a few hundred
+    buckets.
+
+    :param precision:
+        number of significant bits kept per value
+
+    :type precision:
+        int
+    """
+
+    __slots__ = ['precision', 'buckets', 'count', 'total', 'minimum', 'maximum']
+
+    def __init__(self, precision=7):
+        self.precision = precision
+        self.buckets = {}
+        """
+        Counts of the recorded values by bucket index.
+
+        :readonly:
+            True
+        :type:
+            dict[int, int]
+        """
+        self.count = 0
+        """
+        Number of recorded values.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.total = 0
+        """
+        Sum of the recorded values.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.minimum = None
+        self.maximum = None
+
+    def bucket_index(self, value):
+        """
+        :type value:
+            int
+        :rtype:
+            int
+        """
+        precision = self.precision
+        exponent = value.bit_length() - precision
+        if exponent <= 0:
+            return value
+        half = 1 << (precision - 1)
+        return (1 << precision) + (exponent - 1) * half + (value >> exponent) - half
+
+    def bucket_value(self, index):
+        """
+        Get the highest value which belongs to the bucket.
+
+        :type index:
+            int
+        :rtype:
+            int
+        """
+        precision = self.precision
+        if index < 1 << precision:
+            return index
+        half = 1 << (precision - 1)
+        exponent, mantissa = divmod(index - (1 << precision), half)
+        return ((mantissa + half + 1) << (exponent + 1)) - 1
+
+    def record(self, value):
+        """
+        Record a value.
+
+        :param value:
+            non-negative value which should be recorded
+
+        :type value:
+            int
+        """
+        index = self.bucket_index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self):
+        """
+        Mean of the recorded values.
+
+        :readonly:
+            True
+        :rtype:
+            float
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile):
+        """
+        Get the value at the given percentile. The result is at most the
+        histogram's precision above the exact value.
+
+        :param percentile:
+            percentile between 0 and 100
+
+        :type percentile:
+            int | float
+
+        :rtype:
+            int
+        """
+        if not self.count:
+            return 0
+        target = max(1, int(round(percentile / 100 * self.count)))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= target:
+                return min(self.bucket_value(index), self.maximum)
+        return self.maximum  # pragma: no cover
+
+
+class CallbackProfiler(object):
+    """
+    Collection of latency histograms of user callbacks keyed by handle
+    or request class and callback name.
+
+    :param precision:
+        number of significant bits kept per value
+
+    :type precision:
+        int
+    """
+
+    def __init__(self, precision=7):
+        self.precision = precision
+        self.histograms = {}
+        """
+        Latency histograms in nanoseconds by class and callback name.
+
+        :readonly:
+            True
+        :type:
+            dict[(type, unicode), uv.profiler.LatencyHistogram]
+        """
+
+    def record(self, cls, name, duration):
+        """
+        Record the duration of a callback.
+
+        :param cls:
+            handle or request class
+        :param name:
+            name of the callback
+        :param duration:
+            duration in nanoseconds
+
+        :type cls:
+            type
+        :type name:
+            unicode
+        :type duration:
+            int
+        """
+        key = cls, name
+        try:
+            histogram = self.histograms[key]
+        except KeyError:
+            histogram = self.histograms[key] = LatencyHistogram(self.precision)
+        histogram.record(duration)
+
+    def reset(self):
+        """
+        Discard all recorded values.
+        """
+        self.histograms = {}
+
+    def snapshot(self):
+        """
+        Summarize the histograms. The result maps names of the form
+        `Class.callback` to dictionaries with the keys `count`, `mean`,
+        `p50`, `p90`, `p99`, `p999` and `max`. All times are in
+        microseconds.
+
+        :rtype:
+            dict[unicode, dict]
+        """
+        result = {}
+        for (cls, name), histogram in list(self.histograms.items()):
+            result['%s.%s' % (cls.__name__, name)] = {
+                'count': histogram.count,
+                'mean': histogram.mean / 1e3,
+                'p50': histogram.percentile(50) / 1e3,
+                'p90': histogram.percentile(90) / 1e3,
+                'p99': histogram.percentile(99) / 1e3,
+                'p999': histogram.percentile(99.9) / 1e3,
+                'max': (histogram.maximum or 0) / 1e3
+            }
+        return result
+
+    def dump(self, file=None):
+        """
+        Print a table of the histograms sorted by descending 99th
+        percentile.
+
+        :param file:
+            file to print to (defaults to `sys.stderr`)
+
+        :type file:
+            io.TextIOBase
+        """
+        file = file or sys.stderr
+        snapshot = self.snapshot()
+        columns = 'count', 'mean', 'p50', 'p90', 'p99', 'p999', 'max'
+        print('%-36s %10s' % ('callback (us)', 'count') +
+              ''.join(' %10s' % column for column in columns[1:]), file=file)
+        for name in sorted(snapshot, key=lambda key: -snapshot[key]['p99']):
+            summary = snapshot[name]
+            print('%-36s %10d' % (name, summary['count']) +
+                  ''.join(' %10.1f' % summary[column] for column in columns[1:]),
+                  file=file)
+
+
+def enable(precision=7):
+    """
+    Enable the process wide callback profiler. If a profiler is already
+    enabled it is kept and returned.
+
+    :param precision:
+        number of significant bits kept per value
+
+    :type precision:
+        int
+
+    :return:
+        active profiler
+    :rtype:
+        uv.profiler.CallbackProfiler
+    """
+    if base.callback_profiler is None:
+        base.callback_profiler = CallbackProfiler(precision)
+    return base.callback_profiler
+
+
+def disable():
+    """
+    Disable the process wide callback profiler.
+
+    :return:
+        profiler which has been active or `None`
+    :rtype:
+        uv.profiler.CallbackProfiler | None
+    """
+    profiler, base.callback_profiler = base.callback_profiler, None
+    return profiler
+
+
+def get_profiler():
+    """
+    :return:
+        active profiler or `None`
+    :rtype:
+        uv.profiler.CallbackProfiler | None
+    """
+    return base.callback_profiler
+
+
+def dump(file=None):
+    """
+    Print the histograms of the active profiler if there is one.
+
+    :param file:
+        file to print to (defaults to `sys.stderr`)
+
+    :type file:
+        io.TextIOBase
+    """
+    if base.callback_profiler is not None:
+        base.callback_profiler.dump(file)
+
+
+def dump_on_signal(signum, loop=None, file=None):
+    """
+    Dump the histograms whenever the process receives the given signal,
+    e.g. `kill -USR2 <pid>`. The returned signal handle does not keep
+    the loop alive.
+
+    :param signum:
+        signal which should trigger a dump
+    :param loop:
+        event loop the signal handle should run on
+    :param file:
+        file to print to (defaults to `sys.stderr`)
+
+    :type signum:
+        int
+    :type loop:
+        uv.Loop
+    :type file:
+        io.TextIOBase
+
+    :return:
+        started signal handle
+    :rtype:
+        uv.Signal
+    """
+    from .handles.signal import Signal
+    signal = Signal(loop=loop)
+    signal.start(on_signal=lambda *_: dump(file), signum=signum)
+    signal.dereference()
+    return signal
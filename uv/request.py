@@ -15,11 +15,13 @@
 
 from __future__ import print_function, unicode_literals, division, absolute_import
 
+import abc
+
 from . import abstract, base, common, error, library
 from .library import ffi, lib
 from .loop import Loop
 
-__all__ = ['UVRequest']
+__all__ = ['UVRequest', 'CompletedRequest']
 
 
 class RequestType(common.Enumeration):
@@ -57,6 +59,12 @@ class UVRequest(object):
 
     uv_request_type = None
     uv_request_init = None
+    uv_request_pooled = False
+    """
+    Reuse the underlying structures of finished requests of this type
+    (see :func:`uv.Loop.request_pool_stats`). Only request types which
+    do not keep references to their C structure may be pooled.
+    """
 
     def __init__(self, loop, arguments, uv_handle=None, request_init=None):
         self.loop = loop or Loop.get_current()
@@ -76,12 +84,12 @@ class UVRequest(object):
         if self.loop.closed:
             self.finished = True
             raise error.ClosedLoopError()
-        self.base_request = base.BaseRequest(self, self.loop.base_loop,
-                                             self.__class__.uv_request_type,
-                                             request_init or
-                                             self.__class__.uv_request_init,
-                                             arguments,
-                                             uv_handle=uv_handle)
+        self.base_request = base.BaseRequest.create(self, self.loop.base_loop,
+                                                    self.__class__.uv_request_type,
+                                                    request_init or
+                                                    self.__class__.uv_request_init,
+                                                    arguments, uv_handle=uv_handle,
+                                                    pooled=self.uv_request_pooled)
         self.set_pending()
 
     @property
@@ -97,6 +105,9 @@ class UVRequest(object):
         """
         :raises uv.UVError: error while canceling request
         """
+        if self.base_request.user_request is not self:
+            # the request has finished and its structure has been reused
+            return
         code = self.base_request.cancel()
         if code != error.StatusCodes.SUCCESS:
             raise error.UVError(code)
@@ -122,6 +133,112 @@ class UVRequest(object):
         self.loop.structure_clear_pending(self)
 
 
+class CompletedRequest(common.with_metaclass(abc.ABCMeta)):
+    """
+    Abstract base class of lightweight stand-ins for requests which
+    have been completed immediately, e.g. a write whose data has been
+    written to the socket without queuing a request. No C structure is
+    allocated. The callback of the operation runs with status
+    :class:`uv.StatusCodes.SUCCESS` after polling for IO, i.e. never
+    before the issuing call returned.
+
+    :param loop:
+        event loop the operation has been issued on
+
+    :type loop:
+        uv.Loop
+    """
+
+    __slots__ = ['loop', 'finished']
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.finished = True
+        """
+        Request has been finished.
+
+        :readonly: True
+        :type: bool
+        """
+
+    def cancel(self):
+        """
+        Completed requests can not be cancelled, this is a no-op.
+        """
+
+    @abc.abstractmethod
+    def complete(self):
+        """
+        Run the callback of the operation. Called by the loop's
+        :class:`CompletionQueue` after polling for IO, subclasses pass
+        their callback specific arguments.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+
+
+class CompletionQueue(object):
+    """
+    Runs the callbacks of completed requests of a loop once per loop
+    iteration right after polling for IO. The callbacks are driven by
+    the loop's internal check and idle handles, the loop does not block
+    for IO as long as there are callbacks to run.
+
+    .. warning::
+        This class is only for internal purposes and is not part of
+        the official API.
+
+    :param base_loop:
+        internal loop of the event loop the requests have been issued on
+
+    :type base_loop:
+        uv.base.BaseLoop
+    """
+
+    def __init__(self, base_loop):
+        # the internal loop only references the user loop weakly
+        self.base_loop = base_loop
+        self.requests = []
+
+    @classmethod
+    def get(cls, loop):
+        """
+        Get the completion queue of the given loop.
+
+        :type loop:
+            uv.Loop
+
+        :rtype:
+            uv.request.CompletionQueue
+        """
+        if loop.completion_queue is None:
+            loop.completion_queue = cls(loop.base_loop)
+        return loop.completion_queue
+
+    def schedule(self, completed_request):
+        """
+        Run the callback of the completed request after polling for IO.
+
+        :type completed_request:
+            uv.request.CompletedRequest
+        """
+        if not self.requests:
+            self.base_loop.schedule_check(self.on_check, nowait=True)
+        self.requests.append(completed_request)
+
+    def on_check(self):
+        requests, self.requests = self.requests, []
+        for completed_request in requests:
+            try:
+                completed_request.complete()
+            except:
+                user_loop = self.base_loop.user_loop
+                if user_loop is not None:
+                    user_loop.handle_exception()
+
+
 RequestType.cls = UVRequest
 
 abstract.Request.register(UVRequest)
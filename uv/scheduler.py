@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Cooperative scheduler for CPU-bound work on the loop thread.
+
+Tasks are generators or coroutines which yield (or await
+:func:`checkpoint`) regularly. The scheduler runs them round-robin in
+slices right after polling for IO. Each slice ends as soon as its time
+budget measured with `uv_hrtime` is used up, so IO callbacks never have
+to wait longer than roughly one budget for background work. The slices
+are driven by the loop's internal check and idle handles, while tasks
+are pending the loop does not block in the poll phase.
+"""
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import collections
+
+from . import error
+from .library import lib
+from .loop import Loop
+
+
+class _Checkpoint(object):
+    def __await__(self):
+        yield
+
+    __iter__ = __await__
+
+
+def checkpoint():
+    """
+    Awaitable which gives control back to the scheduler, e.g.
+    `await uv.scheduler.checkpoint()` within a coroutine task. Generator
+    tasks simply use `yield`.
+
+    :rtype:
+        collections.Awaitable
+    """
+    return _Checkpoint()
+
+
+class Task(object):
+    """
+    Task which has been spawned on a :class:`Scheduler`.
+
+    .. warning::
+        Tasks must only be created by :func:`Scheduler.spawn`.
+
+    :param scheduler:
+        scheduler running the task
+    :param coroutine:
+        generator or coroutine of the task
+    :param name:
+        name of the task
+    :param on_done:
+        callback which should run after the task has finished
+
+    :type scheduler:
+        uv.scheduler.Scheduler
+    :type coroutine:
+        collections.Generator | collections.Coroutine
+    :type name:
+        unicode
+    :type on_done:
+        ((uv.scheduler.Task) -> None) | None
+    """
+
+    __slots__ = ['scheduler', 'coroutine', 'name', 'on_done', 'done', 'cancelled',
+                 'result', 'exception', 'cpu_time', 'steps', 'slices', 'spawned',
+                 'finished', 'last_slice']
+
+    def __init__(self, scheduler, coroutine, name, on_done):
+        self.scheduler = scheduler
+        self.coroutine = coroutine
+        self.name = name
+        """
+        Name of the task used in reports.
+
+        :readonly:
+            True
+        :type:
+            unicode
+        """
+        self.on_done = on_done
+        """
+        Callback which should run after the task has finished, failed or
+        has been cancelled. Exceptions of tasks without a callback are
+        passed to the loop's excepthook.
+
+
+        .. function:: on_done(task)
+
+            :param task:
+                task which has finished
+
+            :type task:
+                uv.scheduler.Task
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.scheduler.Task) -> None) | None
+        """
+        self.done = False
+        """
+        Task has finished, failed or has been cancelled.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.cancelled = False
+        self.result = None
+        """
+        Return value of the task's generator or coroutine.
+
+        :readonly:
+            True
+        :type:
+            Any
+        """
+        self.exception = None
+        """
+        Exception raised by the task or `None`.
+
+        :readonly:
+            True
+        :type:
+            BaseException | None
+        """
+        self.cpu_time = 0
+        """
+        Time spent running the task in nanoseconds.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.steps = 0
+        self.slices = 0
+        self.last_slice = None
+        self.spawned = lib.uv_hrtime()
+        self.finished = None
+
+    @property
+    def share(self):
+        """
+        Fraction of the wall clock time since the task has been spawned
+        (until it has finished) spent running the task.
+
+        :readonly:
+            True
+        :rtype:
+            float
+        """
+        elapsed = (self.finished or lib.uv_hrtime()) - self.spawned
+        return self.cpu_time / elapsed if elapsed else 0.0
+
+    def cancel(self):
+        """
+        Cancel the task. The generator or coroutine is closed and the
+        task's callback runs immediately. If the task cancels itself,
+        it is closed and its callback runs after the current step.
+        """
+        if self.done or self.cancelled:
+            return
+        self.cancelled = True
+        if self.scheduler.running is self:
+            # a running generator can not be closed, see Scheduler.on_check
+            return
+        self.scheduler.tasks.remove(self)
+        try:
+            self.coroutine.close()
+        except Exception as exception:
+            self.exception = exception
+        self.scheduler.finish(self)
+
+
+class Scheduler(object):
+    """
+    Cooperative time-sliced scheduler for generator and coroutine tasks
+    running on the loop thread.
+
+    :raises uv.ClosedLoopError:
+        loop has already been closed
+
+    :param loop:
+        event loop the tasks should run on
+    :param budget:
+        time budget of one slice in milliseconds
+
+    :type loop:
+        uv.Loop
+    :type budget:
+        float
+    """
+
+    def __init__(self, loop=None, budget=2):
+        self.loop = loop or Loop.get_current()
+        if self.loop.closed:
+            raise error.ClosedLoopError()
+        self.budget = budget
+        """
+        Time budget of one slice in milliseconds. At least one step of
+        one task runs per slice even if it exceeds the budget.
+
+        :readonly:
+            False
+        :type:
+            float
+        """
+        self.tasks = collections.deque()
+        """
+        Tasks which have not finished yet in the order they run next.
+
+        :readonly:
+            True
+        :type:
+            collections.deque[uv.scheduler.Task]
+        """
+        self.finished_tasks = []
+        self.running = None
+        self.slices = 0
+        self.scheduled = False
+
+    def spawn(self, coroutine, name=None, on_done=None):
+        """
+        Run a generator or coroutine as task on the loop. The first step
+        runs in the next slice.
+
+        :param coroutine:
+            generator or coroutine of the task
+        :param name:
+            name of the task used in reports (defaults to the name of
+            the generator or coroutine)
+        :param on_done:
+            callback which should run after the task has finished
+
+        :type coroutine:
+            collections.Generator | collections.Coroutine
+        :type name:
+            unicode
+        :type on_done:
+            ((uv.scheduler.Task) -> None) | None
+
+        :return:
+            spawned task
+        :rtype:
+            uv.scheduler.Task
+        """
+        if self.loop.closed:
+            raise error.ClosedLoopError()
+        name = name or getattr(coroutine, '__name__', None) or repr(coroutine)
+        task = Task(self, coroutine, name, on_done)
+        self.tasks.append(task)
+        self.schedule()
+        return task
+
+    def schedule(self):
+        if not self.scheduled:
+            self.scheduled = True
+            self.loop.base_loop.schedule_check(self.on_check, nowait=True)
+
+    def on_check(self):
+        self.scheduled = False
+        tasks = self.tasks
+        self.slices += 1
+        start = now = lib.uv_hrtime()
+        deadline = start + int(self.budget * 1e6)
+        while tasks:
+            task = tasks.popleft()
+            if task.last_slice != self.slices:
+                task.last_slice = self.slices
+                task.slices += 1
+            finished = False
+            self.running = task
+            try:
+                task.coroutine.send(None)
+            except StopIteration as stop:
+                task.result = getattr(stop, 'value', None)
+                finished = True
+            except Exception as exception:
+                task.exception = exception
+                finished = True
+            self.running = None
+            if task.cancelled and not finished:
+                # the task has cancelled itself during the step
+                try:
+                    task.coroutine.close()
+                except Exception as exception:
+                    task.exception = exception
+                finished = True
+            end = lib.uv_hrtime()
+            task.steps += 1
+            task.cpu_time += end - now
+            if finished:
+                self.finish(task)
+                end = lib.uv_hrtime()
+            elif not task.done:
+                tasks.append(task)
+            now = end
+            if now >= deadline:
+                break
+        if tasks:
+            self.schedule()
+
+    def finish(self, task):
+        if task.done:
+            return
+        task.done = True
+        task.finished = lib.uv_hrtime()
+        self.finished_tasks.append(task)
+        if task.on_done is not None:
+            try:
+                task.on_done(task)
+            except:
+                self.loop.handle_exception()
+        elif task.exception is not None:
+            try:
+                raise task.exception
+            except:
+                self.loop.handle_exception()
+
+    def report(self):
+        """
+        Report the CPU share of all tasks which are pending or have
+        finished since the last report. The result maps the tasks to
+        dictionaries with the keys `name`, `cpu_time` (milliseconds),
+        `share`, `steps`, `slices` and `done`. Task names do not have to
+        be unique.
+
+        :rtype:
+            dict[uv.scheduler.Task, dict]
+        """
+        result = {}
+        for task in self.finished_tasks + list(self.tasks):
+            result[task] = {'name': task.name, 'cpu_time': task.cpu_time / 1e6,
+                            'share': task.share, 'steps': task.steps,
+                            'slices': task.slices, 'done': task.done}
+        self.finished_tasks = []
+        return result
+
+    def close(self):
+        """
+        Cancel all tasks.
+        """
+        for task in list(self.tasks):
+            task.cancel()
+
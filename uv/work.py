@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+from . import base, common, error, library, request
+from .library import ffi, lib
+
+
+@library.c_callback('uv_work_cb')
+def uv_work_cb(uv_work):
+    """
+    Runs in one of libuv's thread pool threads.
+
+    :type uv_work:
+        ffi.CData[uv_work_t*]
+    """
+    work_request = ffi.from_handle(uv_work.data).user_request
+    """ :type: uv.Work """
+    if work_request is not None:
+        work_request.run()
+
+
+@base.request_callback('uv_after_work_cb')
+def uv_after_work_cb(work_request, status):
+    """
+    :type work_request:
+        uv.Work
+    :type status:
+        int
+    """
+    work_request.on_done(work_request, error.StatusCodes.get(status),
+                         work_request.result, work_request.exception)
+
+
+@request.RequestType.WORK
+class Work(request.UVRequest):
+    """
+    Request to run a Python callable in libuv's thread pool. The result
+    is delivered to the callback in the event loop's thread.
+
+    The callable runs with the GIL held, so only work which releases
+    the GIL itself (e.g. :mod:`hashlib`, :mod:`zlib` or blocking IO)
+    runs in parallel to the event loop.
+
+    .. note::
+        The thread pool is shared with filesystem operations and DNS
+        requests and has 4 threads by default. Its size could be
+        changed with the `UV_THREADPOOL_SIZE` environment variable
+        before the first request is queued.
+
+    :raises uv.UVError:
+        error while queueing the request
+    :raises uv.ClosedLoopError:
+        loop has already been closed
+
+    :param function:
+        callable which should run in the thread pool
+    :param arguments:
+        arguments that should be passed to the callable
+    :param keywords:
+        keyword arguments that should be passed to the callable
+    :param on_done:
+        callback which should run after the callable has returned,
+        has raised an exception or the request has been cancelled
+    :param loop:
+        event loop the request should run on
+
+    :type function:
+        callable
+    :type arguments:
+        tuple
+    :type keywords:
+        dict | None
+    :type on_done:
+        ((uv.Work, uv.StatusCodes, Any, BaseException | None) -> None) |
+        ((Any, uv.Work, uv.StatusCodes, Any, BaseException | None) -> None)
+    :type loop:
+        uv.Loop
+    """
+
+    __slots__ = ['uv_work', 'function', 'arguments', 'keywords', 'on_done', 'result',
+                 'exception']
+
+    uv_request_type = 'uv_work_t*'
+    uv_request_init = lib.uv_queue_work
+
+    def __init__(self, function, arguments=(), keywords=None, on_done=None, loop=None):
+        self.function = function
+        """
+        Callable which should run in the thread pool.
+
+        :readonly:
+            True
+        :type:
+            callable
+        """
+        self.arguments = arguments
+        self.keywords = keywords or {}
+        self.on_done = on_done or common.dummy_callback
+        """
+        Callback which should run after the callable has returned, has
+        raised an exception or the request has been cancelled.
+
+
+        .. function:: on_done(work_request, status, result, exception)
+
+            :param work_request:
+                request the call originates from
+            :param status:
+                status of the request (`ECANCELED` if the request has
+                been cancelled before the callable has been started)
+            :param result:
+                return value of the callable
+            :param exception:
+                exception raised by the callable
+
+            :type work_request:
+                uv.Work
+            :type status:
+                uv.StatusCodes
+            :type result:
+                Any
+            :type exception:
+                BaseException | None
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.Work, uv.StatusCodes, Any, BaseException | None) -> None) |
+            ((Any, uv.Work, uv.StatusCodes, Any, BaseException | None) -> None)
+        """
+        self.result = None
+        """
+        Return value of the callable.
+
+        :readonly:
+            True
+        :type:
+            Any
+        """
+        self.exception = None
+        """
+        Exception raised by the callable.
+
+        :readonly:
+            True
+        :type:
+            BaseException | None
+        """
+        arguments = uv_work_cb, uv_after_work_cb
+        super(Work, self).__init__(loop, arguments)
+        self.uv_work = self.base_request.uv_object
+
+    def run(self):
+        """
+        Run the callable and store its result or exception.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. It is called from within the thread
+            pool. You should never call it directly!
+        """
+        try:
+            self.result = self.function(*self.arguments, **self.keywords)
+        except BaseException as exception:
+            self.exception = exception